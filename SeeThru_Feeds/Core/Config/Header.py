@@ -1,19 +1,46 @@
 from datetime import datetime
+from typing import Optional, Union
+
+from SeeThru_Feeds.Model.Scripts.OutputSink import OUTPUT_SINKS
 from ..Exceptions.Config import HeaderException
 
+# "always" pushes every result, "changed" only pushes results that differ from the last pushed result
+PUSH_POLICIES = ["always", "changed"]
+# The statuses that a script which times out, or is skipped by the run deadline, can be given
+TIMEOUT_STATUSES = ["amber", "red"]
+
 class Header:
     Scheme_Name: str
     Scheme_Description: str
     Scheme_Author: str
     Scheme_Owner: str
     Creation_Date: str
+    # Optional run settings, these are only dumped when they have been set
+    Run_Workers: Optional[int]
+    Push_Policy: Optional[str]
+    Push_Heartbeat: Optional[Union[int, float]]
+    Output_Sink: Optional[str]
+    Run_Deadline: Optional[Union[int, float]]
+    Timeout_Status: Optional[str]
+    Timeout_Message: Optional[str]
 
-    def __init__(self, name: str, description: str, author: str, owner: str, creation_date: str):
+    def __init__(self, name: str, description: str, author: str, owner: str, creation_date: str,
+                 run_workers: Optional[int] = None, push_policy: Optional[str] = None,
+                 push_heartbeat: Optional[Union[int, float]] = None, output_sink: Optional[str] = None,
+                 run_deadline: Optional[Union[int, float]] = None, timeout_status: Optional[str] = None,
+                 timeout_message: Optional[str] = None):
         self.Scheme_Name = name
         self.Scheme_Description = description
         self.Scheme_Author = author
         self.Scheme_Owner = owner
         self.Creation_Date = creation_date
+        self.Run_Workers = run_workers
+        self.Push_Policy = push_policy
+        self.Push_Heartbeat = push_heartbeat
+        self.Output_Sink = output_sink
+        self.Run_Deadline = run_deadline
+        self.Timeout_Status = timeout_status
+        self.Timeout_Message = timeout_message
 
     @staticmethod
     def new(name: str) -> "Header":
@@ -44,19 +71,62 @@ class Header:
             raise HeaderException("No Scheme_Owner defined")
         if "Creation_Date" not in data:
             raise HeaderException("No Creation_Data defined")
+        run_workers = data.get("Run_Workers", None)
+        if run_workers is not None and (type(run_workers) != int or run_workers < 1):
+            raise HeaderException("Run_Workers must be a positive integer")
+        push_policy = data.get("Push_Policy", None)
+        if push_policy is not None and push_policy not in PUSH_POLICIES:
+            raise HeaderException(f"Push_Policy must be one of {', '.join(PUSH_POLICIES)}")
+        push_heartbeat = data.get("Push_Heartbeat", None)
+        if push_heartbeat is not None and (type(push_heartbeat) not in [int, float] or push_heartbeat <= 0):
+            raise HeaderException("Push_Heartbeat must be a positive number of seconds")
+        output_sink = data.get("Output_Sink", None)
+        if output_sink is not None and output_sink not in OUTPUT_SINKS:
+            raise HeaderException(f"Output_Sink must be one of {', '.join(OUTPUT_SINKS)}")
+        run_deadline = data.get("Run_Deadline", None)
+        if run_deadline is not None and (type(run_deadline) not in [int, float] or run_deadline <= 0):
+            raise HeaderException("Run_Deadline must be a positive number of seconds")
+        timeout_status = data.get("Timeout_Status", None)
+        if timeout_status is not None and timeout_status not in TIMEOUT_STATUSES:
+            raise HeaderException(f"Timeout_Status must be one of {', '.join(TIMEOUT_STATUSES)}")
+        timeout_message = data.get("Timeout_Message", None)
+        if timeout_message is not None and type(timeout_message) != str:
+            raise HeaderException("Timeout_Message must be a string")
         return Header(
             data["Scheme_Name"],
             data["Scheme_Description"],
             data["Scheme_Author"],
             data["Scheme_Owner"],
-            data["Creation_Date"]
+            data["Creation_Date"],
+            run_workers,
+            push_policy,
+            push_heartbeat,
+            output_sink,
+            run_deadline,
+            timeout_status,
+            timeout_message
         )
 
     def dump(self) -> dict:
-        return {
+        data = {
             "Scheme_Name": self.Scheme_Name,
             "Scheme_Description": self.Scheme_Description,
             "Scheme_Author": self.Scheme_Author,
             "Scheme_Owner": self.Scheme_Owner,
             "Creation_Date": self.Creation_Date
-        }
\ No newline at end of file
+        }
+        if self.Run_Workers is not None:
+            data["Run_Workers"] = self.Run_Workers
+        if self.Push_Policy is not None:
+            data["Push_Policy"] = self.Push_Policy
+        if self.Push_Heartbeat is not None:
+            data["Push_Heartbeat"] = self.Push_Heartbeat
+        if self.Output_Sink is not None:
+            data["Output_Sink"] = self.Output_Sink
+        if self.Run_Deadline is not None:
+            data["Run_Deadline"] = self.Run_Deadline
+        if self.Timeout_Status is not None:
+            data["Timeout_Status"] = self.Timeout_Status
+        if self.Timeout_Message is not None:
+            data["Timeout_Message"] = self.Timeout_Message
+        return data
@@ -1,3 +1,5 @@
+from typing import List, Optional, Union
+
 import SeeThru_Feeds.Core.Exceptions.Config as ConfigExceptions
 
 
@@ -5,11 +7,20 @@ class Meta:
     Script_Name: str
     Script_Output_Path: str
     Script_Object_Path: str
+    # Optional settings, these are only dumped when they have been set
+    Script_Interval: Optional[Union[int, float]]
+    Script_Output_Properties: Optional[List[str]]
+    Script_Timeout: Optional[Union[int, float]]
 
-    def __init__(self, name: str, output_path: str, object_path: str):
+    def __init__(self, name: str, output_path: str, object_path: str,
+                 interval: Optional[Union[int, float]] = None, output_properties: Optional[List[str]] = None,
+                 timeout: Optional[Union[int, float]] = None):
         self.Script_Name = name
         self.Script_Output_Path = output_path
         self.Script_Object_Path = object_path
+        self.Script_Interval = interval
+        self.Script_Output_Properties = output_properties
+        self.Script_Timeout = timeout
 
     @staticmethod
     def new(name: str) -> "Meta":
@@ -44,10 +55,26 @@ class Meta:
             raise ConfigExceptions.ScriptMetaException("A script meta has no output path", script_name)
         if "Script_Object_Path" not in data:
             raise ConfigExceptions.ScriptMetaException("A script meta has no script module", script_name)
+        interval = data.get("Script_Interval", None)
+        if interval is not None and (type(interval) not in [int, float] or interval <= 0):
+            raise ConfigExceptions.ScriptMetaException("A script meta's interval must be a positive number of seconds",
+                                                       script_name)
+        output_properties = data.get("Script_Output_Properties", None)
+        if output_properties is not None and (type(output_properties) != list or
+                                              any(type(name) != str for name in output_properties)):
+            raise ConfigExceptions.ScriptMetaException("A script meta's output properties must be a list of names",
+                                                       script_name)
+        timeout = data.get("Script_Timeout", None)
+        if timeout is not None and (type(timeout) not in [int, float] or timeout <= 0):
+            raise ConfigExceptions.ScriptMetaException("A script meta's timeout must be a positive number of seconds",
+                                                       script_name)
         return Meta(
             data["Script_Name"],
             data["Script_Output_Path"],
-            data["Script_Object_Path"]
+            data["Script_Object_Path"],
+            interval,
+            output_properties,
+            timeout
         )
 
     def dump(self) -> dict:
@@ -57,8 +84,15 @@ class Meta:
         Returns:
             dict: The dumped data
         """
-        return {
+        data = {
             "Script_Name": self.Script_Name,
             "Script_Output_Path": self.Script_Output_Path,
             "Script_Object_Path": self.Script_Object_Path
         }
+        if self.Script_Interval is not None:
+            data["Script_Interval"] = self.Script_Interval
+        if self.Script_Output_Properties is not None:
+            data["Script_Output_Properties"] = self.Script_Output_Properties
+        if self.Script_Timeout is not None:
+            data["Script_Timeout"] = self.Script_Timeout
+        return data
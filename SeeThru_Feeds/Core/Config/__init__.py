@@ -1,3 +1,4 @@
+import copy
 from typing import Dict
 
 from . import Header as ConfigHeader, Script as ConfigScript, Feed as ConfigFeed, ApiKey as ConfigApiKey
@@ -19,6 +20,30 @@ class Config:
         self.Scripts = scripts
         self.Feeds = feeds
         self.Api_Keys = api_keys
+        # The dump of the config when it was last loaded or saved, None if it never has been
+        self._clean_dump = None
+
+    def __getstate__(self):
+        # The clean dump isn't kept when the config is pickled
+        state = self.__dict__.copy()
+        state["_clean_dump"] = None
+        return state
+
+    def mark_clean(self):
+        """
+        Records the config as unchanged, this is called once the config has been loaded or saved
+        """
+        # The dump is compared rather than a dirty flag, as fillables and other plain dicts are edited in place
+        # without the config knowing. It is deep copied, as the dump shares those dicts with the config
+        self._clean_dump = copy.deepcopy(self.dump())
+
+    def has_changed(self) -> bool:
+        """
+        Returns:
+            bool: Whether the config has changed since mark_clean was last called, True if it never has been
+        """
+        # Dumping the config is cheap next to rewriting the config file, which this saves on an unchanged config
+        return self._clean_dump is None or self.dump() != self._clean_dump
 
     @staticmethod
     def new(name: str) -> "Config":
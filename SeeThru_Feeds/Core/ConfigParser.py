@@ -1,19 +1,47 @@
+import contextlib
+import hashlib
 import json
+import os
+import pickle
+import shutil
 import sys
-from datetime import datetime
+import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Optional
 
 from .Exceptions import Config as ConfigExceptions
-from .Config import Config
+from .Config import Config, ApiKey, Feed, Header, Script
+from .Config.Script import Meta, State
 
-import toml
+# The version of the snapshot format, snapshots of any other version are rebuilt
+SNAPSHOT_VERSION = 1
+
+
+def model_fingerprint() -> str:
+    """
+    Returns a fingerprint of the attributes of the config model,
+    so that snapshots pickled before the model changed are rebuilt
+
+    Returns:
+        str: The fingerprint
+    """
+    classes = [Config, Header.Header, Script.Script, Meta.Meta, State.State, Feed.Feed, ApiKey.ApiKey]
+    attributes = [(cls.__qualname__, sorted(getattr(cls, "__annotations__", {}).keys())) for cls in classes]
+    return hashlib.sha256(repr(attributes).encode()).hexdigest()
 
 
 class ConfigParser:
-    def __init__(self, config_path: Path, method: str = "json"):
+    def __init__(self, config_path: Path, method: str = "json", use_snapshot: bool = False):
+        """
+        Args:
+            config_path (Path): The config file path
+            method (str): Either "json" or "toml"
+            use_snapshot (bool): Whether the parsed config is loaded from, and saved to, a snapshot next to the
+                                 config file, which is used for as long as the config file is unchanged
+        """
         self.config_path: Path = config_path
         self.method: str = method
+        self.use_snapshot: bool = use_snapshot
         self.config: Config = Config.new("")
 
     @staticmethod
@@ -55,9 +83,77 @@ class ConfigParser:
         self.config = config
         return self
 
+    @property
+    def snapshot_path(self) -> Path:
+        """
+        Returns:
+            Path: The path of the config's snapshot, a hidden file next to the config file
+        """
+        return self.config_path.with_name(f".{self.config_path.name}.snapshot")
+
+    def snapshot_key(self, content: bytes) -> dict:
+        """
+        Args:
+            content (bytes): The content of the config file
+
+        Returns:
+            dict: Identifies the config file and the format that it was snapshotted with
+        """
+        stat = self.config_path.stat()
+        return {
+            "version": SNAPSHOT_VERSION,
+            "model": model_fingerprint(),
+            "method": self.method,
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": hashlib.sha256(content).hexdigest()
+        }
+
+    def load_snapshot(self, key: dict) -> Optional[Config]:
+        """
+        Loads the config from its snapshot
+
+        Args:
+            key (dict): The key of the config file
+
+        Returns:
+            Optional[Config]: The config, None if there isn't a snapshot or it doesn't match the config file
+        """
+        try:
+            with self.snapshot_path.open("rb") as file:
+                snapshot = pickle.load(file)
+        except Exception as _:
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("key") != key:
+            return None
+        return snapshot.get("config")
+
+    def save_snapshot(self, key: dict, config: Config):
+        """
+        Atomically writes the snapshot of the config, failing to write it isn't an error
+
+        Args:
+            key (dict): The key of the config file
+            config (Config): The parsed config
+        """
+        temporaryPath = None
+        try:
+            # Each write has its own temporary file, so that concurrent loads don't write over each other
+            with tempfile.NamedTemporaryFile("wb", dir=self.snapshot_path.parent, prefix=self.snapshot_path.name,
+                                             suffix=".tmp", delete=False) as file:
+                temporaryPath = file.name
+                pickle.dump({"key": key, "config": config}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaryPath, self.snapshot_path)
+        except (OSError, pickle.PickleError, TypeError, AttributeError) as _:
+            # A config that can't be pickled is parsed each time instead
+            if temporaryPath is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temporaryPath)
+
     def load(self):
         """
-        Opens the config file and parses it into the object model
+        Opens the config file and parses it into the object model,
+        when snapshots are used an unchanged config file is loaded from its snapshot instead of being parsed
 
         Returns:
             Config: The config
@@ -65,17 +161,30 @@ class ConfigParser:
         # Opens the config file and parses it
         if not self.config_path.exists():
             return self.config
-        with self.config_path.open('r') as file:
-            data = {}
-            if self.method == "json":
-                # Generates the config
-                data = json.loads(file.read())
-            elif self.method == "toml":
-                # Generates the config
-                data = toml.loads(file.read())
+        content = self.config_path.read_bytes()
+
+        key = None
+        if self.use_snapshot:
+            key = self.snapshot_key(content)
+            config = self.load_snapshot(key)
+            if config is not None:
+                self.config = config
+                return self.config
+
+        data = {}
+        if self.method == "json":
+            # Generates the config
+            data = json.loads(content.decode())
+        elif self.method == "toml":
+            # Generates the config
+            import toml
+            data = toml.loads(content.decode())
 
         try:
             self.config = Config.load(data)
+            if self.use_snapshot:
+                self.save_snapshot(key, self.config)
+            self.config.mark_clean()
             return self.config
         except ConfigExceptions.ScriptException as e:
             print(f"{e.script_name}: {e}")
@@ -90,25 +199,51 @@ class ConfigParser:
             print(e)
             sys.exit(1)
 
-    def save(self):
+    def save(self, force: bool = False):
         """
-        Saves the config file, with the appropriate type
+        Saves the config file, with the appropriate type.
+        The config file is replaced atomically, and isn't written at all if the config hasn't changed
+
+        Args:
+            force (bool): Whether the config file is written even if the config hasn't changed
+
+        Returns:
+            bool: Whether the config file was written
         """
         if not self.config_path.parent.exists():
-            return
-        with self.config_path.open('w') as file:
-            content = ""
-            if self.method == "json":
-                content = json.dumps(self.config.dump(), indent=4)
-            elif self.method == "toml":
-                content = toml.dumps(self.config.dump())
-            file.write(content)
+            return False
+        if not force and self.config_path.exists() and not self.config.has_changed():
+            return False
+        content = ""
+        if self.method == "json":
+            content = json.dumps(self.config.dump(), indent=4)
+        elif self.method == "toml":
+            import toml
+            content = toml.dumps(self.config.dump())
+        # Each save has its own temporary file, so that concurrent saves don't write over each other
+        file = tempfile.NamedTemporaryFile("w", dir=self.config_path.parent, prefix=self.config_path.name,
+                                           suffix=".tmp", delete=False)
+        try:
+            with file:
+                file.write(content)
+            if self.config_path.exists():
+                # The temporary file is only readable by its owner, the config file keeps its permissions
+                shutil.copymode(self.config_path, file.name)
+            os.replace(file.name, self.config_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(file.name)
+            raise
+        self.config.mark_clean()
+        return True
 
     def __enter__(self):
         return self.load()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.save()
+        # The config isn't saved if it was being edited when an exception was raised
+        if exc_type is None:
+            self.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+import functools
+import os
+import re
+import threading
+
+# Matches $(variable_name) in an attribute, the variable name is captured
+TEMPLATE_PATTERN = re.compile(r"\$\(([\w\d\-\+]+)\)")
+
+
+class Template:
+    """
+    An attribute split into its literal text and the environment variables that are placed between it,
+    so that it can be resolved without being searched again
+    """
+    __slots__ = ("literals", "variables")
+
+    def __init__(self, literals, variables):
+        """
+        Args:
+            literals (Tuple[str, ...]): The text around the variables, there is always one more than the variables
+            variables (Tuple[str, ...]): The names of the environment variables in the order they appear
+        """
+        self.literals = literals
+        self.variables = variables
+
+    def render(self, environ=None):
+        """
+        Replaces each variable with its value, variables that aren't set are replaced with an empty string
+
+        Args:
+            environ (Mapping[str, str]): The environment variables, defaults to os.environ
+
+        Returns:
+            str: The resolved attribute
+        """
+        if len(self.variables) == 0:
+            return self.literals[0]
+        if environ is None:
+            environ = os.environ
+        parts = [self.literals[0]]
+        for variable, literal in zip(self.variables, self.literals[1:]):
+            parts.append(environ.get(variable, ""))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(attribute: str) -> Template:
+    """
+    Compiles an attribute into a template, attributes are only compiled once
+
+    Args:
+        attribute (str): The attribute value
+
+    Returns:
+        Template: The template
+    """
+    parts = TEMPLATE_PATTERN.split(attribute)
+    # The split alternates between literal text and the captured variable names
+    return Template(tuple(parts[0::2]), tuple(parts[1::2]))
+
+
+def get_config_attribute(attribute: str) -> str:
+    """
+    Replaces all occurrences of $(variable_name) in an attribute with the associated environment variable
+    Args:
+        attribute: The attribute value
+
+    Returns:
+        The attribute
+    """
+    if type(attribute) != str:
+        return attribute
+    return compile_template(attribute).render()
+
+
+class Resolver:
+    """
+    Resolves attributes against the environment, each attribute is only resolved once.
+    Long running processes call refresh once the environment has changed
+    """
+    def __init__(self, environ=None):
+        """
+        Args:
+            environ (Mapping[str, str]): The environment variables, defaults to os.environ
+        """
+        self.environ = environ
+        self._lock = threading.Lock()
+        self._resolved = {}
+        # Incremented on every refresh, so that holders of resolved values know to resolve them again
+        self.generation = 0
+
+    def resolve(self, attribute):
+        """
+        Args:
+            attribute (any): The attribute value, values that aren't strings are returned unchanged
+
+        Returns:
+            any: The resolved attribute
+        """
+        if type(attribute) != str:
+            return attribute
+        try:
+            return self._resolved[attribute]
+        except KeyError:
+            pass
+        value = compile_template(attribute).render(self.environ)
+        with self._lock:
+            self._resolved[attribute] = value
+        return value
+
+    def resolve_mapping(self, mapping):
+        """
+        Args:
+            mapping (dict): The attributes keyed by any value
+
+        Returns:
+            dict: The resolved attributes under the same keys
+        """
+        return {key: self.resolve(value) for key, value in mapping.items()}
+
+    def refresh(self):
+        """
+        Forgets every resolved attribute, they are resolved against the environment again when next used
+        """
+        with self._lock:
+            self._resolved = {}
+            self.generation += 1
+
+
+# The resolver shared by the runners and the pusher
+resolver = Resolver()
@@ -0,0 +1,15 @@
+class RunnerException(Exception):
+    pass
+
+
+class ScriptJobException(RunnerException):
+    script_name: str
+
+    def __init__(self, message, script_name):
+        super().__init__(message)
+
+        self.script_name = script_name
+
+
+class ScriptImportException(ScriptJobException):
+    pass
@@ -0,0 +1,295 @@
+import contextlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from SeeThru_Feeds.Model.Scripts.ResultSerializer import dumps, write_atomic
+
+# The phases of a script that are timed, in the order that they happen
+PHASES = ("import", "instantiate", "check_fillables", "run", "evaluate", "export", "push")
+
+# The formats that metrics can be written in
+METRICS_FORMATS = ["prometheus", "json"]
+
+
+class PhaseTiming:
+    """
+    The time spent in one phase of one script, accumulated over every time the phase was ran
+    """
+    __slots__ = ("count", "wall", "cpu", "last_wall", "last_cpu")
+
+    def __init__(self):
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.last_wall = 0.0
+        self.last_cpu = 0.0
+
+    def add(self, wall: float, cpu: float):
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        self.last_wall = wall
+        self.last_cpu = cpu
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "wall_seconds": self.wall, "cpu_seconds": self.cpu,
+                "last_wall_seconds": self.last_wall, "last_cpu_seconds": self.last_cpu}
+
+
+class RunMetrics:
+    """
+    Records the wall clock and CPU time of each phase of each script.
+    The CPU time is that of the thread the phase was ran on, so asynchronous scripts awaited together on an event loop
+    also count the CPU time of the scripts that ran whilst they were waiting
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: Dict[Tuple[str, str], PhaseTiming] = {}
+        self.created = time.time()
+        self.updated = self.created
+
+    def record(self, script_name: str, phase: str, wall: float, cpu: float):
+        """
+        Records the time spent in a phase of a script
+
+        Args:
+            script_name (str): The name of the script
+            phase (str): The phase, one of PHASES
+            wall (float): The number of wall clock seconds spent
+            cpu (float): The number of CPU seconds spent
+        """
+        with self._lock:
+            timing = self._timings.get((script_name, phase))
+            if timing is None:
+                timing = self._timings[(script_name, phase)] = PhaseTiming()
+            timing.add(wall, cpu)
+            self.updated = time.time()
+
+    @contextlib.contextmanager
+    def phase(self, script_name: str, phase: str):
+        """
+        Times a phase of a script, the phase is recorded even if it raises an exception
+
+        Args:
+            script_name (str): The name of the script
+            phase (str): The phase, one of PHASES
+        """
+        wallStart = time.perf_counter()
+        cpuStart = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(script_name, phase, time.perf_counter() - wallStart, time.thread_time() - cpuStart)
+
+    def merge(self, records: List[Tuple[str, str, float, float]]):
+        """
+        Records the phases timed elsewhere, such as in a worker process
+
+        Args:
+            records (List[Tuple[str, str, float, float]]): The script name, phase, wall and CPU seconds of each phase
+        """
+        for record in records:
+            self.record(*record)
+
+    def records(self) -> List[Tuple[str, str, float, float]]:
+        """
+        Returns:
+            List[Tuple[str, str, float, float]]: The script name, phase, wall and CPU seconds of the last time
+                                                 each phase was ran, which can be merged into other metrics
+        """
+        with self._lock:
+            return [(script, phase, timing.last_wall, timing.last_cpu)
+                    for (script, phase), timing in self._timings.items()]
+
+    def timings(self) -> Dict[str, Dict[str, PhaseTiming]]:
+        """
+        Returns:
+            Dict[str, Dict[str, PhaseTiming]]: The timing of each phase, keyed by the script name then the phase
+        """
+        with self._lock:
+            scripts: Dict[str, Dict[str, PhaseTiming]] = {}
+            for (script, phase), timing in sorted(self._timings.items()):
+                copy = PhaseTiming()
+                for attribute in PhaseTiming.__slots__:
+                    setattr(copy, attribute, getattr(timing, attribute))
+                scripts.setdefault(script, {})[phase] = copy
+            return scripts
+
+    def slowest(self, count: int = 5) -> List[Tuple[str, float]]:
+        """
+        Args:
+            count (int): The number of scripts
+
+        Returns:
+            List[Tuple[str, float]]: The scripts that spent the longest in their last run, with the seconds spent
+        """
+        totals = {script: sum(timing.last_wall for phase, timing in phases.items() if phase != "import")
+                  for script, phases in self.timings().items()}
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+class MetricsWriter:
+    """
+    Writes metrics to a file, the file is replaced atomically so that scrapers never read a partial file
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (Union[str, Path]): The path of the file
+        """
+        self.path = Path(path)
+
+    def render(self, metrics: RunMetrics) -> str:
+        """
+        Args:
+            metrics (RunMetrics): The metrics
+
+        Returns:
+            str: The content of the file
+        """
+        raise NotImplementedError("render isn't implemented for this writer")
+
+    def write(self, metrics: RunMetrics):
+        """
+        Writes the metrics to the file
+
+        Args:
+            metrics (RunMetrics): The metrics
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, self.render(metrics))
+
+
+class JSONMetricsWriter(MetricsWriter):
+    """
+    Writes metrics as a json document, keyed by the script name then the phase
+    """
+    def render(self, metrics: RunMetrics) -> str:
+        return dumps({
+            "created": metrics.created,
+            "updated": metrics.updated,
+            "scripts": {script: {phase: timing.to_dict() for phase, timing in phases.items()}
+                        for script, phases in metrics.timings().items()}
+        })
+
+
+def escape_label(value: str) -> str:
+    """
+    Returns:
+        str: The value escaped to be used as a prometheus label value
+    """
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusTextfileWriter(MetricsWriter):
+    """
+    Writes metrics in the prometheus text format, to be read by the textfile collector of node_exporter.
+    The path should end with .prom and be in the directory of the collector
+    """
+    PREFIX = "seethru_feeds"
+
+    # The metrics written for each phase, with their type, help and the attribute of the timing
+    METRICS = [
+        ("script_phase_seconds_total", "counter", "Wall clock seconds spent in each phase of each script", "wall"),
+        ("script_phase_cpu_seconds_total", "counter", "CPU seconds spent in each phase of each script", "cpu"),
+        ("script_phase_runs_total", "counter", "The number of times each phase of each script was ran", "count"),
+        ("script_phase_last_seconds", "gauge", "Wall clock seconds spent in the last run of each phase", "last_wall"),
+        ("script_phase_last_cpu_seconds", "gauge", "CPU seconds spent in the last run of each phase", "last_cpu")
+    ]
+
+    def render(self, metrics: RunMetrics) -> str:
+        timings = metrics.timings()
+        lines = []
+        for name, kind, description, attribute in self.METRICS:
+            lines.append(f"# HELP {self.PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {self.PREFIX}_{name} {kind}")
+            for script, phases in timings.items():
+                for phase, timing in phases.items():
+                    lines.append(f'{self.PREFIX}_{name}{{script="{escape_label(script)}",phase="{phase}"}} '
+                                 f'{getattr(timing, attribute)!r}')
+        lines.append(f"# HELP {self.PREFIX}_metrics_updated_timestamp_seconds When the metrics were last updated")
+        lines.append(f"# TYPE {self.PREFIX}_metrics_updated_timestamp_seconds gauge")
+        lines.append(f"{self.PREFIX}_metrics_updated_timestamp_seconds {metrics.updated!r}")
+        return "\n".join(lines) + "\n"
+
+
+def create_metrics_writer(path, kind: Optional[str] = None) -> MetricsWriter:
+    """
+    Creates a metrics writer
+
+    Args:
+        path (Union[str, Path]): The path of the file
+        kind (str): Either "prometheus" or "json", defaults to prometheus for paths ending with .prom, otherwise json
+
+    Returns:
+        MetricsWriter: The writer
+    """
+    if kind is None:
+        kind = "prometheus" if str(path).endswith(".prom") else "json"
+    if kind == "prometheus":
+        return PrometheusTextfileWriter(path)
+    elif kind == "json":
+        return JSONMetricsWriter(path)
+    raise ValueError(f"The metrics format must be one of {', '.join(METRICS_FORMATS)}")
+
+
+class MetricsWriteLoop:
+    """
+    Writes metrics on a background thread, for long running feed schemes
+    """
+    def __init__(self, writer: MetricsWriter, metrics: RunMetrics, interval: float = 15):
+        """
+        Args:
+            writer (MetricsWriter): The writer
+            metrics (RunMetrics): The metrics to write
+            interval (float): The number of seconds between each write
+        """
+        self.writer = writer
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def write(self):
+        """
+        Writes the metrics, any failure is reported
+        """
+        try:
+            self.writer.write(self.metrics)
+        except Exception as e:
+            print(f"Writing the metrics failed: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        """
+        Starts the background thread
+
+        Returns:
+            MetricsWriteLoop: The write loop
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="MetricsWriteLoop", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the background thread and writes the metrics a final time
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
@@ -0,0 +1,248 @@
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+
+
+class OutboxEntry:
+    """
+    A push that is waiting to be delivered
+    """
+    def __init__(self, guid: str, api_key: str, result: ScriptResult, attempts: int = 0, next_attempt: float = 0.0):
+        """
+        Args:
+            guid (str): The guid of the feed
+            api_key (str): The reference of the api key in the config, the key itself is never stored
+            result (ScriptResult): The result to push
+            attempts (int): The number of times that delivery has been retried
+            next_attempt (float): The epoch time from when the push can be retried
+        """
+        self.guid = guid
+        self.api_key = api_key
+        self.result = result
+        self.attempts = attempts
+        self.next_attempt = next_attempt
+
+    @staticmethod
+    def load(data: dict) -> "OutboxEntry":
+        """
+        Parses a record of the outbox into an entry
+
+        Args:
+            data (dict): The record
+
+        Returns:
+            OutboxEntry: The entry
+        """
+        return OutboxEntry(
+            data["guid"],
+            data["api_key"],
+            ScriptResult.from_payload((data["status"], data["message"], data["timestamp"])),
+            data.get("attempts", 0),
+            data.get("next_attempt", 0.0)
+        )
+
+    def dump(self) -> dict:
+        """
+        Dumps the entry into a record of the outbox
+
+        Returns:
+            dict: The record
+        """
+        status, message, timestamp = self.result.to_payload()
+        return {
+            "guid": self.guid,
+            "api_key": self.api_key,
+            "status": status,
+            "message": message,
+            "timestamp": timestamp,
+            "attempts": self.attempts,
+            "next_attempt": self.next_attempt
+        }
+
+
+class Outbox:
+    """
+    An append-only file of the pushes that failed, so that they can be retried with exponential backoff.
+    Only the newest push of each feed is kept, a feed that has since been delivered is dropped from the outbox
+    """
+    def __init__(self, path: Path, base_delay: float = 5, max_delay: float = 600):
+        """
+        Args:
+            path (Path): The outbox file
+            base_delay (float): The number of seconds before the first retry
+            max_delay (float): The maximum number of seconds between retries
+        """
+        self.path = Path(path)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        # The guids of the feeds waiting in the outbox, loaded on first use
+        self._pending_guids: Optional[set] = None
+        # Counts the pushes added or delivered for each feed, so that a replay can tell its entry has gone stale
+        self._versions: Dict[str, int] = {}
+        self._feed_locks: Dict[str, threading.Lock] = {}
+
+    def _append(self, record: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _read(self, entries: Dict[str, OutboxEntry], offset: int = 0) -> int:
+        """
+        Applies the records of the outbox file to the entries
+
+        Args:
+            entries (Dict[str, OutboxEntry]): The newest pending entry of each feed, keyed by the guid
+            offset (int): The position in the file to read the records from
+
+        Returns:
+            int: The position of the end of the file
+        """
+        if not self.path.exists():
+            return offset
+        with self.path.open("rb") as file:
+            file.seek(offset)
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A partially written record, from a crash whilst appending
+                    continue
+                if record.get("delivered", False):
+                    entries.pop(record["guid"], None)
+                else:
+                    entries[record["guid"]] = OutboxEntry.load(record)
+            return file.tell()
+
+    def feed_lock(self, guid: str) -> threading.Lock:
+        """
+        Args:
+            guid (str): The guid of the feed
+
+        Returns:
+            threading.Lock: The lock held whilst the feed is pushed, so that a retry never overlaps a newer push
+        """
+        with self._lock:
+            return self._feed_locks.setdefault(guid, threading.Lock())
+
+    def _pending(self) -> set:
+        if self._pending_guids is None:
+            entries = {}
+            self._read(entries)
+            self._pending_guids = set(entries.keys())
+        return self._pending_guids
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Args:
+            attempts (int): The number of retries that have been made
+
+        Returns:
+            float: The number of seconds to wait before the next retry, with jitter
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def add(self, guid: str, api_key: str, result: ScriptResult):
+        """
+        Adds a push that failed to the outbox, replacing any push already waiting for the feed
+
+        Args:
+            guid (str): The guid of the feed
+            api_key (str): The reference of the api key in the config
+            result (ScriptResult): The result that couldn't be pushed
+        """
+        entry = OutboxEntry(guid, api_key, result, 0, time.time() + self.backoff(0))
+        with self._lock:
+            self._append(entry.dump())
+            self._pending().add(guid)
+            self._versions[guid] = self._versions.get(guid, 0) + 1
+
+    def delivered(self, guid: str):
+        """
+        Records that a feed has been pushed, any older push waiting for the feed is dropped
+
+        Args:
+            guid (str): The guid of the feed
+        """
+        with self._lock:
+            if guid not in self._pending():
+                return
+            self._append({"guid": guid, "delivered": True})
+            self._pending().discard(guid)
+            self._versions[guid] = self._versions.get(guid, 0) + 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending())
+
+    def replay(self, push: Callable[[OutboxEntry], Optional[bool]]) -> Tuple[int, int]:
+        """
+        Retries every push that is due, the outbox is then compacted to the pushes still waiting.
+        Each push is made whilst holding the lock of its feed, and is skipped if the feed has been pushed
+        or has failed again since the outbox was read
+
+        Args:
+            push (Callable[[OutboxEntry], Optional[bool]]): Pushes an entry, returning True if it was delivered,
+                                                           False if it should be retried and None if it should be
+                                                           dropped
+
+        Returns:
+            Tuple[int, int]: The number of pushes delivered and the number still waiting
+        """
+        entries: Dict[str, OutboxEntry] = {}
+        with self._lock:
+            offset = self._read(entries)
+            versions = dict(self._versions)
+        delivered = 0
+        now = time.time()
+        for guid, entry in list(entries.items()):
+            if entry.next_attempt > now:
+                continue
+            with self.feed_lock(guid):
+                with self._lock:
+                    stale = self._versions.get(guid, 0) != versions.get(guid, 0)
+                if stale:
+                    # The newer record is read back once the replay has finished
+                    del entries[guid]
+                    continue
+                outcome = push(entry)
+            if outcome is None or outcome:
+                if outcome:
+                    delivered += 1
+                del entries[guid]
+            else:
+                entry.attempts += 1
+                entry.next_attempt = time.time() + self.backoff(entry.attempts)
+
+        with self._lock:
+            # Any record appended whilst replaying is newer than the replayed entries
+            self._read(entries, offset)
+            self._compact(entries)
+            return delivered, len(entries)
+
+    def _compact(self, entries: Dict[str, OutboxEntry]):
+        """
+        Atomically rewrites the outbox file with only the given entries
+        """
+        self._pending_guids = set(entries.keys())
+        if len(entries) == 0:
+            if self.path.exists():
+                self.path.unlink()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporaryPath = self.path.with_name(self.path.name + ".tmp")
+        with temporaryPath.open("w") as file:
+            for entry in entries.values():
+                file.write(json.dumps(entry.dump()) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, self.path)
@@ -0,0 +1,8 @@
+# The choices of the profile program, kept apart from the profiler so that the command line can read them
+# without importing the profilers on every start
+
+# The profilers that a feed scheme can be profiled with
+PROFILE_MODES = ["deterministic", "sampling"]
+
+# The columns that the report can be sorted by
+PROFILE_SORTS = ["cpu", "wall", "memory"]
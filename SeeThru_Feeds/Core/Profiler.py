@@ -0,0 +1,368 @@
+import cProfile
+import collections
+import contextlib
+import functools
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from SeeThru_Feeds.Core.Config import Config
+from SeeThru_Feeds.Core.ProfileOptions import PROFILE_MODES, PROFILE_SORTS
+from SeeThru_Feeds.Model.Components.AsyncComponentBase import AsyncComponentBase
+from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
+from SeeThru_Feeds.Model.Scripts.OutputSink import OutputSink
+
+
+class ProfileEntry:
+    """
+    The time and memory attributed to a script or to a component class
+    """
+    __slots__ = ("name", "kind", "calls", "wall", "cpu", "peak")
+
+    def __init__(self, name: str, kind: str):
+        """
+        Args:
+            name (str): The name of the script or the qualified name of the component class
+            kind (str): Either "script" or "component"
+        """
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        # The most bytes allocated at once above what was allocated when the script or component started
+        self.peak = 0
+
+    def add(self, wall: float, cpu: float, peak: int):
+        self.calls += 1
+        self.wall += wall
+        self.cpu += cpu
+        self.peak = max(self.peak, peak)
+
+
+class MemoryTracker:
+    """
+    Measures the peak memory allocated by nested blocks with tracemalloc,
+    which only keeps a single peak, so the peak of each enclosing block is kept here
+    """
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled (bool): Whether allocations are traced, every peak is 0 if not
+        """
+        self.enabled = enabled
+        # The allocated bytes at the start of each open block and the peak seen within it
+        self._stack: List[List[int]] = []
+
+    def __enter__(self):
+        if self.enabled:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.enabled:
+            tracemalloc.stop()
+
+    def _observe(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        if len(self._stack) != 0:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def enter(self):
+        """
+        Opens a block
+        """
+        if not self.enabled:
+            return
+        current = self._observe()
+        self._stack.append([current, current])
+
+    def exit(self) -> int:
+        """
+        Closes the innermost block
+
+        Returns:
+            int: The peak number of bytes allocated within the block, above those allocated when it was opened
+        """
+        if not self.enabled:
+            return 0
+        self._observe()
+        start, peak = self._stack.pop()
+        if len(self._stack) != 0:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        return peak - start
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of a thread at an interval, the samples can be written in the collapsed stack format
+    read by flame graph viewers such as speedscope
+    """
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Args:
+            interval (float): The number of seconds between each sample
+            thread_id (int): The identifier of the thread that is sampled, defaults to the current thread
+        """
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples: Dict[tuple, int] = collections.Counter()
+        # The frame placed at the root of every sample, such as the name of the script being ran
+        self.root = "scheme"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(self.root)
+        stack.reverse()
+        self.samples[tuple(stack)] += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """
+        Starts sampling on a background thread
+
+        Returns:
+            SamplingProfiler: The profiler
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops sampling
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path):
+        """
+        Writes the samples in the collapsed stack format, a line of semicolon separated frames and a count per stack
+
+        Args:
+            path (Union[str, Path]): The path of the file
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}\n")
+
+
+def safe_file_name(name: str) -> str:
+    """
+    Returns:
+        str: The name with any character that can't be used in a file name replaced
+    """
+    return re.sub(r"[^\w.\-]", "_", name)
+
+
+class SchemeProfiler:
+    """
+    Runs every script of a feed scheme one at a time, attributing the wall clock time, CPU time and peak allocations
+    to each script and to each component class that the scripts run.
+    Outputs are discarded and nothing is pushed, so profiling has no effect on the feeds
+    """
+    def __init__(self, config: Config, mode: str = "deterministic", interval: float = 0.005, memory: bool = True):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            mode (str): Either "deterministic", profiling every call with cProfile, or "sampling",
+                        sampling the stack at the interval which slows the scripts down far less
+            interval (float): The number of seconds between each sample, only used when sampling
+            memory (bool): Whether the peak allocations are measured with tracemalloc, which slows the scripts down
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"The profile mode must be one of {', '.join(PROFILE_MODES)}")
+        if type(interval) not in [int, float] or interval <= 0:
+            raise ValueError("The sampling interval must be a positive number of seconds")
+        self.config = config
+        self.mode = mode
+        self.interval = interval
+        self.memory = MemoryTracker(memory)
+        self.scripts: Dict[str, ProfileEntry] = {}
+        self.components: Dict[str, ProfileEntry] = {}
+        self._lock = threading.Lock()
+
+    def record_component(self, component: ComponentBase, wall: float, cpu: float, peak: int):
+        name = f"{type(component).__module__}.{type(component).__qualname__}"
+        with self._lock:
+            if name not in self.components:
+                self.components[name] = ProfileEntry(name, "component")
+            self.components[name].add(wall, cpu, peak)
+
+    @contextlib.contextmanager
+    def measure(self):
+        """
+        Measures a block, yielding a list which holds the wall clock time, CPU time and peak allocation once it ends
+        """
+        measurement = []
+        self.memory.enter()
+        wallStart = time.perf_counter()
+        cpuStart = time.thread_time()
+        try:
+            yield measurement
+        finally:
+            measurement.extend([time.perf_counter() - wallStart, time.thread_time() - cpuStart, self.memory.exit()])
+
+    @contextlib.contextmanager
+    def component_tracking(self):
+        """
+        Measures every component that is ran by the current thread whilst the block is open.
+        The run methods of the component base classes are replaced for the whole process, so they are always restored
+        when the block exits, and components ran by other threads are left unmeasured
+        """
+        profiler = self
+        thread = threading.get_ident()
+        run = ComponentBase.run
+        runAsync = AsyncComponentBase.run
+
+        @functools.wraps(run)
+        def tracked_run(component):
+            if threading.get_ident() != thread:
+                return run(component)
+            with profiler.measure() as measurement:
+                result = run(component)
+            profiler.record_component(component, *measurement)
+            return result
+
+        @functools.wraps(runAsync)
+        async def tracked_run_async(component):
+            if threading.get_ident() != thread:
+                return await runAsync(component)
+            with profiler.measure() as measurement:
+                result = await runAsync(component)
+            profiler.record_component(component, *measurement)
+            return result
+
+        try:
+            ComponentBase.run = tracked_run
+            AsyncComponentBase.run = tracked_run_async
+            yield
+        finally:
+            ComponentBase.run = run
+            AsyncComponentBase.run = runAsync
+
+    def profile_job(self, job, log):
+        """
+        Runs a single job, the result of the script is discarded
+
+        Args:
+            job (ScriptJob): The job
+            log (TextIO): The log buffer of the job
+        """
+        if job.is_async():
+            import asyncio
+            asyncio.run(job.execute_async(log))
+        else:
+            job.execute(log)
+
+    def run(self, output_dir, scripts: Optional[List[str]] = None) -> List[ProfileEntry]:
+        """
+        Profiles the scripts of the scheme, writing the raw profiles to the output directory.
+        In deterministic mode a pstats file is written for each script along with scheme.prof, which combines them.
+        In sampling mode the samples of every script are written to scheme.collapsed
+
+        Args:
+            output_dir (Union[str, Path]): The directory the raw profiles are written to
+            scripts (List[str]): The names of the scripts to profile, every script if None
+
+        Returns:
+            List[ProfileEntry]: The entries of every script and component class that was ran
+        """
+        # The runner and its dependencies, such as requests, are only imported when profiling
+        from SeeThru_Feeds.Core.Runner import ScriptJob, capture_job_log
+        outputDir = Path(output_dir)
+        outputDir.mkdir(parents=True, exist_ok=True)
+        jobs = [ScriptJob(key, script, OutputSink()) for key, script in self.config.Scripts.items()]
+        if scripts is not None:
+            jobs = [job for job in jobs if job.script_name in scripts]
+        # The scripts are imported first, so that importing isn't attributed to them
+        loaded = []
+        for job in jobs:
+            with capture_job_log(job) as log:
+                job.load_class()
+                loaded.append(job)
+            print(log.getvalue(), end="")
+
+        combined: Optional[pstats.Stats] = None
+        sampler = SamplingProfiler(self.interval) if self.mode == "sampling" else None
+        with self.memory, self.component_tracking(), sampler if sampler is not None else contextlib.nullcontext():
+            for job in loaded:
+                profile = cProfile.Profile() if self.mode == "deterministic" else None
+                if sampler is not None:
+                    sampler.root = job.script_name
+                with capture_job_log(job) as log, self.measure() as measurement:
+                    if profile is not None:
+                        profile.enable()
+                    try:
+                        self.profile_job(job, log)
+                    finally:
+                        if profile is not None:
+                            profile.disable()
+                if sampler is not None:
+                    sampler.root = "scheme"
+                print(log.getvalue(), end="")
+                job.sink.take()
+
+                entry = self.scripts.setdefault(job.script_name, ProfileEntry(job.script_name, "script"))
+                entry.add(*measurement)
+                if profile is not None:
+                    profile.dump_stats(str(outputDir.joinpath(f"{safe_file_name(job.script_name)}.prof")))
+                    if combined is None:
+                        combined = pstats.Stats(profile)
+                    else:
+                        combined.add(profile)
+        if combined is not None:
+            combined.dump_stats(str(outputDir.joinpath("scheme.prof")))
+        if sampler is not None:
+            sampler.write_collapsed(outputDir.joinpath("scheme.collapsed"))
+        return list(self.scripts.values()) + list(self.components.values())
+
+
+def render_table(entries: List[ProfileEntry], sort: str = "cpu") -> str:
+    """
+    Renders profile entries as a text table, sorted by a column with the largest first
+
+    Args:
+        entries (List[ProfileEntry]): The entries
+        sort (str): Either "cpu", "wall" or "memory"
+
+    Returns:
+        str: The table
+    """
+    if sort not in PROFILE_SORTS:
+        raise ValueError(f"The sort must be one of {', '.join(PROFILE_SORTS)}")
+    key = {"cpu": lambda entry: entry.cpu, "wall": lambda entry: entry.wall, "memory": lambda entry: entry.peak}[sort]
+    width = max([len(entry.name) for entry in entries] + [4])
+    lines = [f"{'Name':<{width}}  {'Kind':<9}{'Calls':>7}{'Wall (s)':>11}{'CPU (s)':>11}{'Peak (KiB)':>12}"]
+    for entry in sorted(entries, key=key, reverse=True):
+        lines.append(f"{entry.name:<{width}}  {entry.kind:<9}{entry.calls:>7}{entry.wall:>11.4f}{entry.cpu:>11.4f}"
+                     f"{entry.peak / 1024:>12.1f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+
+
+class PushState:
+    """
+    The status and message last pushed to each feed, persisted so that unchanged results aren't pushed again.
+    An unchanged result is still pushed once the heartbeat has passed since the feed was last pushed
+    """
+    def __init__(self, path: Path, heartbeat: Optional[Union[int, float]] = 3600, save_interval: float = 10):
+        """
+        Args:
+            path (Path): The file that the state is persisted to
+            heartbeat (Union[int, float]): The number of seconds after which an unchanged result is pushed again,
+                                           unchanged results are never pushed again if None
+            save_interval (float): The minimum number of seconds between each save whilst feeds are being pushed
+        """
+        if heartbeat is not None and (type(heartbeat) not in [int, float] or heartbeat <= 0):
+            raise ValueError("The heartbeat must be a positive number of seconds")
+        self.path = Path(path)
+        self.heartbeat = heartbeat
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, dict] = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.load()
+
+    def load(self):
+        """
+        Loads the persisted state, a missing or corrupt file is treated as empty
+        """
+        with self._lock:
+            try:
+                with self.path.open() as file:
+                    feeds = json.load(file)
+            except (OSError, ValueError):
+                feeds = {}
+            self._feeds = feeds if isinstance(feeds, dict) else {}
+            self._dirty = False
+
+    def changed(self, guid: str, result: ScriptResult) -> bool:
+        """
+        Args:
+            guid (str): The guid of the feed
+            result (ScriptResult): The result to push
+
+        Returns:
+            bool: Whether the result differs from the one last pushed, or the heartbeat has passed
+        """
+        with self._lock:
+            last = self._feeds.get(guid)
+        if last is None:
+            return True
+        if last.get("status") != result.get_status() or last.get("message") != result.get_message():
+            return True
+        return self.heartbeat is not None and time.time() - last.get("pushed_at", 0) >= self.heartbeat
+
+    def record(self, guid: str, result: ScriptResult):
+        """
+        Records that a result has been pushed to a feed
+
+        Args:
+            guid (str): The guid of the feed
+            result (ScriptResult): The result that was pushed
+        """
+        with self._lock:
+            self._feeds[guid] = {
+                "status": result.get_status(),
+                "message": result.get_message(),
+                "pushed_at": time.time()
+            }
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def save(self):
+        """
+        Atomically writes the state to its file, if anything has been recorded since it was last saved
+        """
+        with self._lock:
+            self._last_save = time.monotonic()
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporaryPath = self.path.with_name(self.path.name + ".tmp")
+            with temporaryPath.open("w") as file:
+                json.dump(self._feeds, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporaryPath, self.path)
+            self._dirty = False
@@ -0,0 +1,337 @@
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from SeeThru_Feeds.Core.Config import Config
+from SeeThru_Feeds.Core.Config.Feed import Feed as ConfigFeed
+from SeeThru_Feeds.Core.Environment import resolver
+from SeeThru_Feeds.Core.Metrics import RunMetrics
+from SeeThru_Feeds.Core.Outbox import Outbox, OutboxEntry
+from SeeThru_Feeds.Core.PushState import PushState
+from SeeThru_Feeds.Model.Feeds.Feed import Feed
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+
+
+class FeedPusher:
+    """
+    Pushes the results of scripts to every feed in the config that uses the script
+    """
+    def __init__(self, config: Config, session: Optional[FeedSession] = None, outbox: Optional[Outbox] = None,
+                 push_state: Optional[PushState] = None, metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            session (FeedSession): The session every feed is pushed with, the shared session is used if None
+            outbox (Outbox): Where pushes that fail are kept to be retried, failed pushes are lost if None
+            push_state (PushState): The results last pushed to each feed, only changed results are pushed if given,
+                                    otherwise every result is pushed
+            metrics (RunMetrics): Where the time spent pushing is recorded against each script, not timed if None
+        """
+        self.config = config
+        self.session = session
+        self.outbox = outbox
+        self.push_state = push_state
+        self.metrics = metrics
+        # Maps the script name to the feeds that use the script, feeds without a valid api key are left out
+        self._feeds: Dict[str, List[ConfigFeed]] = {}
+        for name, feed in config.Feeds.items():
+            if feed.Api_Key not in config.Api_Keys:
+                print(f"The feed {name} uses the api key {feed.Api_Key} which doesn't exist, it won't be pushed")
+                continue
+            self._feeds.setdefault(feed.Script, []).append(feed)
+        self._api_keys: Dict[str, Tuple[str, str]] = {}
+        self.resolve_api_keys()
+
+    def resolve_api_keys(self):
+        """
+        Resolves the environment variables in every api key, this is done once when the pusher is created
+        and again whenever the environment is refreshed
+        """
+        self._api_keys = {
+            reference: (resolver.resolve(apiKey.Access_Token), resolver.resolve(apiKey.Secret))
+            for reference, apiKey in self.config.Api_Keys.items()
+        }
+        self._generation = resolver.generation
+
+    def feeds_for(self, script_name: str) -> List[ConfigFeed]:
+        """
+        Args:
+            script_name (str): The name of the script
+
+        Returns:
+            List[Feed]: The config feeds that use the script
+        """
+        return self._feeds.get(script_name, [])
+
+    def create_feed(self, guid: str, api_key: str, result: ScriptResult) -> Feed:
+        """
+        Creates the feed which pushes a result
+
+        Args:
+            guid (str): The guid of the feed
+            api_key (str): The reference of the api key in the config
+            result (ScriptResult): The result to push
+
+        Returns:
+            Feed: The feed
+        """
+        if self._generation != resolver.generation:
+            self.resolve_api_keys()
+        accessToken, secret = self._api_keys[api_key]
+        feed = Feed()
+        feed.set_guid(guid)
+        feed.set_api_key(accessToken, secret)
+        feed.set_script_result(result)
+        feed.set_session(self.session)
+        return feed
+
+    def deliver(self, guid: str, api_key: str, result: ScriptResult) -> Optional[bool]:
+        """
+        Pushes a result to a feed, any failure is reported
+
+        Args:
+            guid (str): The guid of the feed
+            api_key (str): The reference of the api key in the config
+            result (ScriptResult): The result to push
+
+        Returns:
+            Optional[bool]: True if the push was delivered, False if it failed and can be retried,
+                            None if it was rejected by the api
+        """
+        try:
+            response = self.create_feed(guid, api_key, result).push()
+        except requests.RequestException as e:
+            print(f"Feed push failed for {guid}: {e}")
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            # A response that isn't the json the api sends, such as an error page from a proxy
+            print(f"Feed push failed for {guid}, the api response couldn't be read: {e}")
+            return False
+        if response is False:
+            print(f"Feed push failed for {guid}, the api didn't respond successfully")
+            return False
+        elif response != "":
+            print(f"Feed push failed for {guid} with message: {response}")
+            return None
+        return True
+
+    def push_feed(self, config_feed: ConfigFeed, result: ScriptResult) -> bool:
+        """
+        Pushes a result to a single config feed, a push that can be retried is added to the outbox.
+        With a push state, a result that hasn't changed since it was last pushed is skipped.
+        With an outbox, the feed is locked whilst it is pushed so that a retry of an older result can't overtake it
+
+        Args:
+            config_feed (Feed): The config feed
+            result (ScriptResult): The result to push
+
+        Returns:
+            bool: Whether the push succeeded, or was skipped
+        """
+        if self.outbox is None:
+            return self._push_feed(config_feed, result)
+        with self.outbox.feed_lock(config_feed.Guid):
+            return self._push_feed(config_feed, result)
+
+    def _push_feed(self, config_feed: ConfigFeed, result: ScriptResult) -> bool:
+        if self.push_state is not None and not self.push_state.changed(config_feed.Guid, result):
+            # The feed already shows this result, so an older push still waiting to be retried is stale
+            if self.outbox is not None:
+                self.outbox.delivered(config_feed.Guid)
+            return True
+
+        if self.metrics is not None:
+            with self.metrics.phase(config_feed.Script, "push"):
+                outcome = self.deliver(config_feed.Guid, config_feed.Api_Key, result)
+        else:
+            outcome = self.deliver(config_feed.Guid, config_feed.Api_Key, result)
+        if outcome is True and self.push_state is not None:
+            self.push_state.record(config_feed.Guid, result)
+        if self.outbox is not None:
+            if outcome is True:
+                self.outbox.delivered(config_feed.Guid)
+            elif outcome is False:
+                self.outbox.add(config_feed.Guid, config_feed.Api_Key, result)
+        return outcome is True
+
+    def retry_outbox(self) -> Tuple[int, int]:
+        """
+        Retries every push in the outbox that is due, pushes whose api key no longer exists are dropped
+
+        Returns:
+            Tuple[int, int]: The number of pushes delivered and the number still waiting
+        """
+        if self.outbox is None:
+            return 0, 0
+
+        def replay(entry: OutboxEntry) -> Optional[bool]:
+            if entry.api_key not in self.config.Api_Keys:
+                return None
+            outcome = self.deliver(entry.guid, entry.api_key, entry.result)
+            if outcome is True and self.push_state is not None:
+                self.push_state.record(entry.guid, entry.result)
+            return outcome
+
+        return self.outbox.replay(replay)
+
+    def save_state(self):
+        """
+        Saves the results last pushed to each feed, if only changed results are pushed
+        """
+        if self.push_state is not None:
+            self.push_state.save()
+
+    def push(self, script_name: str, result: ScriptResult):
+        """
+        Pushes a script result to every feed that uses the script
+
+        Args:
+            script_name (str): The name of the script
+            result (ScriptResult): The result of the script
+        """
+        for config_feed in self.feeds_for(script_name):
+            self.push_feed(config_feed, result)
+
+    def push_all(self, script_results: Dict[str, ScriptResult]):
+        """
+        Pushes the result of every script
+
+        Args:
+            script_results (Dict[str, ScriptResult]): The results keyed by the script name
+        """
+        for script_name, result in script_results.items():
+            self.push(script_name, result)
+
+
+class FeedPipeline:
+    """
+    Pushes results whilst scripts are still running, results are queued as soon as they are produced
+    and a bounded set of uploader threads drain the queue.
+    Queueing blocks once the queue is full, so producers are held back when the api is slow
+    """
+    def __init__(self, pusher: FeedPusher, uploaders: int = 4, queue_size: Optional[int] = None):
+        """
+        Args:
+            pusher (FeedPusher): The pusher that the uploaders push with
+            uploaders (int): The number of pushes that are made at once
+            queue_size (int): The number of pushes that can be waiting, defaults to ten per uploader
+        """
+        if type(uploaders) != int or uploaders < 1:
+            raise ValueError("The number of uploaders must be a positive integer")
+        if queue_size is None:
+            queue_size = uploaders * 10
+        self.pusher = pusher
+        self.uploaders = uploaders
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """
+        Starts the uploader threads
+
+        Returns:
+            FeedPipeline: The pipeline
+        """
+        while len(self._threads) < self.uploaders:
+            thread = threading.Thread(target=self._upload, name=f"FeedUploader-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _upload(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                config_feed, result = item
+                # The uploader must keep draining the queue, otherwise producers and close block forever
+                try:
+                    self.pusher.push_feed(config_feed, result)
+                except Exception as e:
+                    print(f"Pushing the feed {config_feed.Guid} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, script_name: str, result: ScriptResult):
+        """
+        Queues a script result to be pushed to every feed that uses the script,
+        this blocks whilst the queue is full
+
+        Args:
+            script_name (str): The name of the script
+            result (ScriptResult): The result of the script
+        """
+        for config_feed in self.pusher.feeds_for(script_name):
+            self._queue.put((config_feed, result))
+
+    def close(self):
+        """
+        Waits for every queued push to be made and stops the uploader threads
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+class OutboxRetryLoop:
+    """
+    Retries the pushes in the outbox on a background thread, for long running feed schemes
+    """
+    def __init__(self, pusher: FeedPusher, interval: float = 30):
+        """
+        Args:
+            pusher (FeedPusher): The pusher, with the outbox to retry
+            interval (float): The number of seconds between each check of the outbox
+        """
+        self.pusher = pusher
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.pusher.retry_outbox()
+            except Exception as e:
+                print(f"Retrying the outbox failed: {e}")
+
+    def start(self):
+        """
+        Starts the background thread
+
+        Returns:
+            OutboxRetryLoop: The retry loop
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="OutboxRetryLoop", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the background thread, waiting for any retry in progress
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,728 @@
+import asyncio
+import contextlib
+import importlib
+import io
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from SeeThru_Feeds.Core.Config import Config
+from SeeThru_Feeds.Core.Config.Script import Script as ConfigScript
+from SeeThru_Feeds.Core.Environment import resolver
+from SeeThru_Feeds.Core.Exceptions.Runner import ScriptImportException
+from SeeThru_Feeds.Core.Metrics import RunMetrics
+from SeeThru_Feeds.Core.WorkerPool import TaskSkipped, WorkerExited, WorkerPool, WorkerTimedOut
+from SeeThru_Feeds.Model.Scripts.AsyncScriptBase import AsyncScriptBase
+from SeeThru_Feeds.Model.Scripts.OutputSink import OutputSink
+from SeeThru_Feeds.Model.Scripts.ResultSerializer import write_json
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+from SeeThru_Feeds.Model.Scripts.ScriptState import StateEngine
+
+
+class ScriptJob:
+    """
+    A script entry of the config, prepared so that it can be imported, instantiated and ran
+    """
+    def __init__(self, key: str, script: ConfigScript, sink: Optional[OutputSink] = None,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            key (str): The key of the script in the config
+            script (Script): The config script
+            sink (OutputSink): The sink that the output of the script is exported to,
+                               the output is written straight to its output path if None
+            metrics (RunMetrics): Where the time spent in each phase of the script is recorded, not timed if None
+        """
+        self.key = key
+        self.script = script
+        self.sink = sink
+        self.metrics = metrics
+        self._script_class = None
+        self.resolve()
+
+    def resolve(self):
+        """
+        Resolves the environment variables in the attributes of the script, this is done once when the job is
+        created and again whenever the environment is refreshed
+        """
+        meta = self.script.Meta
+        self.script_name = resolver.resolve(meta.Script_Name)
+        objectPath = resolver.resolve(meta.Script_Object_Path)
+        if objectPath != getattr(self, "object_path", None):
+            # The class is imported again if the object path now resolves differently
+            self._script_class = None
+        self.object_path = objectPath
+        self.fillables = resolver.resolve_mapping(self.script.Fillables)
+        self._generation = resolver.generation
+
+    def timed(self, phase: str):
+        """
+        Times a phase of the script, if the job has metrics
+
+        Args:
+            phase (str): The phase, one of PHASES
+
+        Returns:
+            ContextManager: The timer
+        """
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.phase(self.script_name, phase)
+
+    def load_class(self):
+        """
+        Dynamically imports the script class from the Script_Object_Path, the class is cached for the job
+
+        Raises:
+            ScriptImportException: The script object path is invalid or the object doesn't exist
+
+        Returns:
+            type: The script class
+        """
+        if self._script_class is not None:
+            return self._script_class
+
+        # Splits the object's module and the object's name from the Script_Object_Path
+        objectComponents = self.object_path.split('@')
+        if len(objectComponents) != 2:
+            raise ScriptImportException("The script object path must be of the form 'module@Object'", self.script_name)
+        objectModule, objectName = tuple(objectComponents)
+
+        # Dynamically imports the script
+        with self.timed("import"):
+            scriptModule = importlib.import_module(objectModule)
+        if objectName not in dir(scriptModule):
+            raise ScriptImportException(f"The module {objectModule} has no object {objectName}", self.script_name)
+        self._script_class = getattr(scriptModule, objectName)
+        return self._script_class
+
+    def instantiate(self, log=None):
+        """
+        Creates an instance of the script, configured with the fillables and states of the config
+
+        Args:
+            log (TextIO): Where any messages should be written, defaults to stdout
+
+        Returns:
+            ScriptBase: The script instance
+        """
+        if self._generation != resolver.generation:
+            self.resolve()
+        scriptClass = self.load_class()
+        with self.timed("instantiate"):
+            scriptInstance: ScriptBase = scriptClass()
+
+            # Assigns the resolved fillables to the script
+            # TODO: Perform conversion on different value types
+            scriptInstance.set_properties(self.fillables)
+
+            # Gets any state defined
+            for key, value in self.script.States.items():
+                if isinstance(scriptInstance, StateEngine):
+                    # Configures the state to the script
+                    scriptInstance: StateEngine
+                    try:
+                        scriptInstance.configure_state(key, value.Status, value.Message)
+                    except ValueError as _:
+                        print("Please provide a valid status of either 'red', 'amber' or 'green'. "
+                              "This state will not be used", file=log)
+
+            scriptInstance.set_internal_alias(self.script_name)
+            scriptInstance.set_output_path(self.script.Meta.Script_Output_Path)
+            if self.script.Meta.Script_Output_Properties is not None:
+                scriptInstance.set_output_properties(self.script.Meta.Script_Output_Properties)
+            if self.sink is not None:
+                scriptInstance.set_output_sink(self.sink)
+        return scriptInstance
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: The number of seconds the script may run for, unlimited if None
+        """
+        return self.script.Meta.Script_Timeout
+
+    def export_result(self, result: ScriptResult):
+        """
+        Exports a result that wasn't produced by the script, such as when the script timed out
+
+        Args:
+            result (ScriptResult): The result
+        """
+        content = result.generate_json()
+        if self.sink is not None:
+            self.sink.write(self.script_name, self.script.Meta.Script_Output_Path, content)
+        else:
+            write_json(self.script.Meta.Script_Output_Path, content)
+
+    def is_async(self) -> bool:
+        """
+        Returns:
+            bool: Whether the script is an AsyncScriptBase, which should be awaited rather than called
+        """
+        return issubclass(self.load_class(), AsyncScriptBase)
+
+    def complete(self, scriptInstance: ScriptBase, log=None) -> ScriptResult:
+        """
+        Evaluates, logs and exports a script instance that has been ran
+
+        Args:
+            scriptInstance (ScriptBase): The script instance
+            log (TextIO): Where the output of the script should be logged, defaults to stdout
+
+        Returns:
+            ScriptResult: The result of the script
+        """
+        with self.timed("evaluate"):
+            scriptInstance.evaluate_script()
+        scriptInstance.log_output(log)
+        with self.timed("export"):
+            scriptInstance.export_to_output()
+        return scriptInstance.get_result()
+
+    def execute(self, log=None, cancelled: Optional[threading.Event] = None) -> Optional[ScriptResult]:
+        """
+        Runs the full cycle of the script, importing, instantiating, running, evaluating, logging and exporting
+
+        Args:
+            log (TextIO): Where the output of the script should be logged, defaults to stdout
+            cancelled (threading.Event): Set once the script has timed out, the script isn't evaluated if it is set
+                                         by the time the script returns
+
+        Returns:
+            Optional[ScriptResult]: The result of the script, None if it was cancelled
+        """
+        scriptInstance = self.instantiate(log)
+        # The fillables are only checked here, so that the check is timed on its own
+        with self.timed("check_fillables"):
+            scriptInstance.check_fillables()
+        with self.timed("run"):
+            scriptInstance.run_script(check=False)
+        if cancelled is not None and cancelled.is_set():
+            return None
+        return self.complete(scriptInstance, log)
+
+    async def execute_async(self, log=None) -> ScriptResult:
+        """
+        Runs the full cycle of an AsyncScriptBase script, awaiting the script on the current event loop
+
+        Args:
+            log (TextIO): Where the output of the script should be logged, defaults to stdout
+
+        Returns:
+            ScriptResult: The result of the script
+        """
+        scriptInstance: AsyncScriptBase = self.instantiate(log)
+        with self.timed("check_fillables"):
+            scriptInstance.check_fillables()
+        with self.timed("run"):
+            await scriptInstance.run_script_async(check=False)
+        return self.complete(scriptInstance, log)
+
+
+@contextlib.contextmanager
+def capture_job_log(job: ScriptJob):
+    """
+    Provides a buffer for the log output of a job, any exception raised by the job is logged rather than propagated
+
+    Args:
+        job (ScriptJob): The job
+
+    Yields:
+        TextIO: The log buffer
+    """
+    log = io.StringIO()
+    try:
+        yield log
+    except ScriptImportException as e:
+        print(f"--{e.script_name}", file=log)
+        print(f"Script could not be imported: {e}", file=log)
+    except Exception as _:
+        print(f"--{job.script_name}", file=log)
+        print("Script failed with an exception:", file=log)
+        traceback.print_exc(file=log)
+
+
+def run_job_payload(key: str, script: ConfigScript, timed: bool = False) -> Tuple[Optional[tuple], str, list, list]:
+    """
+    Runs a job and returns its result as a compact payload, this is the task ran by worker processes
+
+    Args:
+        key (str): The key of the script in the config
+        script (Script): The config script
+        timed (bool): Whether the phases of the script are timed
+
+    Returns:
+        Tuple[Optional[tuple], str, list, list]: The result payload, None if the script couldn't be ran,
+                                                 the log output, the outputs of the script, which are written
+                                                 by the parent process, and the timed phases of the script
+    """
+    job = ScriptJob(key, script, OutputSink(), RunMetrics() if timed else None)
+    payload = None
+    with capture_job_log(job) as log:
+        payload = job.execute(log).to_payload()
+    return payload, log.getvalue(), job.sink.take(), job.metrics.records() if timed else []
+
+
+class SchemeRunner:
+    """
+    Runs every script of a feed scheme, using a bounded pool of worker threads
+    """
+    def __init__(self, config: Config, workers: int = 1,
+                 on_result: Optional[Callable[[ScriptJob, ScriptResult], None]] = None,
+                 sink: Optional[OutputSink] = None, metrics: Optional[RunMetrics] = None,
+                 deadline: Optional[float] = None):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            workers (int): The maximum number of scripts that are ran at once
+            on_result (Callable[[ScriptJob, ScriptResult], None]): Called with each result as soon as it is produced
+            sink (OutputSink): The sink that the outputs of scripts are exported to, it is flushed once per run.
+                               Outputs are written straight to their output paths if None
+            metrics (RunMetrics): Where the time spent in each phase of each script is recorded, not timed if None
+            deadline (float): The number of seconds after the start of a run that scripts are no longer started,
+                              and running scripts are timed out. Defaults to the Run_Deadline of the config header
+        """
+        if type(workers) != int or workers < 1:
+            raise ValueError("The number of workers must be a positive integer")
+        if deadline is not None and (type(deadline) not in [int, float] or deadline <= 0):
+            raise ValueError("The deadline must be a positive number of seconds")
+        self.config = config
+        self.workers = workers
+        self.on_result = on_result
+        self.sink = sink
+        self.metrics = metrics
+        self.deadline = deadline if deadline is not None else config.Header.Run_Deadline
+        self.timeout_status = config.Header.Timeout_Status if config.Header.Timeout_Status is not None else "amber"
+        self.timeout_message = config.Header.Timeout_Message \
+            if config.Header.Timeout_Message is not None else "Check timed out"
+        # The time.monotonic() of the deadline of the current run, None outside of a run or without a deadline
+        self._deadline_at: Optional[float] = None
+        self._log_lock = threading.Lock()
+        # The threads of scripts that timed out and are still running, keyed by the key of the job
+        self._abandoned: Dict[str, threading.Thread] = {}
+        self._abandoned_lock = threading.Lock()
+
+    def jobs(self) -> List[ScriptJob]:
+        """
+        Returns:
+            List[ScriptJob]: A job for every script in the config
+        """
+        return [ScriptJob(key, script, self.sink, self.metrics) for key, script in self.config.Scripts.items()]
+
+    def start_deadline(self):
+        """
+        Starts the deadline of a run, if the runner has one
+        """
+        self._deadline_at = time.monotonic() + self.deadline if self.deadline is not None else None
+
+    def deadline_passed(self) -> bool:
+        """
+        Returns:
+            bool: Whether the deadline of the current run has passed
+        """
+        return self._deadline_at is not None and time.monotonic() >= self._deadline_at
+
+    def job_timeout(self, job: ScriptJob) -> Optional[float]:
+        """
+        Args:
+            job (ScriptJob): The job
+
+        Returns:
+            Optional[float]: The number of seconds the job may run for, its Script_Timeout limited by the
+                             time left before the deadline, unlimited if None
+        """
+        timeout = job.timeout
+        if self._deadline_at is not None:
+            remaining = max(self._deadline_at - time.monotonic(), 0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def limit_result(self, job: ScriptJob, message: str) -> ScriptResult:
+        """
+        Creates and exports the result of a job that timed out or was skipped
+
+        Args:
+            job (ScriptJob): The job
+            message (str): The message of the result
+
+        Returns:
+            ScriptResult: The result, with the Timeout_Status of the config header
+        """
+        result = ScriptResult().set_status(self.timeout_status).set_message(message).generate_timestamp()
+        job.export_result(result)
+        return result
+
+    def timed_out(self, job: ScriptJob, timeout: float, log) -> ScriptResult:
+        """
+        Logs that a job timed out and creates its result
+
+        Args:
+            job (ScriptJob): The job
+            timeout (float): The number of seconds the job ran for
+            log (TextIO): The log buffer of the job
+
+        Returns:
+            ScriptResult: The result
+        """
+        print(f"--{job.script_name}", file=log)
+        print(f"Script timed out after {timeout:g} seconds", file=log)
+        return self.limit_result(job, self.timeout_message)
+
+    def skipped(self, job: ScriptJob) -> ScriptResult:
+        """
+        Logs that a job was skipped as the deadline passed before it started and creates its result
+
+        Args:
+            job (ScriptJob): The job
+
+        Returns:
+            ScriptResult: The result
+        """
+        self.write_log(f"--{job.script_name}\nScript skipped, the run deadline passed before it started\n")
+        return self.limit_result(job, "Skipped, the run deadline passed before the check started")
+
+    def still_running(self, job: ScriptJob) -> bool:
+        """
+        Args:
+            job (ScriptJob): The job
+
+        Returns:
+            bool: Whether an earlier run of the job timed out and its thread hasn't finished yet
+        """
+        with self._abandoned_lock:
+            thread = self._abandoned.get(job.key)
+            if thread is None:
+                return False
+            if not thread.is_alive():
+                del self._abandoned[job.key]
+                return False
+            return True
+
+    def execute_job(self, job: ScriptJob, log) -> Optional[ScriptResult]:
+        """
+        Executes a job on the current thread, or on its own thread if it has a timeout.
+        A script that times out is left to finish on its thread, but it isn't evaluated, exported or pushed.
+        Until that thread finishes the job isn't started again, and has the same result as a timed out job
+
+        Args:
+            job (ScriptJob): The job
+            log (TextIO): The log buffer of the job
+
+        Returns:
+            Optional[ScriptResult]: The result of the script
+        """
+        if self.still_running(job):
+            print(f"--{job.script_name}", file=log)
+            print("Script not started, its previous run timed out and is still running", file=log)
+            return self.limit_result(job, self.timeout_message)
+
+        timeout = self.job_timeout(job)
+        if timeout is None:
+            return job.execute(log)
+
+        cancelled = threading.Event()
+        outcome = {}
+
+        def execute():
+            try:
+                outcome["result"] = job.execute(log, cancelled)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=execute, name=f"Script-{job.script_name}", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            cancelled.set()
+            with self._abandoned_lock:
+                self._abandoned[job.key] = thread
+            return self.timed_out(job, timeout, log)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def flush_outputs(self):
+        """
+        Writes the outputs buffered in the sink, any failure is logged
+        """
+        if self.sink is None:
+            return
+        try:
+            self.sink.flush()
+        except Exception as _:
+            self.write_log(f"Writing the outputs failed:\n{traceback.format_exc()}")
+
+    def write_log(self, text: str):
+        """
+        Writes a block of log output, the block is never interleaved with the output of another script
+
+        Args:
+            text (str): The log output
+        """
+        if text == "":
+            return
+        with self._log_lock:
+            print(text, end="", flush=True)
+
+    @contextlib.contextmanager
+    def job_log(self, job: ScriptJob):
+        """
+        Provides a buffer for the log output of a job, which is written as one block once the job has finished
+        Any exception raised by the job is logged rather than propagated
+
+        Args:
+            job (ScriptJob): The job
+
+        Yields:
+            TextIO: The log buffer
+        """
+        log = None
+        try:
+            with capture_job_log(job) as log:
+                yield log
+        finally:
+            if log is not None:
+                self.write_log(log.getvalue())
+
+    def result_ready(self, job: ScriptJob, result: Optional[ScriptResult]):
+        """
+        Passes the result of a job to on_result, any failure is logged
+
+        Args:
+            job (ScriptJob): The job
+            result (Optional[ScriptResult]): The result of the script, None if the script couldn't be ran
+        """
+        if result is None or self.on_result is None:
+            return
+        try:
+            self.on_result(job, result)
+        except Exception as _:
+            self.write_log(f"--{job.script_name}\nHandling the result failed:\n{traceback.format_exc()}")
+
+    def run_job(self, job: ScriptJob) -> Optional[ScriptResult]:
+        """
+        Runs a single job
+
+        Args:
+            job (ScriptJob): The job
+
+        Returns:
+            Optional[ScriptResult]: The result of the script, None if the script couldn't be ran
+        """
+        result = None
+        if self.deadline_passed():
+            result = self.skipped(job)
+        else:
+            with self.job_log(job) as log:
+                result = self.execute_job(job, log)
+        self.result_ready(job, result)
+        return result
+
+    @staticmethod
+    def collect_results(jobs: List[ScriptJob], results: List[Optional[ScriptResult]]) -> Dict[str, ScriptResult]:
+        """
+        Pairs the jobs with their results, leaving out any job that didn't produce a result
+
+        Returns:
+            Dict[str, ScriptResult]: The results keyed by the script name
+        """
+        return {job.script_name: result for job, result in zip(jobs, results) if result is not None}
+
+    def run(self) -> Dict[str, ScriptResult]:
+        """
+        Runs every script of the scheme
+
+        Returns:
+            Dict[str, ScriptResult]: The result of every script that was ran, keyed by the script name
+        """
+        jobs = self.jobs()
+        if len(jobs) == 0:
+            return {}
+
+        self.start_deadline()
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            results = list(executor.map(self.run_job, jobs))
+        self.flush_outputs()
+        return self.collect_results(jobs, results)
+
+
+class AsyncSchemeRunner(SchemeRunner):
+    """
+    Runs every script of a feed scheme on an event loop,
+    AsyncScriptBase scripts are awaited together and any other script is offloaded to a bounded pool of worker threads
+    """
+    def __init__(self, config: Config, workers: int = 1, concurrency: Optional[int] = None,
+                 on_result: Optional[Callable[[ScriptJob, ScriptResult], None]] = None,
+                 sink: Optional[OutputSink] = None, metrics: Optional[RunMetrics] = None,
+                 deadline: Optional[float] = None):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            workers (int): The number of threads that scripts which aren't asynchronous are offloaded to
+            concurrency (int): The maximum number of scripts that are awaited at once, unlimited if None
+            on_result (Callable[[ScriptJob, ScriptResult], None]): Called with each result as soon as it is produced,
+                                                                   this is called on the default executor of the
+                                                                   event loop, so it may block
+            sink (OutputSink): The sink that the outputs of scripts are exported to, it is flushed once per run
+            metrics (RunMetrics): Where the time spent in each phase of each script is recorded, not timed if None
+            deadline (float): The number of seconds after the start of a run that scripts are no longer started,
+                              and running scripts are timed out. Defaults to the Run_Deadline of the config header
+        """
+        super().__init__(config, workers, on_result, sink, metrics, deadline)
+        if concurrency is not None and (type(concurrency) != int or concurrency < 1):
+            raise ValueError("The concurrency must be a positive integer")
+        self.concurrency = concurrency
+
+    async def run_job_async(self, job: ScriptJob, executor: ThreadPoolExecutor) -> Optional[ScriptResult]:
+        """
+        Runs a single job, awaiting it if the script is asynchronous, otherwise running it on the executor
+
+        Args:
+            job (ScriptJob): The job
+            executor (ThreadPoolExecutor): The executor for scripts that aren't asynchronous
+
+        Returns:
+            Optional[ScriptResult]: The result of the script, None if the script couldn't be ran
+        """
+        result = None
+        if self.deadline_passed():
+            result = self.skipped(job)
+        else:
+            with self.job_log(job) as log:
+                if job.is_async():
+                    timeout = self.job_timeout(job)
+                    try:
+                        # The script is cancelled if it times out
+                        result = await asyncio.wait_for(job.execute_async(log), timeout)
+                    except asyncio.TimeoutError as _:
+                        result = self.timed_out(job, timeout, log)
+                else:
+                    result = await asyncio.get_running_loop().run_in_executor(executor, self.execute_job, job, log)
+        # Handing off the result may block, such as whilst the push queue is full, which mustn't stall the other
+        # scripts on the loop or count against their timeouts
+        await asyncio.get_running_loop().run_in_executor(None, self.result_ready, job, result)
+        return result
+
+    async def run_async(self) -> Dict[str, ScriptResult]:
+        """
+        Runs every script of the scheme on the running event loop
+
+        Returns:
+            Dict[str, ScriptResult]: The result of every script that was ran, keyed by the script name
+        """
+        jobs = self.jobs()
+        if len(jobs) == 0:
+            return {}
+
+        self.start_deadline()
+        semaphore = asyncio.Semaphore(self.concurrency if self.concurrency is not None else len(jobs))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            async def bounded_job(job):
+                async with semaphore:
+                    return await self.run_job_async(job, executor)
+
+            results = await asyncio.gather(*[bounded_job(job) for job in jobs])
+        self.flush_outputs()
+        return self.collect_results(jobs, results)
+
+    def run(self) -> Dict[str, ScriptResult]:
+        """
+        Runs every script of the scheme on a new event loop
+
+        Returns:
+            Dict[str, ScriptResult]: The result of every script that was ran, keyed by the script name
+        """
+        return asyncio.run(self.run_async())
+
+
+class ProcessSchemeRunner(SchemeRunner):
+    """
+    Runs every script of a feed scheme in a pool of worker processes started ahead of the scripts,
+    isolating the runner from scripts that are CPU bound, leak memory or crash
+    """
+    def __init__(self, config: Config, workers: int = 1, max_scripts_per_worker: Optional[int] = None,
+                 on_result: Optional[Callable[[ScriptJob, ScriptResult], None]] = None,
+                 sink: Optional[OutputSink] = None, metrics: Optional[RunMetrics] = None,
+                 deadline: Optional[float] = None):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            workers (int): The number of worker processes
+            max_scripts_per_worker (int): The number of scripts a worker runs before it is replaced, never if None
+            on_result (Callable[[ScriptJob, ScriptResult], None]): Called in the parent process with each result
+                                                                   as soon as it is produced
+            sink (OutputSink): The sink that the outputs of scripts are exported to, it is flushed once per run.
+                               The outputs are sent back from the worker processes and written by this process
+            metrics (RunMetrics): Where the time spent in each phase of each script is recorded, not timed if None.
+                                  The phases are timed in the worker processes and sent back with the result
+            deadline (float): The number of seconds after the start of a run that scripts are no longer started,
+                              and running scripts are killed. Defaults to the Run_Deadline of the config header
+        """
+        super().__init__(config, workers, on_result, sink, metrics, deadline)
+        if max_scripts_per_worker is not None and (type(max_scripts_per_worker) != int or max_scripts_per_worker < 1):
+            raise ValueError("The maximum scripts per worker must be a positive integer")
+        self.max_scripts_per_worker = max_scripts_per_worker
+
+    def job_completed(self, job: ScriptJob, outcome) -> Optional[ScriptResult]:
+        """
+        Logs the outcome of a job returned by a worker process and turns it back into a result
+
+        Args:
+            job (ScriptJob): The job
+            outcome (Union[tuple, Exception]): The payload, log output, script outputs and timed phases,
+                                               or why the job didn't complete
+
+        Returns:
+            Optional[ScriptResult]: The result of the script, None if the script couldn't be ran
+        """
+        if isinstance(outcome, WorkerExited):
+            self.write_log(f"--{job.script_name}\nScript failed, {outcome}\n")
+            return None
+        if isinstance(outcome, WorkerTimedOut):
+            log = io.StringIO()
+            result = self.timed_out(job, outcome.timeout, log)
+            self.write_log(log.getvalue())
+            return result
+        if isinstance(outcome, TaskSkipped):
+            return self.skipped(job)
+        payload, log, outputs, records = outcome
+        self.write_log(log)
+        if self.metrics is not None:
+            self.metrics.merge(records)
+        for script_name, output_path, content in outputs:
+            if self.sink is not None:
+                self.sink.write(script_name, output_path, content)
+            else:
+                write_json(output_path, content)
+        if payload is None:
+            return None
+        return ScriptResult.from_payload(payload)
+
+    def run(self) -> Dict[str, ScriptResult]:
+        """
+        Runs every script of the scheme
+
+        Returns:
+            Dict[str, ScriptResult]: The result of every script that was ran, keyed by the script name
+        """
+        jobs = self.jobs()
+        if len(jobs) == 0:
+            return {}
+
+        results: List[Optional[ScriptResult]] = [None] * len(jobs)
+
+        def completed(index, outcome):
+            results[index] = self.job_completed(jobs[index], outcome)
+            self.result_ready(jobs[index], results[index])
+
+        self.start_deadline()
+        with WorkerPool(min(self.workers, len(jobs)), self.max_scripts_per_worker, preload=[__name__]) as pool:
+            pool.map(run_job_payload, [(job.key, job.script, self.metrics is not None) for job in jobs], completed,
+                     [job.timeout for job in jobs], self._deadline_at)
+        self.flush_outputs()
+        return self.collect_results(jobs, results)
@@ -0,0 +1,116 @@
+import heapq
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+
+from SeeThru_Feeds.Core.Config import Config
+from SeeThru_Feeds.Core.Metrics import RunMetrics
+from SeeThru_Feeds.Core.Runner import SchemeRunner, ScriptJob
+from SeeThru_Feeds.Model.Scripts.OutputSink import OutputSink
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+
+
+class SchemeScheduler:
+    """
+    Keeps the scripts of a feed scheme resident and runs each script repeatedly on its own interval
+    """
+    def __init__(self, config: Config, workers: int = 1, default_interval: Union[int, float] = 60,
+                 on_result: Optional[Callable[[ScriptJob, ScriptResult], None]] = None,
+                 sink: Optional[OutputSink] = None, metrics: Optional[RunMetrics] = None):
+        """
+        Args:
+            config (Config): The config of the feed scheme
+            workers (int): The maximum number of scripts that are ran at once
+            default_interval (Union[int, float]): The interval in seconds of scripts without a Script_Interval
+            on_result (Callable[[ScriptJob, ScriptResult], None]): Called on the worker thread with each result
+                                                                   as soon as it is produced
+            sink (OutputSink): The sink that the outputs of scripts are exported to, it is flushed after each run
+            metrics (RunMetrics): Where the time spent in each phase of each script is recorded, not timed if None
+        """
+        if type(default_interval) not in [int, float] or default_interval <= 0:
+            raise ValueError("The default interval must be a positive number of seconds")
+        self.runner = SchemeRunner(config, workers, on_result, sink, metrics)
+        self.default_interval = default_interval
+        self.jobs: List[ScriptJob] = []
+        self._stop = threading.Event()
+        # Receives the index of each job as it completes, None when the scheduler is stopped
+        self._completions: "queue.Queue[Optional[int]]" = queue.Queue()
+
+    def load(self):
+        """
+        Imports every script class once, scripts that can't be imported are logged and left out of the schedule
+
+        Returns:
+            SchemeScheduler: The scheduler
+        """
+        self.jobs = []
+        for job in self.runner.jobs():
+            with self.runner.job_log(job) as _:
+                job.load_class()
+                self.jobs.append(job)
+        return self
+
+    def interval(self, job: ScriptJob) -> Union[int, float]:
+        """
+        Args:
+            job (ScriptJob): The job
+
+        Returns:
+            Union[int, float]: The number of seconds between each run of the job
+        """
+        if job.script.Meta.Script_Interval is not None:
+            return job.script.Meta.Script_Interval
+        return self.default_interval
+
+    def stop(self):
+        """
+        Stops the scheduler, scripts that are running are allowed to finish
+        """
+        self._stop.set()
+        self._completions.put(None)
+
+    def _run_job(self, index: int):
+        try:
+            self.runner.run_job(self.jobs[index])
+            self.runner.flush_outputs()
+        finally:
+            self._completions.put(index)
+
+    def run(self):
+        """
+        Runs the scripts until stop is called, every script is ran immediately and then once per interval.
+        A script is never ran again whilst its previous run is still going, including a run that timed out
+        """
+        if len(self.jobs) == 0:
+            self.load()
+        if len(self.jobs) == 0:
+            return
+
+        # Stores the time that each job is next due, ordered by the due time
+        schedule = [(time.monotonic(), index) for index in range(len(self.jobs))]
+        heapq.heapify(schedule)
+        lastDue = [0.0] * len(self.jobs)
+
+        with ThreadPoolExecutor(max_workers=self.runner.workers) as executor:
+            while not self._stop.is_set():
+                # Starts every job that is due
+                now = time.monotonic()
+                while len(schedule) != 0 and schedule[0][0] <= now:
+                    due, index = heapq.heappop(schedule)
+                    lastDue[index] = due
+                    executor.submit(self._run_job, index)
+
+                # Waits for a job to complete or for the next job to become due
+                timeout = max(schedule[0][0] - now, 0) if len(schedule) != 0 else None
+                try:
+                    completion = self._completions.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if completion is None:
+                    break
+
+                # The next run keeps to the interval, unless the run took longer than the interval
+                index = completion
+                heapq.heappush(schedule, (max(lastDue[index] + self.interval(self.jobs[index]), time.monotonic()), index))
@@ -1,22 +1,23 @@
 #!/usr/bin/env python3
 import argparse
-import importlib
-import json
+import contextlib
 import os
 import re
+import shlex
+import signal
 import sys
-from datetime import datetime
 from pathlib import Path, PurePath
-from typing import List, Optional
-
-import toml
-from dotenv import load_dotenv
+from typing import List
 
 import SeeThru_Feeds.Core.ConfigParser as ConfigParser
-from SeeThru_Feeds.Model.Feeds import Feed
-from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
-from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
-from SeeThru_Feeds.Model.Scripts.ScriptState import StateEngine
+from SeeThru_Feeds.Core.Config.Header import PUSH_POLICIES
+from SeeThru_Feeds.Core.Environment import resolver
+from SeeThru_Feeds.Core.Metrics import METRICS_FORMATS
+from SeeThru_Feeds.Core.ProfileOptions import PROFILE_MODES, PROFILE_SORTS
+from SeeThru_Feeds.Model.Scripts.OutputSink import OUTPUT_SINKS
+
+# The runners, the pusher, the profiler and their dependencies, such as requests, are only imported by the programs
+# that use them, so that programs which only edit the config start quickly
 
 
 class ProgramArgument:
@@ -46,26 +47,10 @@ def create_dir(path: os.path):
     os.mkdir(path)
 
 
-def get_config_attribute(attribute: str) -> str:
-    """
-    Replaces all occurrences of $(variable_name) in an attribute with the associated environment variable
-    Args:
-        attribute: The attribute value
-
-    Returns:
-        The attribute
-    """
-    if type(attribute) != str:
-        return attribute
-    parts = re.findall(r"\$\([\w\d\-\+]+\)", attribute)
-    for arg in parts:
-        environment_variable = os.environ.get(arg[2:-1], "")
-        attribute = attribute.replace(arg, environment_variable)
-    return attribute
-
-
 class SeeThruFeed:
     Programs = {}
+    # The programs that can be ran in a batch, these only edit the config
+    BatchPrograms = ["createscript", "addscript", "addscriptstate", "createfeed", "addapikey"]
 
     base_dir: Path
     argv: List[str]
@@ -74,6 +59,41 @@ class SeeThruFeed:
 
     @classmethod
     def setup_programs(cls):
+        """
+        Builds the table of programs, the table is only built once
+        """
+        if len(cls.Programs) != 0:
+            return
+        # Arguments shared by the programs which push feeds
+        pushArguments = [
+            ProgramArgument("--push-pool-size", action="store", type=int, required=False,
+                            help="The number of connections kept open to the api, defaults to 10"),
+            ProgramArgument("--push-timeout", action="store", type=float, required=False,
+                            help="The number of seconds to wait for the api when pushing a feed, defaults to 30"),
+            ProgramArgument("--push-workers", action="store", type=int, required=False, default=4,
+                            help="The number of feeds pushed at once, defaults to 4"),
+            ProgramArgument("--no-outbox", action="store_const", const=True, required=False,
+                            help="Don't keep failed pushes in the outbox to be retried"),
+            ProgramArgument("--push-policy", action="store", choices=PUSH_POLICIES, type=str, required=False,
+                            help="Whether every result is pushed or only results that have changed since they were "
+                                 "last pushed, defaults to the Push_Policy of the config header or always"),
+            ProgramArgument("--push-heartbeat", action="store", type=float, required=False,
+                            help="The number of seconds after which an unchanged result is pushed again, "
+                                 "defaults to the Push_Heartbeat of the config header or 3600")
+        ]
+        outputSinkArgument = ProgramArgument(
+            "--output-sink", action="store", choices=OUTPUT_SINKS, type=str, required=False,
+            help="Whether outputs are written to a file per script, a single ndjson file per run or an append-only "
+                 "segmented log, defaults to the Output_Sink of the config header or file")
+        # Arguments shared by the programs which run the feed scheme
+        metricsArguments = [
+            ProgramArgument("--metrics-file", action="store", type=str, required=False,
+                            help="Where the time spent in each phase of each script is written, "
+                                 "e.g. to the directory of the node_exporter textfile collector"),
+            ProgramArgument("--metrics-format", action="store", choices=METRICS_FORMATS, type=str, required=False,
+                            help="The format of the metrics file, defaults to prometheus if the file ends with .prom, "
+                                 "otherwise json")
+        ]
         cls.Programs = {
             "help": {
                 "procedure": SeeThruFeed.display_help,
@@ -165,6 +185,15 @@ class SeeThruFeed:
                 "uses_config": True,
                 "help": "Adds a new api key to the config file, this can be used by feeds to upload results to SeeThru"
             },
+            "batch": {
+                "procedure": SeeThruFeed.run_batch,
+                "arguments": [
+                    ProgramArgument("file", action="store", type=str, nargs="?",
+                                    help="The file of commands, with a command per line, defaults to stdin")
+                ],
+                "uses_config": True,
+                "help": "Runs many config editing commands, e.g. addscript Foo, loading and saving the config once"
+            },
             "convert": {
                 "procedure": SeeThruFeed.convert_config,
                 "arguments": [
@@ -178,13 +207,70 @@ class SeeThruFeed:
             },
             "runfeedscheme": {
                 "procedure": SeeThruFeed.run_feedscheme,
-                "arguments": [],
+                "arguments": [
+                    ProgramArgument("--workers", "-w", action="store", type=int, required=False,
+                                    help="The number of scripts to run at once, defaults to the Run_Workers "
+                                         "of the config header or 1"),
+                    ProgramArgument("--async", dest="use_async", action="store_const", const=True, required=False,
+                                    help="Run the scheme on an event loop, asynchronous scripts are awaited together "
+                                         "and other scripts are ran on the workers"),
+                    ProgramArgument("--concurrency", action="store", type=int, required=False,
+                                    help="The maximum number of scripts awaited at once when using --async"),
+                    ProgramArgument("--isolation", action="store", choices=["thread", "process"], type=str,
+                                    required=False, default="thread",
+                                    help="Whether the workers are threads or isolated worker processes"),
+                    ProgramArgument("--max-scripts-per-worker", action="store", type=int, required=False,
+                                    help="The number of scripts a worker process runs before it is replaced, "
+                                         "used with --isolation process"),
+                    ProgramArgument("--deadline", action="store", type=float, required=False,
+                                    help="The number of seconds after which no more scripts are started and running "
+                                         "scripts are timed out, defaults to the Run_Deadline of the config header"),
+                    outputSinkArgument
+                ] + pushArguments + metricsArguments,
                 "uses_config": True,
                 "help": "Runs the feed scheme defined in the config file and uploaded any feeds"
             },
             "run": {
                 "alias": "runfeedscheme",
                 "help": "An alias of runfeedscheme"
+            },
+            "serve": {
+                "procedure": SeeThruFeed.serve_feedscheme,
+                "arguments": [
+                    ProgramArgument("--workers", "-w", action="store", type=int, required=False,
+                                    help="The number of scripts to run at once, defaults to the Run_Workers "
+                                         "of the config header or 1"),
+                    ProgramArgument("--interval", "-i", action="store", type=float, required=False, default=60,
+                                    help="The number of seconds between each run of a script without a "
+                                         "Script_Interval, defaults to 60"),
+                    outputSinkArgument
+                ] + pushArguments + metricsArguments,
+                "uses_config": True,
+                "help": "Keeps running the feed scheme, running each script on its interval and uploading any feeds"
+            },
+            "profile": {
+                "procedure": SeeThruFeed.profile_feedscheme,
+                "arguments": [
+                    ProgramArgument("--mode", "-m", action="store", choices=PROFILE_MODES, type=str, required=False,
+                                    default="deterministic",
+                                    help="Whether every call is profiled with cProfile, or the stack is sampled"),
+                    ProgramArgument("--sample-interval", action="store", type=float, required=False, default=0.005,
+                                    help="The number of seconds between each sample, used with --mode sampling"),
+                    ProgramArgument("--sort", action="store", choices=PROFILE_SORTS, type=str, required=False,
+                                    default="cpu", help="The column the report is sorted by, defaults to cpu"),
+                    ProgramArgument("--script", "-s", dest="scripts", action="append", type=str, required=False,
+                                    help="The name of a script to profile, can be given more than once, "
+                                         "defaults to every script"),
+                    ProgramArgument("--output", "-o", action="store", type=str, required=False,
+                                    default="Outputs/.profile",
+                                    help="The directory the report and raw profiles are written to, "
+                                         "defaults to Outputs/.profile"),
+                    ProgramArgument("--no-memory", action="store_const", const=True, required=False,
+                                    help="Don't trace the peak allocations, which slows the scripts down")
+                ],
+                "uses_config": True,
+                "help": "Runs the feed scheme under a profiler, without pushing any feeds, and reports the time and "
+                        "memory spent in each script and component"
             }
         }
 
@@ -201,9 +287,10 @@ class SeeThruFeed:
         self.argv = []
         self.config_file = Path()
         self.config_method = ""
-
-        # Loads any present env file
-        load_dotenv(dotenv_path=os.path.join(base_dir, ".env"))
+        # The config being edited by a batch, None if a batch isn't running
+        self._batch_config = None
+        # The env file is only loaded by the programs that use the config
+        self._environment_loaded = False
 
         if argv is not None:
             self.run(argv)
@@ -231,18 +318,7 @@ class SeeThruFeed:
                 program = SeeThruFeed.Programs[programName]
 
             # Creates the argparse program
-            parser = argparse.ArgumentParser(prog=programName)
-            # Uses every argument defined in the program
-            for argument in program["arguments"]:
-                parser.add_argument(*argument.args, **argument.extra)
-            # If the program uses the config, generic config arguments are added
-            if program["uses_config"]:
-                # Config path
-                parser.add_argument("--config_path", action="store", type=str, required=False,
-                                    help="The name of the script to use for the feed")
-                # Config method
-                parser.add_argument("--config_method", action="store", choices=["json", "toml"], 
-                                    type=str, required=False, help="The name of the script to use for the feed")
+            parser = self.create_parser(programName, program, program["uses_config"])
 
             # Parses the argument
             args = vars(parser.parse_args(argv))
@@ -257,6 +333,7 @@ class SeeThruFeed:
 
                 del args["config_path"]
                 del args["config_method"]
+                self.load_environment()
 
             # Runs the program
             program["procedure"](self, **args)
@@ -266,6 +343,104 @@ class SeeThruFeed:
             for program in SeeThruFeed.Programs.keys():
                 print(f"\t{program}")
 
+    def load_environment(self, override=False):
+        """
+        Loads any present env file, the file is only loaded once unless overriding
+
+        Args:
+            override (bool): Whether the file is loaded again, overriding any variables already set
+        """
+        if self._environment_loaded and not override:
+            return
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=os.path.join(self.base_dir, ".env"), override=override)
+        self._environment_loaded = True
+
+    @staticmethod
+    def create_parser(program_name, program, uses_config):
+        """
+        Creates the argument parser of a program
+
+        Args:
+            program_name (str): The name of the program
+            program (dict): The program
+            uses_config (bool): Whether the generic config arguments are added
+
+        Returns:
+            ArgumentParser: The parser
+        """
+        parser = argparse.ArgumentParser(prog=program_name)
+        # Uses every argument defined in the program
+        for argument in program["arguments"]:
+            parser.add_argument(*argument.args, **argument.extra)
+        # If the program uses the config, generic config arguments are added
+        if uses_config:
+            # Config path
+            parser.add_argument("--config_path", action="store", type=str, required=False,
+                                help="The name of the script to use for the feed")
+            # Config method
+            parser.add_argument("--config_method", action="store", choices=["json", "toml"],
+                                type=str, required=False, help="The name of the script to use for the feed")
+        return parser
+
+    @contextlib.contextmanager
+    def edit_config(self):
+        """
+        Loads the config file to be edited and saves it afterwards, if it has changed.
+        During a batch the config of the batch is edited instead, which is only saved once the batch has finished
+
+        Yields:
+            Config: The config
+        """
+        if self._batch_config is not None:
+            yield self._batch_config
+            return
+        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+            yield config
+
+    def run_batch(self, file=None):
+        """
+        Runs many config editing commands with the config loaded and saved once,
+        the config isn't saved if any of the commands fail
+
+        Args:
+            file (str): The file of commands, a command per line, read from stdin if None
+        """
+        if file is None:
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(file, "r") as commandFile:
+                lines = commandFile.read().splitlines()
+
+        parser = ConfigParser.ConfigParser(self.config_file, self.config_method)
+        self._batch_config = parser.load()
+        commands = 0
+        try:
+            for number, line in enumerate(lines, 1):
+                argv = shlex.split(line, comments=True)
+                if len(argv) == 0:
+                    continue
+                commands += 1
+                programName = argv[0]
+                program = SeeThruFeed.Programs.get(programName)
+                if program is not None and "alias" in program:
+                    programName = program["alias"]
+                    program = SeeThruFeed.Programs[programName]
+                if programName not in SeeThruFeed.BatchPrograms:
+                    print(f"Line {number}: {argv[0]} can't be used in a batch, "
+                          f"please use one of {', '.join(SeeThruFeed.BatchPrograms)}")
+                    return
+                try:
+                    args = vars(self.create_parser(programName, program, False).parse_args(argv[1:]))
+                except SystemExit as _:
+                    print(f"Line {number}: Invalid arguments for {programName}")
+                    return
+                program["procedure"](self, **args)
+        finally:
+            self._batch_config = None
+        if parser.save():
+            print(f"Saved the config after running {commands} commands")
+
     def get_config_path(self):
         """
         Finds a config file and method in the base directory
@@ -397,110 +572,328 @@ class SeeThruFeed:
             return
 
         # Loads the config file
-        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+        with self.edit_config() as config:
             # Creates a new script
             config.add_script(name)
 
     def add_script(self, name, script=None):
-        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+        with self.edit_config() as config:
             configScript = config.add_script(name)
             if script is not None:
                 configScript.Meta.Script_Object_Path = script
 
     def add_scriptstate(self, script, name, status, message):
         # Loads the config file
-        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+        with self.edit_config() as config:
             if script not in config.Scripts:
                 # TODO: Show error message
                 return
             config.Scripts[script].add_state(name, status, message)
 
-    def run_feedscheme(self):
+    @staticmethod
+    def configure_push_session(push_pool_size=None, push_timeout=None, push_workers=4):
         """
-        Runs the feed scheme
+        Configures the session shared by every feed, if any of its settings were given
+
+        Args:
+            push_pool_size (int): The number of connections kept open to the api
+            push_timeout (float): The number of seconds to wait for the api when pushing a feed
+            push_workers (int): The number of feeds pushed at once, the pool holds at least this many connections
+
+        Returns:
+            bool: Whether the settings were valid
         """
+        if push_workers < 1:
+            print("Please provide a positive number of push workers")
+            return False
+        if push_pool_size is not None and push_pool_size < 1:
+            print("Please provide a positive push pool size")
+            return False
+        if push_timeout is not None and push_timeout <= 0:
+            print("Please provide a positive push timeout")
+            return False
+        if push_pool_size is None and push_timeout is None and push_workers <= 10:
+            return True
+        from SeeThru_Feeds.Model.Feeds.Session import configure_session
+        configure_session(
+            pool_size=push_pool_size if push_pool_size is not None else max(10, push_workers),
+            timeout=(5, push_timeout) if push_timeout is not None else (5, 30)
+        )
+        return True
+
+    def create_pusher(self, config, no_outbox=None, push_policy=None, push_heartbeat=None, metrics=None):
+        """
+        Creates the pusher of the feed scheme, failed pushes are kept in the outbox at Outputs/.outbox
+        and the results last pushed are kept at Outputs/.pushstate.json
+
+        Args:
+            config (Config): The config of the feed scheme
+            no_outbox (bool): Whether failed pushes should be lost instead of retried
+            push_policy (str): Either "always" or "changed", overrides the Push_Policy of the config header
+            push_heartbeat (float): The number of seconds after which an unchanged result is pushed again,
+                                    overrides the Push_Heartbeat of the config header
+            metrics (RunMetrics): Where the time spent pushing is recorded
+
+        Returns:
+            Optional[FeedPusher]: The pusher, None if the push options are invalid
+        """
+        if push_policy is None:
+            push_policy = config.Header.Push_Policy if config.Header.Push_Policy is not None else "always"
+        if push_heartbeat is None:
+            push_heartbeat = config.Header.Push_Heartbeat if config.Header.Push_Heartbeat is not None else 3600
+        if push_heartbeat <= 0:
+            print("Please provide a positive push heartbeat")
+            return None
+
+        from SeeThru_Feeds.Core.Outbox import Outbox
+        from SeeThru_Feeds.Core.PushState import PushState
+        from SeeThru_Feeds.Core.Pusher import FeedPusher
+        outbox = None
+        if not no_outbox:
+            outbox = Outbox(self.base_dir.joinpath("Outputs", ".outbox", "pushes.jsonl"))
+        pushState = None
+        if push_policy == "changed":
+            pushState = PushState(self.base_dir.joinpath("Outputs", ".pushstate.json"), push_heartbeat)
+        return FeedPusher(config, outbox=outbox, push_state=pushState, metrics=metrics)
+
+    def create_output_sink(self, config, output_sink=None):
+        """
+        Creates the sink that the outputs of the feed scheme are exported to
+
+        Args:
+            config (Config): The config of the feed scheme
+            output_sink (str): Either "file", "ndjson" or "segmented", overrides the Output_Sink of the config header
+
+        Returns:
+            OutputSink: The sink
+        """
+        if output_sink is None:
+            output_sink = config.Header.Output_Sink if config.Header.Output_Sink is not None else "file"
+        from SeeThru_Feeds.Model.Scripts.OutputSink import create_sink
+        return create_sink(output_sink, self.base_dir)
+
+    def create_metrics(self, metrics_file=None, metrics_format=None):
+        """
+        Creates the metrics of the feed scheme and their writer, if a metrics file was given
+
+        Args:
+            metrics_file (str): The path of the metrics file, relative to the base directory
+            metrics_format (str): Either "prometheus" or "json", the format of the metrics file
+
+        Returns:
+            Tuple[Optional[RunMetrics], Optional[MetricsWriter]]: The metrics and writer, None if not given a file
+        """
+        if metrics_file is None:
+            return None, None
+        from SeeThru_Feeds.Core.Metrics import RunMetrics, create_metrics_writer
+        return RunMetrics(), create_metrics_writer(self.base_dir.joinpath(metrics_file), metrics_format)
+
+    def run_feedscheme(self, workers=None, use_async=None, concurrency=None, isolation="thread",
+                       max_scripts_per_worker=None, output_sink=None, push_pool_size=None, push_timeout=None,
+                       push_workers=4, no_outbox=None, push_policy=None, push_heartbeat=None, metrics_file=None,
+                       metrics_format=None, deadline=None):
+        """
+        Runs the feed scheme, each result is pushed to its feeds as soon as its script has been evaluated
+
+        Args:
+            workers (int): The number of scripts to run at once, overrides the Run_Workers of the config header
+            use_async (bool): Whether the scheme should be ran on an event loop
+            concurrency (int): The maximum number of scripts awaited at once, only used with use_async
+            isolation (str): Either "thread" or "process", whether scripts are ran in isolated worker processes
+            max_scripts_per_worker (int): The number of scripts a worker process runs before it is replaced
+            output_sink (str): Either "file", "ndjson" or "segmented", where the outputs of scripts are written
+            push_pool_size (int): The number of connections kept open to the api
+            push_timeout (float): The number of seconds to wait for the api when pushing a feed
+            push_workers (int): The number of feeds pushed at once
+            no_outbox (bool): Whether failed pushes should be lost instead of retried
+            push_policy (str): Either "always" or "changed", whether unchanged results are pushed
+            push_heartbeat (float): The number of seconds after which an unchanged result is pushed again
+            metrics_file (str): Where the time spent in each phase of each script is written
+            metrics_format (str): Either "prometheus" or "json", the format of the metrics file
+            deadline (float): The number of seconds after which no more scripts are started and running scripts are
+                              timed out, overrides the Run_Deadline of the config header
+        """
+        from SeeThru_Feeds.Core.Pusher import FeedPipeline
+        from SeeThru_Feeds.Core.Runner import AsyncSchemeRunner, ProcessSchemeRunner, SchemeRunner
+        self.load_environment()
+
         # Opens the config file and parses it
-        config = ConfigParser.ConfigParser(self.config_file, self.config_method).load()
+        config = ConfigParser.ConfigParser(self.config_file, self.config_method, use_snapshot=True).load()
 
         if len(config.Scripts) == 0:
             # TODO: Show error message
             return
 
-        scriptResults = {}
+        if workers is None:
+            workers = config.Header.Run_Workers if config.Header.Run_Workers is not None else 1
+        if workers < 1:
+            print("Please provide a positive number of workers")
+            return
+        if deadline is not None and deadline <= 0:
+            print("Please provide a positive deadline")
+            return
+        # The runner's arguments are checked before the pipeline starts its uploader threads
+        if isolation == "process":
+            if use_async:
+                print("--async can't be used with process isolation")
+                return
+            if max_scripts_per_worker is not None and max_scripts_per_worker < 1:
+                print("Please provide a positive number of scripts per worker")
+                return
+        elif use_async and concurrency is not None and concurrency < 1:
+            print("Please provide a positive concurrency")
+            return
+        if not self.configure_push_session(push_pool_size, push_timeout, push_workers):
+            return
 
-        for key, script in config.Scripts.items():
-            scriptName = get_config_attribute(script.Meta.Script_Name)
+        metrics, metricsWriter = self.create_metrics(metrics_file, metrics_format)
+        pusher = self.create_pusher(config, no_outbox, push_policy, push_heartbeat, metrics)
+        if pusher is None:
+            return
+        sink = self.create_output_sink(config, output_sink)
+        with FeedPipeline(pusher, push_workers) as pipeline:
+            def on_result(job, result):
+                pipeline.submit(job.script_name, result)
+
+            if isolation == "process":
+                runner = ProcessSchemeRunner(config, workers, max_scripts_per_worker, on_result, sink, metrics,
+                                             deadline)
+            elif use_async:
+                runner = AsyncSchemeRunner(config, workers, concurrency, on_result, sink, metrics, deadline)
+            else:
+                runner = SchemeRunner(config, workers, on_result, sink, metrics, deadline)
+            runner.run()
+
+        # Retries the pushes that failed on previous runs and are now due
+        delivered, waiting = pusher.retry_outbox()
+        if delivered != 0:
+            print(f"{delivered} feed pushes from the outbox were delivered")
+        if waiting != 0:
+            print(f"{waiting} feed pushes are waiting in the outbox to be retried")
+        pusher.save_state()
+        if metricsWriter is not None:
+            metricsWriter.write(metrics)
+
+    def serve_feedscheme(self, workers=None, interval=60, output_sink=None, push_pool_size=None, push_timeout=None,
+                         push_workers=4, no_outbox=None, push_policy=None, push_heartbeat=None, metrics_file=None,
+                         metrics_format=None):
+        """
+        Loads the feed scheme once and runs each script on its interval until interrupted,
+        the results are pushed to their feeds as soon as they are produced
 
-            # Splits the object's module and the object's name from the Script_Object_Path
-            objectComponents = get_config_attribute(script.Meta.Script_Object_Path).split('@')
-            if len(objectComponents) != 2:
-                # TODO: Show error message
-                return
-            objectModule, objectName = tuple(objectComponents)
+        Args:
+            workers (int): The number of scripts to run at once, overrides the Run_Workers of the config header
+            interval (float): The number of seconds between each run of a script without a Script_Interval
+            output_sink (str): Either "file", "ndjson" or "segmented", where the outputs of scripts are written
+            push_pool_size (int): The number of connections kept open to the api
+            push_timeout (float): The number of seconds to wait for the api when pushing a feed
+            push_workers (int): The number of feeds pushed at once
+            no_outbox (bool): Whether failed pushes should be lost instead of retried
+            push_policy (str): Either "always" or "changed", whether unchanged results are pushed
+            push_heartbeat (float): The number of seconds after which an unchanged result is pushed again
+            metrics_file (str): Where the time spent in each phase of each script is written, it is rewritten
+                                every 15 seconds
+            metrics_format (str): Either "prometheus" or "json", the format of the metrics file
+        """
+        from SeeThru_Feeds.Core.Metrics import MetricsWriteLoop
+        from SeeThru_Feeds.Core.Pusher import FeedPipeline, OutboxRetryLoop
+        from SeeThru_Feeds.Core.Scheduler import SchemeScheduler
+        self.load_environment()
 
-            # Dynamically imports the script
-            scriptModule = importlib.import_module(objectModule)
-            if objectName not in dir(scriptModule):
-                # TODO: Show error message
-                return
-            scriptClass = getattr(scriptModule, objectName)
-            # Instantiates the script
-            scriptInstance: ScriptBase = scriptClass()
-
-            # Sets any fillables defined
-            for key, fillable in script.Fillables.items():
-                # Gets all defined environment variables
-                  
-                # TODO: Perform conversion on different value types
-                value = get_config_attribute(fillable)
-
-                # Assigns the fillable to the script
-                scriptInstance.set_property(key, fillable)
-
-            # Gets any state defined
-            for key, value in script.States.items():
-                if isinstance(scriptInstance, StateEngine):
-                    # Configures the state to the script
-                    scriptInstance: StateEngine
-                    try:
-                        scriptInstance.configure_state(key, value.Status, value.Message)
-                    except ValueError as _:
-                        print("Please provide a valid status of either 'red', 'amber' or 'green'. This state will not be used")
-
-            scriptInstance.set_internal_alias(scriptName)
-            # Runs the script
-            scriptInstance.set_output_path(script.Meta.Script_Output_Path)
-            scriptInstance.run_script()
-            scriptInstance.evaluate_script()
-            scriptInstance.log_output()
-            scriptInstance.export_to_output()
-
-            scriptResults[scriptName] = scriptInstance.get_result()
-
-        # Goes through every feed
-        if len(config.Feeds) == 0:
+        config = ConfigParser.ConfigParser(self.config_file, self.config_method, use_snapshot=True).load()
+
+        if len(config.Scripts) == 0:
+            # TODO: Show error message
             return
-        if len(config.Api_Keys):
+
+        if workers is None:
+            workers = config.Header.Run_Workers if config.Header.Run_Workers is not None else 1
+        if workers < 1:
+            print("Please provide a positive number of workers")
             return
-        for key, feed in config.Feeds.items():
-            if feed.Script not in scriptResults:
-                continue
-            # Gets the api key
-            if feed.Api_Key not in config.Api_Keys:
-                continue
-            accessToken = get_config_attribute(config.Api_Keys[feed.Api_Key].Access_Token)
-            secret = get_config_attribute(config.Api_Keys[feed.Api_Key].Secret)
+        if interval <= 0:
+            print("Please provide a positive interval")
+            return
+        # The session is shared by every push for as long as the scheme is served
+        if not self.configure_push_session(push_pool_size, push_timeout, push_workers):
+            return
+
+        metrics, metricsWriter = self.create_metrics(metrics_file, metrics_format)
+        pusher = self.create_pusher(config, no_outbox, push_policy, push_heartbeat, metrics)
+        if pusher is None:
+            return
+        sink = self.create_output_sink(config, output_sink)
+        metricsLoop = contextlib.nullcontext()
+        if metricsWriter is not None:
+            metricsLoop = MetricsWriteLoop(metricsWriter, metrics)
+        with metricsLoop, FeedPipeline(pusher, push_workers) as pipeline, OutboxRetryLoop(pusher):
+            scheduler = SchemeScheduler(config, workers, interval,
+                                        on_result=lambda job, result: pipeline.submit(job.script_name, result),
+                                        sink=sink, metrics=metrics)
+            scheduler.load()
+
+            # Stops the scheduler gracefully when the process is asked to terminate
+            signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+            # Reloads the environment when asked to, so that changed api keys and fillables are used
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, lambda signum, frame: self.refresh_environment())
+            try:
+                scheduler.run()
+            except KeyboardInterrupt:
+                scheduler.stop()
+        pusher.save_state()
+
+    def profile_feedscheme(self, mode="deterministic", sample_interval=0.005, sort="cpu", scripts=None,
+                           output="Outputs/.profile", no_memory=None):
+        """
+        Runs each script of the feed scheme one at a time under a profiler and reports the wall clock time,
+        CPU time and peak allocations of each script and component class. The outputs of the scripts are discarded
+        and no feeds are pushed
 
-            result = scriptResults[feed.Script]
+        Args:
+            mode (str): Either "deterministic" or "sampling", the profiler the scripts are ran under
+            sample_interval (float): The number of seconds between each sample, only used when sampling
+            sort (str): Either "cpu", "wall" or "memory", the column the report is sorted by
+            scripts (List[str]): The names of the scripts to profile, every script if None
+            output (str): The directory the report and raw profiles are written to, relative to the base directory
+            no_memory (bool): Whether the peak allocations shouldn't be traced
+        """
+        from SeeThru_Feeds.Core.Profiler import SchemeProfiler, render_table
+        self.load_environment()
 
-            # Pushes the script result
-            feed = Feed.Feed()
-            feed.set_guid(feed.Guid)
-            feed.set_api_key(accessToken, secret)
-            feed.set_script_result(result)
-            result = feed.push()
-            if result != "":
-                print(f"Feed push failed with message: {result}")
+        config = ConfigParser.ConfigParser(self.config_file, self.config_method, use_snapshot=True).load()
+
+        if len(config.Scripts) == 0:
+            # TODO: Show error message
+            return
+        if sample_interval <= 0:
+            print("Please provide a positive sample interval")
+            return
+        if scripts is not None:
+            names = [script.Meta.Script_Name for script in config.Scripts.values()]
+            unknown = [name for name in scripts if name not in names]
+            if len(unknown) != 0:
+                print(f"The config has no scripts named {', '.join(unknown)}")
+                return
+
+        outputDir = self.base_dir.joinpath(output)
+        profiler = SchemeProfiler(config, mode, sample_interval, not no_memory)
+        entries = profiler.run(outputDir, scripts)
+        if len(entries) == 0:
+            print("No scripts were profiled")
+            return
+        table = render_table(entries, sort)
+        outputDir.joinpath("report.txt").write_text(table)
+        print(table, end="")
+        rawFiles = "the .prof files" if mode == "deterministic" else "scheme.collapsed"
+        print(f"The report and {rawFiles} were written to {outputDir}")
+
+    def refresh_environment(self):
+        """
+        Loads the env file again, overriding any variables already set, and resolves the config attributes again
+        """
+        self.load_environment(override=True)
+        resolver.refresh()
 
     def create_feed(self, name, script, api_key, guid):
         """
@@ -512,7 +905,7 @@ class SeeThruFeed:
             guid: The guid of the feed
         """
         # Loads the config file
-        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+        with self.edit_config() as config:
             # Adds the feed to the config
             config.add_feed(name, script, api_key, guid)
 
@@ -533,7 +926,7 @@ class SeeThruFeed:
                 secret = input("Please enter the secret: ")
 
         # Loads the config file
-        with ConfigParser.ConfigParser(self.config_file, self.config_method) as config:
+        with self.edit_config() as config:
             # Adds the reference to the env file in the config
             config.add_api_key(
                 reference,
@@ -557,7 +950,7 @@ class SeeThruFeed:
         parser.load()
         parser.method = to
         parser.config_path = Path(output)
-        parser.save()
+        parser.save(force=True)
 
 
 def exec():
@@ -0,0 +1,237 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+class WorkerExited(Exception):
+    """
+    Stored as the result of a task when the worker process running it exited before returning a result
+    """
+    def __init__(self, exitcode):
+        super().__init__(f"The worker process exited unexpectedly with code {exitcode}")
+        self.exitcode = exitcode
+
+
+class WorkerTimedOut(Exception):
+    """
+    Stored as the result of a task when the task didn't return before its timeout, the worker running it is killed
+    """
+    def __init__(self, timeout):
+        super().__init__(f"The task didn't complete within {timeout:g} seconds")
+        self.timeout = timeout
+
+
+class TaskSkipped(Exception):
+    """
+    Stored as the result of a task that wasn't started because the deadline of the map had passed
+    """
+    def __init__(self):
+        super().__init__("The task wasn't started before the deadline")
+
+
+def _worker_main(connection, environ):
+    """
+    The loop of a worker process, tasks are received and their results are sent back until None is received
+
+    Args:
+        connection (Connection): The worker's end of the pipe
+        environ (Dict[str, str]): The environment variables of the parent when the worker was started
+    """
+    # The fork server keeps the environment it was started with, so the parent's current variables are applied
+    os.environ.clear()
+    os.environ.update(environ)
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        function, args = task
+        connection.send(function(*args))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.connection, childConnection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(childConnection, dict(os.environ)),
+                                       daemon=True)
+        self.process.start()
+        # The parent's copy of the child's end is closed so that a dead worker is seen as EOF
+        childConnection.close()
+        self.completed = 0
+        self.task_index = None
+        # The monotonic time the running task is killed at and its timeout, None if it isn't limited
+        self.expires = None
+        self.timeout = None
+
+    def submit(self, index: int, function: Callable, args: Sequence, timeout: Optional[float] = None):
+        self.task_index = index
+        self.timeout = timeout
+        self.expires = time.monotonic() + timeout if timeout is not None else None
+        self.connection.send((function, tuple(args)))
+
+    def stop(self):
+        """
+        Asks the worker to exit once it is idle, the worker is killed if it doesn't exit
+        """
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    A pool of worker processes started ahead of the tasks, each task runs in isolation from the parent process.
+    Workers are replaced once they have completed a number of tasks, or if they exit whilst running a task
+    """
+    def __init__(self, processes: int, max_tasks_per_worker: Optional[int] = None,
+                 preload: Optional[List[str]] = None):
+        """
+        Args:
+            processes (int): The number of worker processes
+            max_tasks_per_worker (int): The number of tasks a worker completes before it is replaced, never if None
+            preload (List[str]): The modules imported once by the fork server, so that each worker starts with them
+        """
+        if type(processes) != int or processes < 1:
+            raise ValueError("The number of processes must be a positive integer")
+        if max_tasks_per_worker is not None and (type(max_tasks_per_worker) != int or max_tasks_per_worker < 1):
+            raise ValueError("The maximum tasks per worker must be a positive integer")
+        self.processes = processes
+        self.max_tasks_per_worker = max_tasks_per_worker
+        # Workers are never forked from this process, as its other threads, such as the feed uploaders, may hold
+        # a lock that the worker would inherit held. They are forked from a single threaded fork server instead,
+        # or spawned where there is no fork server
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            if preload is not None:
+                self._context.set_forkserver_preload(preload)
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """
+        Starts the worker processes
+        """
+        while len(self._workers) < self.processes:
+            self._workers.append(_Worker(self._context))
+
+    def close(self):
+        """
+        Stops every worker process
+        """
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+    def _replace(self, worker: _Worker, kill: bool = False):
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        self._workers[self._workers.index(worker)] = _Worker(self._context)
+
+    def map(self, function: Callable, tasks: Sequence[Sequence],
+            callback: Optional[Callable[[int, Any], None]] = None,
+            timeouts: Optional[Sequence[Optional[float]]] = None, deadline: Optional[float] = None) -> List[Any]:
+        """
+        Runs the function once for every set of arguments, the function and its arguments must be picklable
+
+        Args:
+            function (Callable): A module level function
+            tasks (Sequence[Sequence]): The arguments of each call
+            callback (Callable[[int, Any], None]): Called in the parent with the index and result of each task
+                                                   as soon as it completes
+            timeouts (Sequence[Optional[float]]): The number of seconds each task may run for, unlimited if None
+            deadline (float): The time.monotonic() after which no task is started and running tasks are killed
+
+        Returns:
+            List[Any]: The result of each task in order, a WorkerExited if the worker running the task exited,
+                       a WorkerTimedOut if it was killed and a TaskSkipped if it wasn't started before the deadline
+        """
+        self.start()
+        results: List[Any] = [None] * len(tasks)
+        pending: List[Tuple[int, Sequence]] = list(enumerate(tasks))
+        pending.reverse()
+        busy: List[_Worker] = []
+
+        def complete(index, result):
+            results[index] = result
+            if callback is not None:
+                callback(index, result)
+
+        while len(pending) != 0 or len(busy) != 0:
+            # The tasks that haven't started by the deadline are skipped
+            if deadline is not None and time.monotonic() >= deadline:
+                while len(pending) != 0:
+                    complete(pending.pop()[0], TaskSkipped())
+
+            # Hands a task to every idle worker
+            for worker in self._workers:
+                if len(pending) == 0:
+                    break
+                if worker in busy:
+                    continue
+                index, args = pending.pop()
+                timeout = timeouts[index] if timeouts is not None else None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                worker.submit(index, function, args, timeout)
+                busy.append(worker)
+            if len(busy) == 0:
+                continue
+
+            # Waits for a worker to return a result or exit, or for the next task to time out
+            expiries = [worker.expires for worker in busy if worker.expires is not None]
+            waitTimeout = max(min(expiries) - time.monotonic(), 0) if len(expiries) != 0 else None
+            ready = wait([worker.connection for worker in busy] + [worker.process.sentinel for worker in busy],
+                         timeout=waitTimeout)
+            now = time.monotonic()
+            for worker in list(busy):
+                if worker.connection not in ready and worker.process.sentinel not in ready:
+                    # Kills the worker if its task has run for too long
+                    if worker.expires is not None and now >= worker.expires:
+                        busy.remove(worker)
+                        complete(worker.task_index, WorkerTimedOut(worker.timeout))
+                        self._replace(worker, kill=True)
+                    continue
+                index = worker.task_index
+                try:
+                    result = worker.connection.recv()
+                    worker.completed += 1
+                    exited = False
+                except (EOFError, OSError):
+                    worker.process.join()
+                    result = WorkerExited(worker.process.exitcode)
+                    exited = True
+                busy.remove(worker)
+                complete(index, result)
+
+                # Replaces workers that have exited or have completed their share of tasks
+                if exited:
+                    self._replace(worker, kill=True)
+                elif self.max_tasks_per_worker is not None and worker.completed >= self.max_tasks_per_worker:
+                    self._replace(worker)
+        return results
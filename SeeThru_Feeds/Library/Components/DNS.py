@@ -0,0 +1,240 @@
+import asyncio
+import collections
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# The resolver errors that mean a host has no addresses, rather than that the lookup couldn't be made.
+# Only these are cached, so a resolver that is briefly unreachable isn't remembered as every host failing
+NEGATIVE_ERRORS = frozenset(getattr(socket, name) for name in ["EAI_NONAME", "EAI_NODATA"] if hasattr(socket, name))
+
+
+class DNSCacheEntry:
+    __slots__ = ("addresses", "error", "expires")
+
+    def __init__(self, addresses: Optional[list], error: Optional[socket.gaierror], expires: float):
+        self.addresses = addresses
+        self.error = error
+        self.expires = expires
+
+
+class DNSCache:
+    """
+    Caches the addresses of hostnames for the whole process, so that the components of every script share lookups.
+    The system resolver doesn't give the ttl of its records, so every address is kept for the same number of seconds.
+    Hosts that don't exist are also cached, for a shorter time, and concurrent lookups of a host are only made once
+    """
+    def __init__(self, ttl: float = 300, negative_ttl: float = 30, max_entries: int = 4096):
+        """
+        Args:
+            ttl (float): The number of seconds the addresses of a host are kept for, nothing is cached if 0
+            negative_ttl (float): The number of seconds a host that doesn't exist is remembered for
+            max_entries (int): The number of lookups kept, the least recently used are evicted first
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "collections.OrderedDict[tuple, DNSCacheEntry]" = collections.OrderedDict()
+        # The lookups being made, other threads looking up the same host wait for them
+        self._pending: Dict[tuple, threading.Event] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _cached(self, key: tuple) -> Optional[DNSCacheEntry]:
+        """
+        Finds an unexpired entry, counting the hit, must be called with the lock held
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            del self._entries[key]
+            self.expired += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.error is not None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _store(self, key: tuple, entry: DNSCacheEntry):
+        """
+        Stores an entry, evicting the least recently used entries, must be called with the lock held
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _with_port(entry: DNSCacheEntry, port) -> List[tuple]:
+        if entry.error is not None:
+            # A new exception is raised each time, so that tracebacks aren't chained together
+            raise socket.gaierror(*entry.error.args)
+        if port is None:
+            return list(entry.addresses)
+        port = int(port) if type(port) != str or port.isdigit() else socket.getservbyname(port)
+        return [(family, kind, proto, canonname, (address[0], port) + tuple(address[2:]))
+                for family, kind, proto, canonname, address in entry.addresses]
+
+    def getaddrinfo(self, host: str, port=None, family: int = 0, type: int = 0, proto: int = 0,
+                    flags: int = 0) -> List[tuple]:
+        """
+        Resolves a host, the same as socket.getaddrinfo but answered from the cache when possible
+
+        Args:
+            host (str): The hostname or address
+            port (Union[int, str]): The port given in each socket address
+            family (int): The address family, such as socket.AF_INET, any family if 0
+            type (int): The socket type, such as socket.SOCK_STREAM, any type if 0
+            proto (int): The protocol, any protocol if 0
+            flags (int): The socket.AI_* flags
+
+        Raises:
+            socket.gaierror: The host couldn't be resolved
+
+        Returns:
+            List[tuple]: The family, type, protocol, canonical name and socket address of each address
+        """
+        key = (host.lower() if isinstance(host, str) else host, family, type, proto, flags)
+        while True:
+            with self._lock:
+                entry = self._cached(key)
+                if entry is not None:
+                    return self._with_port(entry, port)
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = threading.Event()
+                    break
+            # Another thread is looking up the host, its answer is used once it has been cached
+            pending.wait()
+
+        try:
+            try:
+                addresses = socket.getaddrinfo(host, None, family, type, proto, flags)
+            except socket.gaierror as e:
+                if e.errno in NEGATIVE_ERRORS and self.negative_ttl > 0:
+                    with self._lock:
+                        self._store(key, DNSCacheEntry(None, e, time.monotonic() + self.negative_ttl))
+                raise
+            entry = DNSCacheEntry(addresses, None, time.monotonic() + self.ttl)
+            if self.ttl > 0:
+                with self._lock:
+                    self._store(key, entry)
+            return self._with_port(entry, port)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    async def getaddrinfo_async(self, host: str, port=None, family: int = 0, type: int = 0, proto: int = 0,
+                                flags: int = 0) -> List[tuple]:
+        """
+        Resolves a host without blocking the event loop, cached addresses are returned straight away
+        and other lookups are made on the default executor of the loop
+
+        Args:
+            host (str): The hostname or address
+            port (Union[int, str]): The port given in each socket address
+            family (int): The address family, such as socket.AF_INET, any family if 0
+            type (int): The socket type, such as socket.SOCK_STREAM, any type if 0
+            proto (int): The protocol, any protocol if 0
+            flags (int): The socket.AI_* flags
+
+        Raises:
+            socket.gaierror: The host couldn't be resolved
+
+        Returns:
+            List[tuple]: The family, type, protocol, canonical name and socket address of each address
+        """
+        key = (host.lower() if isinstance(host, str) else host, family, type, proto, flags)
+        with self._lock:
+            entry = self._cached(key)
+        if entry is not None:
+            return self._with_port(entry, port)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.getaddrinfo, host, port, family, type, proto, flags)
+
+    def clear(self):
+        """
+        Removes every cached lookup, the statistics are kept
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The number of hits, negative hits, misses, expired and evicted entries, the number of entries
+                  and the ratio of lookups answered from the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups != 0 else 0.0
+            }
+
+
+# The cache shared by every component of the process
+dns_cache = DNSCache()
+
+
+def resolve_host(host: str, family: int = 0, kind: int = socket.SOCK_STREAM) -> Tuple[int, str]:
+    """
+    Resolves a host to a single address through the shared cache, the first address the resolver prefers
+
+    Args:
+        host (str): The hostname or address
+        family (int): The address family, such as socket.AF_INET for a client that only supports IPv4,
+                      any family if 0
+        kind (int): The socket type
+
+    Raises:
+        socket.gaierror: The host couldn't be resolved
+
+    Returns:
+        Tuple[int, str]: The family and address of the host
+    """
+    family, _, _, _, address = dns_cache.getaddrinfo(host, None, family, kind)[0]
+    return family, address[0]
+
+
+def reach_host(host: str, port: int, kind: int, attempt: Callable[[socket.socket, tuple], None], timeout: float):
+    """
+    Resolves a host through the shared cache and makes an attempt against each of its addresses in turn,
+    with a socket of the address's family, until one succeeds. Hosts with only IPv6 addresses are reached too
+
+    Args:
+        host (str): The hostname or address
+        port (int): The port
+        kind (int): The socket type, such as socket.SOCK_STREAM
+        attempt (Callable[[socket.socket, tuple], None]): Connects or sends with the socket to the socket address
+        timeout (float): The number of seconds each attempt may take
+
+    Raises:
+        OSError: The host couldn't be resolved, as a socket.gaierror, or every attempt failed, as the last failure
+    """
+    error = None
+    for family, _, proto, _, address in dns_cache.getaddrinfo(host, port, 0, kind):
+        with socket.socket(family, kind, proto) as sock:
+            sock.settimeout(timeout)
+            try:
+                attempt(sock, address)
+                return
+            except OSError as e:
+                error = e
+    raise error
@@ -1,33 +1,545 @@
 from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
 from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Library.Components.DNS import dns_cache
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import contextlib
+import hashlib
+import http.cookiejar
+import re
 import requests
+import socket
+import threading
+import time
+
+
+class RequestTimings:
+    """
+    The seconds spent in each phase of a request, a phase is None if it didn't happen,
+    such as connecting when a pooled connection was reused
+    """
+    __slots__ = ("dns", "connect", "tls", "ttfb", "total")
+
+    def __init__(self):
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        # The time until the headers of the response arrived, including any of the phases above
+        self.ttfb: Optional[float] = None
+        self.total: Optional[float] = None
+
+
+# The timings of the request being made on each thread, which the connections record their phases to
+_current_timings = threading.local()
+
+
+@contextlib.contextmanager
+def record_request_timings():
+    """
+    Records the phases of any connection made on the current thread whilst the block is open
+
+    Yields:
+        RequestTimings: The timings
+    """
+    timings = RequestTimings()
+    _current_timings.timings = timings
+    try:
+        yield timings
+    finally:
+        _current_timings.timings = None
+
+
+class CachedDNSConnectionMixin:
+    """
+    Resolves the host of a connection through the shared dns cache, then connects to each of its addresses in turn.
+    Only the documented attributes of the connection, its host, port, timeout, source address and socket options,
+    are used, so that it doesn't depend on the internals of a urllib3 version.
+    Only the address that is connected to changes, tls still verifies and sends the hostname
+    """
+    # The time the socket of the connection was last connected, None if it wasn't connected by this connection
+    _connected_at: Optional[float] = None
+
+    def _new_conn(self):
+        timings = getattr(_current_timings, "timings", None)
+        start = time.perf_counter()
+        try:
+            addresses = dns_cache.getaddrinfo(self.host.strip("[]"), self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, f"Failed to resolve {self.host}: {e}") from e
+        resolved = time.perf_counter()
+        if timings is not None:
+            timings.dns = resolved - start
+
+        # The default timeout is given as a sentinel, rather than a number of seconds
+        timeout = self.timeout if self.timeout is None or type(self.timeout) in [int, float] \
+            else socket.getdefaulttimeout()
+        error = None
+        for family, kind, proto, _, address in addresses:
+            sock = None
+            try:
+                sock = socket.socket(family, kind, proto)
+                for option in self.socket_options or []:
+                    sock.setsockopt(*option)
+                sock.settimeout(timeout)
+                if self.source_address:
+                    sock.bind(self.source_address)
+                sock.connect(address)
+            except socket.timeout as _:
+                error = ConnectTimeoutError(self, f"Connection to {self.host} timed out. (connect timeout={timeout})")
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+            else:
+                self._connected_at = time.perf_counter()
+                if timings is not None:
+                    timings.connect = self._connected_at - resolved
+                return sock
+            if sock is not None:
+                sock.close()
+        raise error
+
+
+class CachedDNSHTTPConnection(CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(CachedDNSConnectionMixin, HTTPSConnection):
+    def connect(self):
+        self._connected_at = None
+        super().connect()
+        timings = getattr(_current_timings, "timings", None)
+        if timings is not None and self._connected_at is not None:
+            # The handshake is timed from when this connection's socket connected, so it is never taken from the
+            # phases of another connection
+            timings.tls = time.perf_counter() - self._connected_at
+
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """
+    A requests adapter whose connections resolve their hosts through the shared dns cache
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CachedDNSHTTPConnectionPool,
+            "https": CachedDNSHTTPSConnectionPool
+        }
+
+
+class BlockCookies(http.cookiejar.DefaultCookiePolicy):
+    """
+    Stops a session from keeping the cookies of its responses, so that checks sharing a session don't share cookies
+    """
+    def set_ok(self, cookie, request):
+        return False
+
+
+def create_session(pool_size: int = 10, adapter: Optional[CachedDNSAdapter] = None) -> requests.Session:
+    """
+    Args:
+        pool_size (int): The maximum number of connections kept open to each host
+        adapter (CachedDNSAdapter): The adapter to make requests with, so that its connections are shared,
+                                    a new adapter of pool_size connections if None
+
+    Returns:
+        requests.Session: A session whose connections resolve their hosts through the shared dns cache
+    """
+    session = requests.Session()
+    session.cookies.set_policy(BlockCookies())
+    if adapter is None:
+        adapter = CachedDNSAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def normalise_timeout(timeout):
+    """
+    Returns:
+        Union[float, Tuple[float, float], None]: The timeout, with a [connect, read] list from the config as a tuple
+    """
+    return tuple(timeout) if type(timeout) == list else timeout
+
+
+def valid_timeout(timeout) -> bool:
+    """
+    Returns:
+        bool: Whether the timeout is None, a positive number of seconds or a pair of connect and read timeouts
+    """
+    if timeout is None:
+        return True
+    if type(timeout) in [list, tuple]:
+        return len(timeout) == 2 and all(valid_timeout(part) for part in timeout)
+    return type(timeout) in [int, float] and timeout > 0
+
+
+class HTTPSessionRegistry:
+    """
+    Keeps the connections to each host that http components make requests to, so that keep-alive connections are
+    reused by every script of the process rather than reconnecting for each check.
+    A requests.Session isn't thread safe, so each thread has its own session of each host. The sessions of a host
+    share its adapter, whose urllib3 connection pool is thread safe, so connections are reused across threads
+    """
+    def __init__(self, pool_size: int = 10, timeout: Union[float, Tuple[float, float]] = (5, 30)):
+        """
+        Args:
+            pool_size (int): The maximum number of connections kept open to each host
+            timeout (Union[float, Tuple[float, float]]): The timeout of each request in seconds,
+                                                         or a (connect, read) pair of timeouts
+        """
+        if type(pool_size) != int or pool_size < 1:
+            raise ValueError("The pool size must be a positive integer")
+        if not valid_timeout(timeout):
+            raise ValueError("The timeout must be a positive number of seconds or a pair of connect and read timeouts")
+        self.pool_size = pool_size
+        self.timeout = normalise_timeout(timeout)
+        self._lock = threading.Lock()
+        # The adapter of each host, which holds its connection pool
+        self._adapters: Dict[str, CachedDNSAdapter] = {}
+        # The sessions of the current thread, as an (adapter, session) pair for each host
+        self._local = threading.local()
+        # The pool size and timeout of hosts that differ from the defaults
+        self._hosts: Dict[str, dict] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """
+        Returns:
+            str: The scheme, host and port of the url, which a session is kept for
+        """
+        parts = urlsplit(url)
+        port = parts.port if parts.port is not None else {"http": 80, "https": 443}.get(parts.scheme)
+        return f"{parts.scheme}://{(parts.hostname or '').lower()}:{port}"
+
+    def configure(self, pool_size: Optional[int] = None, timeout: Union[float, Tuple[float, float], None] = None):
+        """
+        Sets the default pool size or timeout of every host, the open connections are closed so that they are used
+
+        Args:
+            pool_size (int): The maximum number of connections kept open to each host
+            timeout (Union[float, Tuple[float, float]]): The default timeout of each request
+        """
+        if pool_size is not None and (type(pool_size) != int or pool_size < 1):
+            raise ValueError("The pool size must be a positive integer")
+        if not valid_timeout(timeout):
+            raise ValueError("The timeout must be a positive number of seconds or a pair of connect and read timeouts")
+        if pool_size is not None:
+            self.pool_size = pool_size
+        if timeout is not None:
+            self.timeout = normalise_timeout(timeout)
+        self.close()
+
+    def configure_host(self, url: str, pool_size: Optional[int] = None,
+                       timeout: Union[float, Tuple[float, float], None] = None):
+        """
+        Sets the pool size or default timeout of a single host, any connections already open to the host are closed
+
+        Args:
+            url (str): A url of the host
+            pool_size (int): The maximum number of connections kept open to the host
+            timeout (Union[float, Tuple[float, float]]): The default timeout of requests to the host
+        """
+        if pool_size is not None and (type(pool_size) != int or pool_size < 1):
+            raise ValueError("The pool size must be a positive integer")
+        if not valid_timeout(timeout):
+            raise ValueError("The timeout must be a positive number of seconds or a pair of connect and read timeouts")
+        key = self.host_key(url)
+        with self._lock:
+            settings = self._hosts.setdefault(key, {})
+            if pool_size is not None:
+                settings["pool_size"] = pool_size
+            if timeout is not None:
+                settings["timeout"] = normalise_timeout(timeout)
+            adapter = self._adapters.pop(key, None)
+        if adapter is not None:
+            adapter.close()
+
+    def timeout_for(self, url: str) -> Union[float, Tuple[float, float]]:
+        """
+        Returns:
+            Union[float, Tuple[float, float]]: The default timeout of requests to the host of the url
+        """
+        return self._hosts.get(self.host_key(url), {}).get("timeout", self.timeout)
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Returns the current thread's session of the host of a url, it is created on first use
+
+        Args:
+            url (str): The url
+
+        Returns:
+            requests.Session: The session, which must only be used by the current thread
+        """
+        key = self.host_key(url)
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                adapter = self._adapters[key] = CachedDNSAdapter(
+                    pool_maxsize=self._hosts.get(key, {}).get("pool_size", self.pool_size))
+        sessions = self._local.__dict__.setdefault("sessions", {})
+        # A session of an adapter that has since been closed is replaced
+        if key not in sessions or sessions[key][0] is not adapter:
+            sessions[key] = (adapter, create_session(adapter=adapter))
+        return sessions[key][1]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Makes a request with the session of the host, the host's default timeout is used unless one is given
+
+        Args:
+            method (str): The http method
+            url (str): The url
+
+        Returns:
+            requests.Response: The response
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout_for(url)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: The number of requests, connections made and open, connections reused and the ratio of
+                             requests that reused a connection, for each host and for every host as "total"
+        """
+        with self._lock:
+            adapters = list(self._adapters.items())
+        stats = {}
+        total = {"requests": 0, "connections": 0, "open_connections": 0}
+        for key, adapter in adapters:
+            hostStats = {"requests": 0, "connections": 0, "open_connections": 0}
+            # Redirects to other hosts are made with the same adapter, so every pool of the adapter is counted
+            pools = adapter.poolmanager.pools
+            for poolKey in list(pools.keys()):
+                pool = pools.get(poolKey)
+                if pool is None or pool.pool is None:
+                    continue
+                idle = list(pool.pool.queue)
+                hostStats["requests"] += pool.num_requests
+                hostStats["connections"] += pool.num_connections
+                # Connections that aren't waiting in the pool are in use
+                hostStats["open_connections"] += (pool.pool.maxsize - len(idle) +
+                                                  sum(1 for conn in idle if conn is not None and conn.sock is not None))
+            for name, value in hostStats.items():
+                total[name] += value
+            stats[key] = hostStats
+        stats["total"] = total
+        for hostStats in stats.values():
+            hostStats["reused"] = max(hostStats["requests"] - hostStats["connections"], 0)
+            hostStats["reuse_ratio"] = hostStats["reused"] / hostStats["requests"] if hostStats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        """
+        Closes the connections to every host, the sessions of each thread are created again when next used
+        """
+        with self._lock:
+            adapters, self._adapters = list(self._adapters.values()), {}
+        for adapter in adapters:
+            adapter.close()
+
+
+# The sessions shared by every http component of the process
+http_sessions = HTTPSessionRegistry()
+
+
+def valid_pattern(pattern) -> bool:
+    """
+    Returns:
+        bool: Whether the pattern is None or a regular expression that compiles
+    """
+    if pattern is None:
+        return True
+    try:
+        re.compile(pattern.encode())
+    except (AttributeError, re.error):
+        return False
+    return True
+
+
+# The number of bytes of the previous chunks of a streamed body that the pattern is also searched in
+DEFAULT_PATTERN_OVERLAP = 4096
+
+
+class BodyInspector:
+    """
+    Counts, hashes and searches a response body as it is read, without keeping it.
+    The pattern is searched for in each chunk along with the end of the chunks before it,
+    so a match spanning chunks is found as long as it is no longer than the overlap
+    """
+    def __init__(self, max_bytes: Optional[int] = None, hash_algorithm: Optional[str] = None,
+                 pattern: Optional[str] = None, overlap: Optional[int] = DEFAULT_PATTERN_OVERLAP):
+        """
+        Args:
+            max_bytes (int): The number of bytes read before the body is truncated, the whole body is read if None
+            hash_algorithm (str): The hashlib algorithm the body is hashed with, not hashed if None
+            pattern (str): A regular expression searched for in the bytes of the body, not searched if None
+            overlap (int): The number of bytes kept from the end of the previous chunks when searching,
+                           DEFAULT_PATTERN_OVERLAP if None
+        """
+        self.max_bytes = max_bytes
+        self.digest = hashlib.new(hash_algorithm) if hash_algorithm is not None else None
+        self.pattern = re.compile(pattern.encode()) if pattern is not None else None
+        self.overlap = overlap if overlap is not None else DEFAULT_PATTERN_OVERLAP
+        self.bytes_read = 0
+        self.truncated = False
+        self.matched = False if pattern is not None else None
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Inspects the next chunk of the body
+
+        Args:
+            chunk (bytes): The chunk
+
+        Returns:
+            bool: Whether more of the body should be read
+        """
+        if self.max_bytes is not None and self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.truncated = True
+        self.bytes_read += len(chunk)
+        if self.digest is not None:
+            self.digest.update(chunk)
+        if self.pattern is not None and not self.matched:
+            window = self._tail + chunk
+            self.matched = self.pattern.search(window) is not None
+            self._tail = window[-self.overlap:] if self.overlap > 0 else b""
+        return not self.truncated
+
+    @property
+    def hexdigest(self) -> Optional[str]:
+        return self.digest.hexdigest() if self.digest is not None else None
 
 
 class HTTPBase(ComponentBase):
     URL = FillableProperty(name="url", required=True)
     COOKIES = FillableProperty(name="cookies", required=False)
     HEADERS = FillableProperty(name="header", required=False, default=None, of_type=dict)
+    # The timeout in seconds, or a [connect, read] pair, defaults to the timeout of the host's session
+    TIMEOUT = FillableProperty(name="timeout", required=False, default=None, custom=valid_timeout)
+    # Whether the body is read a chunk at a time and inspected without being kept, rather than stored in full
+    STREAM = FillableProperty(name="stream", required=False, default=False, of_type=bool)
+    # The number of decoded bytes of the body read when streaming, the rest of the body isn't downloaded.
+    # The whole body is read if None
+    MAX_BYTES = FillableProperty(name="max_bytes", required=False, default=1024 * 1024, of_type=int,
+                                 custom=lambda value: value is None or value > 0)
+    # A hashlib algorithm, such as sha256, that the body is hashed with
+    HASH_ALGORITHM = FillableProperty(name="hash_algorithm", required=False, default=None, of_type=str,
+                                      custom=lambda value: value is None or value in hashlib.algorithms_available)
+    # A regular expression searched for in the bytes of the body
+    PATTERN = FillableProperty(name="pattern", required=False, default=None, of_type=str, custom=valid_pattern)
+    # The longest match of the pattern that can span two chunks of a streamed body, the default overlap if None
+    PATTERN_OVERLAP = FillableProperty(name="pattern_overlap", required=False, default=DEFAULT_PATTERN_OVERLAP,
+                                       of_type=int, custom=lambda value: value is None or value >= 0)
+    # None when streaming, so that the response and its connection aren't held by the result
     RESPONSE = ResultProperty(name="response")
     STATUS_CODE = ResultProperty(name="status_code")
+    RESPONSE_HEADERS = ResultProperty(name="response_headers")
     RESPONSE_CONTENT = ResultProperty(name="response_content")
     RESPONSE_URL = ResultProperty(name="response_url")
+    BYTES_READ = ResultProperty(name="bytes_read")
+    # Whether the body was longer than max_bytes when streaming
+    TRUNCATED = ResultProperty(name="truncated", default=False)
+    BODY_HASH = ResultProperty(name="body_hash")
+    # None if no pattern was given
+    PATTERN_MATCHED = ResultProperty(name="pattern_matched")
+    # The seconds spent in each phase of the request, the dns, connect and tls phases are None
+    # when a pooled connection was reused
+    DNS_TIME = ResultProperty(name="dns_time")
+    CONNECT_TIME = ResultProperty(name="connect_time")
+    TLS_TIME = ResultProperty(name="tls_time")
+    TTFB_TIME = ResultProperty(name="ttfb_time")
+    TOTAL_TIME = ResultProperty(name="total_time")
 
     Component_Title = "HTTP Component"
     Component_Description = "This component provides a wrapper over the requests http methods to make them follow the component design rules"
     Component_Author = "SeeThru Networks"
     Component_Owner = "SeeThru Networks"
 
+    def request(self, method: str, **kwargs) -> requests.Response:
+        """
+        Makes a request to the url with the shared session of its host, then reads and inspects the body.
+        The response content is only kept when not streaming
+
+        Args:
+            method (str): The http method
+
+        Returns:
+            requests.Response: The response
+        """
+        stream = self.get_property(HTTPBase.STREAM)
+        inspector = BodyInspector(self.get_property(HTTPBase.MAX_BYTES) if stream else None,
+                                  self.get_property(HTTPBase.HASH_ALGORITHM), self.get_property(HTTPBase.PATTERN),
+                                  self.get_property(HTTPBase.PATTERN_OVERLAP))
+        with record_request_timings() as timings:
+            start = time.perf_counter()
+            # The response is always streamed, so that the headers arriving can be timed apart from the body
+            response = http_sessions.request(method, self.get_property(HTTPBase.URL),
+                                             cookies=self.get_property(HTTPBase.COOKIES),
+                                             headers=self.get_property(HTTPBase.HEADERS),
+                                             timeout=normalise_timeout(self.get_property(HTTPBase.TIMEOUT)),
+                                             stream=True, **kwargs)
+            timings.ttfb = time.perf_counter() - start
+            try:
+                if stream:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if not inspector.feed(chunk):
+                            break
+                else:
+                    inspector.feed(response.content)
+            finally:
+                # Returns the connection to the pool, a connection with an unread body is closed instead
+                response.close()
+            timings.total = time.perf_counter() - start
+
+        self.set_property(HTTPBase.BYTES_READ, inspector.bytes_read)
+        self.set_property(HTTPBase.TRUNCATED, inspector.truncated)
+        self.set_property(HTTPBase.BODY_HASH, inspector.hexdigest)
+        self.set_property(HTTPBase.PATTERN_MATCHED, inspector.matched)
+        self.set_property(HTTPBase.DNS_TIME, timings.dns)
+        self.set_property(HTTPBase.CONNECT_TIME, timings.connect)
+        self.set_property(HTTPBase.TLS_TIME, timings.tls)
+        self.set_property(HTTPBase.TTFB_TIME, timings.ttfb)
+        self.set_property(HTTPBase.TOTAL_TIME, timings.total)
+        return response
+
+    def set_response(self, response: requests.Response):
+        """
+        Sets the response result properties. When streaming only the status, headers and url are kept,
+        the response and its content are None as the body wasn't kept
+
+        Args:
+            response (requests.Response): The response
+        """
+        stream = self.get_property(HTTPBase.STREAM)
+        self.set_property(HTTPBase.RESPONSE, None if stream else response)
+        self.set_property(HTTPBase.STATUS_CODE, response.status_code)
+        self.set_property(HTTPBase.RESPONSE_HEADERS, dict(response.headers))
+        self.set_property(HTTPBase.RESPONSE_CONTENT, None if stream else response.text)
+        self.set_property(HTTPBase.RESPONSE_URL, response.url)
+
 
 class HTTPGet(HTTPBase):
     def component_execute(self):
-        response = requests.get(self.get_property(
-            HTTPBase.URL), cookies=self.get_property(HTTPBase.COOKIES), headers=self.get_property(HTTPBase.HEADERS))
+        response = self.request("GET")
 
-        self.set_property(HTTPGet.RESPONSE, response)
-        self.set_property(HTTPGet.STATUS_CODE, response.status_code)
+        self.set_response(response)
         self.set_property(HTTPGet.COOKIES, response.cookies)
-        self.set_property(HTTPGet.RESPONSE_CONTENT, response.text)
-        self.set_property(HTTPGet.RESPONSE_URL, response.url)
 
 
 class HTTPPost(HTTPBase):
@@ -40,14 +552,5 @@ class HTTPPost(HTTPBase):
         if self.get_property(HTTPBase.HEADERS) is None:
             self.set_property(HTTPBase.HEADERS, {'Content-Type': self.get_property(self.CONTENT_TYPE)})
 
-        response = requests.post(
-            self.get_property(HTTPPost.URL),
-            cookies=self.get_property(HTTPPost.COOKIES),
-            data=self.get_property(HTTPPost.DATA),
-            json=self.get_property(HTTPPost.JSON),
-            headers=self.get_property(HTTPBase.HEADERS)
-        )
-        self.set_property(HTTPPost.RESPONSE, response)
-        self.set_property(HTTPPost.STATUS_CODE, response.status_code)
-        self.set_property(HTTPPost.RESPONSE_CONTENT, response.text)
-        self.set_property(HTTPPost.RESPONSE_URL, response.url)
+        response = self.request("POST", data=self.get_property(HTTPPost.DATA), json=self.get_property(HTTPPost.JSON))
+        self.set_response(response)
@@ -1,6 +1,8 @@
 from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
 from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Library.Components.DNS import resolve_host
 from pysnmp.hlapi import *
+import socket
 
 
 class SNMPWalkToOID(ComponentBase):
@@ -23,8 +25,10 @@ class SNMPWalkToOID(ComponentBase):
         for errorIndication, errorStatus, errorIndex, varBinds in bulkCmd(
                 SnmpEngine(),
                 CommunityData(self.get_property(self.COMMUNITY)),
+                # The transport only supports IPv4, so only the IPv4 addresses of the host are looked up
                 UdpTransportTarget(
-                    (self.get_property(self.SNMP_HOST), self.get_property(self.SNMP_PORT))),
+                    (resolve_host(self.get_property(self.SNMP_HOST), socket.AF_INET, socket.SOCK_DGRAM)[1],
+                     self.get_property(self.SNMP_PORT))),
                 ContextData(),
                 0, 50,
                 ObjectType(ObjectIdentity(oid)),
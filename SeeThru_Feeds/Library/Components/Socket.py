@@ -1,6 +1,12 @@
 from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
+from SeeThru_Feeds.Model.Components.AsyncComponentBase import AsyncComponentBase
 from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Library.Components.DNS import dns_cache, reach_host
+import asyncio
 import socket
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
 
 
 class PortOpen(ComponentBase):
@@ -16,19 +22,52 @@ class PortOpen(ComponentBase):
     Component_Owner = "SeeThru Networks"
 
     def component_execute(self):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-
         try:
-            # Attempts a connection to the socket
-            sock.connect((self.get_property(PortOpen.TARGET_HOST),
-                          self.get_property(PortOpen.PORT)))
-            sock.close()
+            # Attempts a connection to each address of the host, of any family, until one is made
+            reach_host(self.get_property(PortOpen.TARGET_HOST), self.get_property(PortOpen.PORT), socket.SOCK_STREAM,
+                       lambda sock, address: sock.connect(address), timeout=2)
             self.set_property(PortOpen.SUCCEEDED, True)
         except:
             self.set_property(PortOpen.SUCCEEDED, False)
 
 
+class AsyncPortOpen(AsyncComponentBase):
+    TARGET_HOST = FillableProperty(
+        name="target_host", required=True, of_type=str)
+    PORT = FillableProperty(name="port", default=443,
+                            required=True, of_type=int)
+    SUCCEEDED = ResultProperty(name="succeeded")
+
+    Component_Title = "AsyncPortOpen Socket Component"
+    Component_Description = "This component will test to see if it can open a tcp connection with the given host and port, without blocking the event loop"
+    Component_Author = "SeeThru Networks"
+    Component_Owner = "SeeThru Networks"
+
+    async def open_connection(self):
+        """
+        Attempts a connection to each address of the host, of any family, until one is made
+        """
+        port = self.get_property(AsyncPortOpen.PORT)
+        addresses = await dns_cache.getaddrinfo_async(self.get_property(AsyncPortOpen.TARGET_HOST), port,
+                                                      0, socket.SOCK_STREAM)
+        error = None
+        for _, _, _, _, address in addresses:
+            try:
+                return await asyncio.open_connection(address[0], port)
+            except OSError as e:
+                error = e
+        raise error
+
+    async def component_execute(self):
+        try:
+            # Attempts a connection to the socket
+            _, writer = await asyncio.wait_for(self.open_connection(), timeout=2)
+            writer.close()
+            self.set_property(AsyncPortOpen.SUCCEEDED, True)
+        except:
+            self.set_property(AsyncPortOpen.SUCCEEDED, False)
+
+
 class UDPPortOpen(ComponentBase):
     TARGET_HOST = FillableProperty(
         name="target_host", required=True, of_type=str)
@@ -45,18 +84,204 @@ class UDPPortOpen(ComponentBase):
     Component_Owner = "SeeThru Networks"
 
     def component_execute(self):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(5)
-
         try:
-            # Attempts a connection to the socket
-            sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
-            sock.sendto(b"Test", (self.get_property(
-                self.TARGET_HOST), self.get_property(self.PORT)))
-            sock.close()
+            # Attempts to send to each address of the host, of any family, until the data is sent
+            reach_host(self.get_property(self.TARGET_HOST), self.get_property(self.PORT), socket.SOCK_DGRAM,
+                       lambda sock, address: sock.sendto(b"Test", address), timeout=5)
             self.set_property(self.SUCCEEDED, True)
         except socket.error as error:
             self.set_property(self.ERROR_NO, error.errno)
             self.set_property(self.SUCCEEDED, False)
         except:
             self.set_property(self.SUCCEEDED, False)
+
+
+# The states that a probed port can be reported in
+PROBE_STATES = ["open", "closed", "filtered", "unresolved"]
+
+
+def parse_target(target) -> Tuple[str, int]:
+    """
+    Parses a probe target, either a "host:port" string, where an IPv6 host is wrapped in brackets, or a (host, port) pair
+
+    Args:
+        target (Union[str, list, tuple]): The target
+
+    Raises:
+        ValueError: The target isn't a host and a valid port
+
+    Returns:
+        Tuple[str, int]: The host and port
+    """
+    if type(target) == str:
+        host, separator, port = target.rpartition(":")
+        if separator == "":
+            raise ValueError(f"The target {target} must be of the form 'host:port'")
+        host = host.strip("[]")
+    elif type(target) in [list, tuple] and len(target) == 2:
+        host, port = target
+    else:
+        raise ValueError(f"The target {target!r} must be a 'host:port' string or a (host, port) pair")
+    if type(host) != str or host == "":
+        raise ValueError(f"The target {target!r} has no host")
+    try:
+        port = int(port)
+    except (TypeError, ValueError):
+        raise ValueError(f"The target {target!r} has an invalid port") from None
+    if not 0 < port < 65536:
+        raise ValueError(f"The target {target!r} has an invalid port")
+    return host, port
+
+
+def valid_targets(targets) -> bool:
+    """
+    Returns:
+        bool: Whether every target can be parsed
+    """
+    try:
+        for target in targets:
+            parse_target(target)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class BatchPortProbe(ComponentBase):
+    # The targets are "host:port" strings or (host, port) pairs
+    TARGETS = FillableProperty(name="targets", required=True, of_type=list, custom=valid_targets)
+    PROTOCOL = FillableProperty(name="protocol", default="tcp", required=True, of_type=str, value_set={"tcp", "udp"})
+    # The maximum number of targets probed at once, each probe holds a socket open
+    CONCURRENCY = FillableProperty(name="concurrency", default=256, required=True, of_type=int,
+                                   custom=lambda value: value > 0)
+    # The number of seconds to wait for each target before it is reported as filtered
+    TIMEOUT = FillableProperty(name="timeout", default=2, required=True, of_type=[int, float],
+                               custom=lambda value: value > 0)
+    # The data sent to each udp target
+    PAYLOAD = FillableProperty(name="payload", default="Test", required=True, of_type=str)
+    # A dict of the host, port, state and latency in seconds of each target, in the order of the targets
+    RESULTS = ResultProperty(name="results")
+    # The targets whose ports are open, as "host:port" strings
+    OPEN = ResultProperty(name="open")
+
+    Component_Title = "BatchPortProbe Socket Component"
+    Component_Description = "This component will probe many tcp or udp ports at once, reporting whether each port is open, closed or filtered and the latency of each connection"
+    Component_Author = "SeeThru Networks"
+    Component_Owner = "SeeThru Networks"
+
+    @staticmethod
+    async def resolve(host: str, kind: int) -> Optional[tuple]:
+        """
+        Looks up the address of a host through the shared dns cache
+
+        Args:
+            host (str): The host
+            kind (int): The socket type, either socket.SOCK_STREAM or socket.SOCK_DGRAM
+
+        Returns:
+            Optional[tuple]: The address family and socket address of the host, None if it couldn't be resolved
+        """
+        try:
+            addresses = await dns_cache.getaddrinfo_async(host, None, type=kind)
+        except (socket.gaierror, UnicodeError):
+            return None
+        if len(addresses) == 0:
+            return None
+        family, _, _, _, address = addresses[0]
+        return family, address
+
+    @staticmethod
+    async def probe_tcp(family: int, address: tuple, timeout: float) -> Tuple[str, Optional[float]]:
+        """
+        Opens a tcp connection to an address, a refused connection is closed and any other failure is filtered
+
+        Returns:
+            Tuple[str, Optional[float]]: The state and the seconds taken to connect or be refused
+        """
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        # Resets the connection when closed, so that thousands of probes don't leave sockets in TIME_WAIT
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, address), timeout)
+            return "open", time.perf_counter() - start
+        except ConnectionRefusedError:
+            return "closed", time.perf_counter() - start
+        except (asyncio.TimeoutError, OSError):
+            return "filtered", None
+        finally:
+            sock.close()
+
+    @staticmethod
+    async def probe_udp(family: int, address: tuple, timeout: float, payload: bytes) -> Tuple[str, Optional[float]]:
+        """
+        Sends a datagram to an address and waits for a reply. A reply is open and an icmp port unreachable is closed,
+        no reply is filtered, as the port is either filtered or open to a service that didn't reply to the payload
+
+        Returns:
+            Tuple[str, Optional[float]]: The state and the seconds taken to reply or be refused
+        """
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            # Connecting the socket is what allows the icmp port unreachable to be received
+            sock.connect(address)
+            await loop.sock_sendall(sock, payload)
+            await asyncio.wait_for(loop.sock_recv(sock, 1), timeout)
+            return "open", time.perf_counter() - start
+        except ConnectionRefusedError:
+            return "closed", time.perf_counter() - start
+        except (asyncio.TimeoutError, OSError):
+            return "filtered", None
+        finally:
+            sock.close()
+
+    async def probe_all(self) -> List[dict]:
+        """
+        Probes every target, at most the concurrency at once, each host is only resolved once
+
+        Returns:
+            List[dict]: The host, port, state and latency of each target
+        """
+        targets = [parse_target(target) for target in self.get_property(self.TARGETS)]
+        protocol = self.get_property(self.PROTOCOL)
+        timeout = self.get_property(self.TIMEOUT)
+        payload = self.get_property(self.PAYLOAD).encode()
+        kind = socket.SOCK_STREAM if protocol == "tcp" else socket.SOCK_DGRAM
+        semaphore = asyncio.Semaphore(self.get_property(self.CONCURRENCY))
+        resolved: Dict[str, asyncio.Task] = {}
+
+        async def probe(host, port):
+            if host not in resolved:
+                resolved[host] = asyncio.ensure_future(self.resolve(host, kind))
+            address = await resolved[host]
+            if address is None:
+                return {"host": host, "port": port, "state": "unresolved", "latency": None}
+            family, sockaddr = address
+            sockaddr = (sockaddr[0], port) + tuple(sockaddr[2:])
+            async with semaphore:
+                if protocol == "tcp":
+                    state, latency = await self.probe_tcp(family, sockaddr, timeout)
+                else:
+                    state, latency = await self.probe_udp(family, sockaddr, timeout, payload)
+            return {"host": host, "port": port, "state": state, "latency": latency}
+
+        return list(await asyncio.gather(*(probe(host, port) for host, port in targets)))
+
+    def set_results(self, results: List[dict]):
+        self.set_property(self.RESULTS, results)
+        self.set_property(self.OPEN, [f"{result['host']}:{result['port']}" for result in results
+                                      if result["state"] == "open"])
+
+    def component_execute(self):
+        self.set_results(asyncio.run(self.probe_all()))
+
+
+class AsyncBatchPortProbe(BatchPortProbe, AsyncComponentBase):
+    Component_Title = "AsyncBatchPortProbe Socket Component"
+    Component_Description = "This component will probe many tcp or udp ports at once, reporting whether each port is open, closed or filtered and the latency of each connection, without blocking the event loop"
+
+    async def component_execute(self):
+        self.set_results(await self.probe_all())
@@ -0,0 +1,49 @@
+from SeeThru_Feeds.Model.Scripts.ScriptState import State, DefaultStates, StateEngine
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Library.Components.Socket import BatchPortProbe
+
+
+class PortProbe(ScriptBase, StateEngine):
+    class MessageStates(DefaultStates):
+        ports_closed = State("ports_closed", State.error, "Not every port is open on the given hosts")
+
+    hosts = FillableProperty(name="hosts", required=True, of_type=[str, list])
+    ports = FillableProperty(name="ports", required=True, of_type=[int, list])
+    protocol = FillableProperty(name="protocol", required=False, of_type=str, default="tcp")
+    concurrency = FillableProperty(name="concurrency", required=False, of_type=int, default=256)
+    timeout = FillableProperty(name="timeout", required=False, of_type=[int, float], default=2)
+
+    open_ports = ResultProperty(name="open_ports")
+    closed_ports = ResultProperty(name="closed_ports")
+    filtered_ports = ResultProperty(name="filtered_ports")
+
+    Attr_Title = "Port Probe"
+    Attr_Description = "A script which probes every given port of every given host at once, " \
+                       "checking that each port is open"
+    Attr_Author = "SeeThru Networks"
+    Attr_Owner = "SeeThru Networks"
+
+    # ------ Script Overrides ------
+    def script_run(self):
+        hosts = self.hosts.value if type(self.hosts.value) == list else [self.hosts.value]
+        ports = self.ports.value if type(self.ports.value) == list else [self.ports.value]
+
+        # Probes every port of every host together
+        results = BatchPortProbe()\
+            .set_property(BatchPortProbe.TARGETS, [[host, port] for host in hosts for port in ports])\
+            .set_property(BatchPortProbe.PROTOCOL, self.protocol.value)\
+            .set_property(BatchPortProbe.CONCURRENCY, self.concurrency.value)\
+            .set_property(BatchPortProbe.TIMEOUT, self.timeout.value)\
+            .run()\
+            .get_property(BatchPortProbe.RESULTS)
+
+        self.open_ports.value = [f"{result['host']}:{result['port']}" for result in results
+                                 if result["state"] == "open"]
+        self.closed_ports.value = [f"{result['host']}:{result['port']}" for result in results
+                                   if result["state"] == "closed"]
+        # Unresolved hosts are counted as filtered, as they couldn't be reached either
+        self.filtered_ports.value = [f"{result['host']}:{result['port']}" for result in results
+                                     if result["state"] in ["filtered", "unresolved"]]
+
+        self.assert_true(len(self.open_ports.value) == len(results), self.MessageStates.ports_closed)
@@ -1,7 +1,8 @@
 from SeeThru_Feeds.Model.Scripts.ScriptState import State, DefaultStates, StateEngine
 from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
 from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
-import requests, json
+from SeeThru_Feeds.Library.Components.HTTP import http_sessions
+import json
 
 
 class StatusPage(ScriptBase, StateEngine):
@@ -15,7 +16,7 @@ class StatusPage(ScriptBase, StateEngine):
 
     def script_run(self):
         try:
-            response = requests.get(f"https://{self.id.value}.statuspage.io/api/v2/status.json")
+            response = http_sessions.request("GET", f"https://{self.id.value}.statuspage.io/api/v2/status.json")
             try:
                 statuspage = json.loads(response.content)
                 # Gets the status
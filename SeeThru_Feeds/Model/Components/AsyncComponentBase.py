@@ -0,0 +1,27 @@
+from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
+
+
+class AsyncComponentBase(ComponentBase):
+    async def component_execute(self):
+        """
+        This coroutine should be overridden by a subclass
+        This is where your component should start executing
+
+        Raises:
+            NotImplementedError: There is no execution method defined, please define it with 'component_execute'
+        """
+        raise NotImplementedError("There is no execution method defined, please define it with 'component_execute'")
+
+    async def run(self):
+        """
+        This coroutine will await the sub class' component_execute coroutine
+        This is the only way a component should be executed as it
+        ensures that the properties of the component are valid
+
+        Returns:
+            AsyncComponentBase: The component
+        """
+        self.check_fillables()
+        # The fillable properties passed their parsing, therefore the component can be executed
+        await self.component_execute()
+        return self
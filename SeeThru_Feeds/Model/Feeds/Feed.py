@@ -1,9 +1,8 @@
 import json
 
+from SeeThru_Feeds.Model.Feeds.Session import get_session
 from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
 
-import requests
-
 
 class Feed:
     def __init__(self):
@@ -11,6 +10,7 @@ class Feed:
         self.Secret = None
         self.Guid = None
         self.ScriptResult = None
+        self.Session = None
 
     def set_api_key(self, access_token, secret):
         self.AccessToken = access_token
@@ -25,6 +25,15 @@ class Feed:
     def set_script_result(self, result):
         self.ScriptResult = result
 
+    def set_session(self, session):
+        """
+        Sets the session used to push the feed, the shared session is used if none is set
+
+        Args:
+            session (FeedSession): The session
+        """
+        self.Session = session
+
     def push(self):
         headers = {
             "X-Access-Token": self.AccessToken,
@@ -38,7 +47,8 @@ class Feed:
             "version": "2020.1.1"
         }
 
-        response = requests.post(f"https://api.seethrunetworks.com/feed/{self.Guid}/update", data=data, headers=headers)
+        session = self.Session if self.Session is not None else get_session()
+        response = session.post(f"{session.api_url}/feed/{self.Guid}/update", data=data, headers=headers)
 
         if response.status_code != 200:
             return False
@@ -0,0 +1,95 @@
+import threading
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FeedSession:
+    """
+    A pooled http session that feeds are pushed with, connections to the api are kept alive and reused between pushes
+    """
+    def __init__(self, pool_size: int = 10, timeout: Union[float, Tuple[float, float]] = (5, 30),
+                 keep_alive: bool = True, api_url: str = "https://api.seethrunetworks.com"):
+        """
+        Args:
+            pool_size (int): The maximum number of connections kept open to each host
+            timeout (Union[float, Tuple[float, float]]): The timeout of each push in seconds,
+                                                         or a (connect, read) pair of timeouts
+            keep_alive (bool): Whether connections are kept open after each push
+            api_url (str): The base url of the api
+        """
+        if type(pool_size) != int or pool_size < 1:
+            raise ValueError("The pool size must be a positive integer")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.api_url = api_url.rstrip("/")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a post request using a pooled connection, the session's timeout is used unless one is given
+
+        Args:
+            url (str): The url
+
+        Returns:
+            Response: The response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def close(self):
+        """
+        Closes every pooled connection
+        """
+        self.session.close()
+
+
+_default_session: Optional[FeedSession] = None
+_default_session_lock = threading.Lock()
+
+
+def get_session() -> FeedSession:
+    """
+    Returns the session shared by every feed, it is created on first use
+
+    Returns:
+        FeedSession: The shared session
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = FeedSession()
+        return _default_session
+
+
+def configure_session(pool_size: int = 10, timeout: Union[float, Tuple[float, float]] = (5, 30),
+                      keep_alive: bool = True, api_url: str = "https://api.seethrunetworks.com") -> FeedSession:
+    """
+    Replaces the session shared by every feed, closing the previous session
+
+    Args:
+        pool_size (int): The maximum number of connections kept open to each host
+        timeout (Union[float, Tuple[float, float]]): The timeout of each push in seconds,
+                                                     or a (connect, read) pair of timeouts
+        keep_alive (bool): Whether connections are kept open after each push
+        api_url (str): The base url of the api
+
+    Returns:
+        FeedSession: The shared session
+    """
+    global _default_session
+    session = FeedSession(pool_size, timeout, keep_alive, api_url)
+    with _default_session_lock:
+        if _default_session is not None:
+            _default_session.close()
+        _default_session = session
+    return session
@@ -3,12 +3,81 @@ from SeeThru_Feeds.Model.Properties.Exceptions import InvalidPropertyType, Prope
     PropertyValidatorError
 
 
+def compile_validator(required=False, of_type=None, value_set=None, custom=None):
+    """
+    Compiles the constraints of a property into a single validator, only the checks that apply are included
+
+    Args:
+        required (bool): Whether the value can't be None
+        of_type (type, [type]): A type, or a list of types, that the value can be.
+                                With a single type None is also allowed, with a list of types it isn't
+        value_set (set): A set of values that the value can be
+        custom (lambda): A lambda function to check the value against
+
+    Returns:
+        Callable[[str, any], bool]: Takes the name of the property and the value,
+                                    raises an exception if the value is invalid and otherwise returns True
+    """
+    checks = []
+    # --Required check
+    if required:
+        def check_required(name, value):
+            if value is None:
+                raise PropertyRequired(name)
+        checks.append(check_required)
+    # --Type check, ensures that the value is of a type in of_type
+    if of_type is not None:
+        if type(of_type) == list:
+            types = frozenset(of_type)
+
+            def check_type(name, value):
+                if type(value) not in types:
+                    raise InvalidPropertyType(name, value, of_type)
+        else:
+            def check_type(name, value):
+                if value is not None and type(value) != of_type:
+                    raise InvalidPropertyType(name, value, of_type)
+        checks.append(check_type)
+    # --Value check, checks that the value is in the set given
+    if value_set is not None:
+        def check_value(name, value):
+            if value not in value_set:
+                raise InvalidPropertyValue(name, value, value_set)
+        checks.append(check_value)
+    # --Runs the custom function to check the value
+    if custom is not None:
+        def check_custom(name, value):
+            if not custom(value):
+                raise PropertyValidatorError(name, value)
+        checks.append(check_custom)
+
+    if len(checks) == 0:
+        return lambda name, value: True
+    if len(checks) == 1:
+        check = checks[0]
+
+        def validate(name, value):
+            check(name, value)
+            return True
+        return validate
+
+    checks = tuple(checks)
+
+    def validate(name, value):
+        for check in checks:
+            check(name, value)
+        return True
+    return validate
+
+
 class PropertyBase:
     def __init__(self, name):
         if type(name) != str and name is not None:
             raise TypeError("Invalid type for 'name'")
         self.name = name
         self._value = None
+        # Whether the value has passed validation, default values haven't
+        self._validated = False
 
     def parse_value(self, value):
         """
@@ -60,6 +129,7 @@ class PropertyBase:
         # Validates that the value given is valid
         if self.parse_value(value):
             self._value = value
+            self._validated = True
 
 
 class FillableProperty(PropertyBase):
@@ -96,6 +166,9 @@ class FillableProperty(PropertyBase):
             raise TypeError("Invalid type for 'func'")
         self.custom = custom
 
+        # The constraints are compiled once, they shouldn't be changed after the property is defined
+        self._validator = compile_validator(self.required, self.ofType, self.valueSet, self.custom)
+
     def parse_value(self, value):
         """
         Ensures that the value provided is valid
@@ -107,24 +180,7 @@ class FillableProperty(PropertyBase):
             bool: Whether the value is valid
 
         """
-        # --Required check
-        if self.required and value is None:
-            raise PropertyRequired(self.name)
-        # --Type check, ensures that the value is of a type in of_type
-        if self.ofType is not None:
-            if type(self.ofType) == list:
-                if type(value) not in self.ofType:
-                    raise InvalidPropertyType(self.name, value, self.ofType)
-            else:
-                if value is not None and type(value) != self.ofType:
-                    raise InvalidPropertyType(self.name, value, self.ofType)
-        # --Value check, checks that the value is in the set given
-        if self.valueSet is not None and value not in self.valueSet:
-            raise InvalidPropertyValue(self.name, value, self.valueSet)
-        # --Runs the custom function to check the value
-        if self.custom is not None and not self.custom(value):
-            raise PropertyValidatorError(self.name, value)
-        return True
+        return self._validator(self.name, value)
 
 
 class ResultProperty(PropertyBase):
@@ -156,19 +212,8 @@ class ResultProperty(PropertyBase):
             raise TypeError("Invalid type for 'func'")
         self.custom = custom
 
+        # The constraints are compiled once, they shouldn't be changed after the property is defined
+        self._validator = compile_validator(False, self.ofType, self.valueSet, self.custom)
+
     def parse_value(self, value):
-        # --Type check, ensures that the value is of a type in of_type
-        if self.ofType is not None:
-            if type(self.ofType) == list:
-                if type(value) not in self.ofType:
-                    raise InvalidPropertyType(self.name, value, self.ofType)
-            else:
-                if value is not None and type(value) != self.ofType:
-                    raise InvalidPropertyType(self.name, value, self.ofType)
-        # --Value check, checks that the value is in the set given
-        if self.valueSet is not None and value not in self.valueSet:
-            raise InvalidPropertyValue(self.name, value, self.valueSet)
-        # --Runs the custom function to check the value
-        if self.custom is not None and not self.custom(value):
-            raise PropertyValidatorError(self.name, value)
-        return True
+        return self._validator(self.name, value)
@@ -7,6 +7,41 @@ class PropertyManager:
         self.Properties = None
         self.initialise()
 
+    @classmethod
+    def property_schema(cls):
+        """
+        Returns the properties defined by the class, as (attribute, name, property) tuples ordered by the attribute.
+        The schema is found once per class and cached in the class' own __dict__, so subclasses never share it
+
+        Returns:
+            tuple: The property schema of the class
+        """
+        schema = cls.__dict__.get("_property_schema")
+        if schema is None:
+            # Finds every attribute of the class, attributes of subclasses take precedence over their bases
+            attributes = {}
+            for klass in reversed(cls.__mro__):
+                attributes.update(vars(klass))
+            schema = tuple(
+                # Uses either a name defined in the property or the variable's name
+                (attr, prop.name if prop.name is not None else attr, prop)
+                for attr, prop in sorted(attributes.items())
+                if isinstance(prop, SeeThru_Feeds.Model.Properties.Properties.PropertyBase)
+            )
+            cls._property_schema = schema
+        return schema
+
+    @classmethod
+    def invalidate_property_schema(cls):
+        """
+        Clears the cached property schema of the class and of all of its subclasses,
+        this must be called if properties are added to the class after it has been instantiated
+        """
+        if "_property_schema" in cls.__dict__:
+            del cls._property_schema
+        for subclass in cls.__subclasses__():
+            subclass.invalidate_property_schema()
+
     def initialise(self):
         """
         Ensures that the Properties attribute is set
@@ -16,29 +51,21 @@ class PropertyManager:
         if self.Properties is None or type(self.Properties) is not dict:
             self.Properties = {}
             # --Fills the properties dict with the the subclass' properties
-            # Loops through every variable in the class, getting the
-            # variable name and it's associated value
-            for attr in self.__dir__():
-                prop = getattr(self, attr)
-                # If the attribute is a property, then it is added to the properties dict
-                if isinstance(prop, SeeThru_Feeds.Model.Properties.Properties.PropertyBase):
-                    # Uses either a name defined in the property or the variable's name
-                    name = prop.name if prop.name is not None else attr
-
-                    # Creates a new instance of the property
-                    # This is used to store the property value
-                    instanceProp = prop.new_instance(prop)
-                    instanceProp._value = instanceProp.default  # Assigns the default value, ! This bypasses validation
-                    # Stores the instance property in the Properties dictionary
-                    self.Properties[name] = instanceProp
-
-                    # Sets the properties internal name to the name obtained
-                    instanceProp.name = name
-
-                    # Makes the property instance available 
-                    # by both the variable name and internal name
-                    self.__setattr__(attr, instanceProp)
-                    self.__setattr__(name, instanceProp)
+            for attr, name, prop in self.property_schema():
+                # Creates a new instance of the property
+                # This is used to store the property value
+                instanceProp = prop.new_instance(prop)
+                instanceProp._value = instanceProp.default  # Assigns the default value, ! This bypasses validation
+                # Stores the instance property in the Properties dictionary
+                self.Properties[name] = instanceProp
+
+                # Sets the properties internal name to the name obtained
+                instanceProp.name = name
+
+                # Makes the property instance available
+                # by both the variable name and internal name
+                self.__setattr__(attr, instanceProp)
+                self.__setattr__(name, instanceProp)
 
     def set_property(self, prop, value):
         """
@@ -67,6 +94,35 @@ class PropertyManager:
         self.Properties[indexName].value = value
         return self
 
+    def set_properties(self, values):
+        """
+        Sets the values of many properties at once, every value is validated before any is assigned
+
+        Arguments:
+            values (dict): The values keyed by the property reference (e.g. HTTPGet.URL) or the property name
+
+        Raises:
+            TypeError: The keys must be either of type Property or string
+            KeyError: There is no property with the name
+
+        Returns:
+            PropertyManager: The property manager
+        """
+        self.initialise()
+        properties = []
+        for prop, value in values.items():
+            # Data validation
+            if not isinstance(prop, SeeThru_Feeds.Model.Properties.Properties.PropertyBase) and type(prop) != str:
+                raise TypeError("Prop argument must be either of type Property or string")
+            instanceProp = self.Properties[prop if type(prop) == str else prop.name]
+            instanceProp.parse_value(value)
+            properties.append((instanceProp, value))
+        # The values are only assigned once they have all passed validation
+        for instanceProp, value in properties:
+            instanceProp._value = value
+            instanceProp._validated = True
+        return self
+
     def get_property(self, prop):
         """
         Gets the value associated with a property in the manager
@@ -156,8 +212,12 @@ class PropertyManager:
             bool: Whether the fillables are valid, effectively it is always true as exceptions are made
         """
         self.initialise()
-        # Parses all of the fillable properties of the manager to make sure that they are met
+        # Parses all of the fillable properties of the manager to make sure that they are met,
+        # values that were validated when they were set aren't parsed again
         for prop in self.FillableProperties:
+            if prop._validated:
+                continue
             if not prop.parse_value(prop.value):
                 raise Exception("[Property: {}] Did not pass a property parse".format(prop.name))
+            prop._validated = True
         return True
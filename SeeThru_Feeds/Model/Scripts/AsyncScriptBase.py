@@ -0,0 +1,57 @@
+import asyncio
+
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+
+import SeeThru_Feeds.Model.Scripts.ScriptState as ScriptState
+
+
+class AsyncScriptBase(ScriptBase):
+    """
+    A script which runs as a coroutine, this allows many scripts to be awaited at once on a single event loop
+    """
+
+    # region Run
+
+    async def script_run(self):
+        """
+        This coroutine should be overridden by a subclass
+        This is where your script should start running
+
+        Raises:
+            NotImplementedError: There is no execution method defined, please define it with 'script_run'
+        """
+        raise NotImplementedError("There is no execution method defined, please define it with 'script_run'")
+
+    async def run_script_async(self, check: bool = True):
+        """
+        Runs the script on the current event loop
+
+        Args:
+            check (bool): Whether the fillables are checked first, False if the caller has already checked them
+
+        Returns:
+            AsyncScriptBase: The script
+        """
+        try:
+            # All fillables are checked on the setter, this performs one final check
+            if check:
+                self.check_fillables()
+            await self.script_run()
+        except ScriptState.StateAssertException as _:
+            pass
+        return self
+
+    def run_script(self, check: bool = True):
+        """
+        Runs the script on a new event loop, this allows the script to be used in the same way as a ScriptBase
+
+        Args:
+            check (bool): Whether the fillables are checked first, False if the caller has already checked them
+
+        Returns:
+            AsyncScriptBase: The script
+        """
+        asyncio.run(self.run_script_async(check))
+        return self
+
+    # endregion
@@ -0,0 +1,189 @@
+import os
+import re
+import threading
+from pathlib import Path
+
+from SeeThru_Feeds.Model.Scripts.ResultSerializer import dumps, write_atomic
+
+# The output sinks that can be chosen for a feed scheme
+OUTPUT_SINKS = ["file", "ndjson", "segmented"]
+
+
+class OutputSink:
+    """
+    Receives the outputs of scripts, outputs are buffered until the sink is flushed.
+    The base sink only buffers, subclasses write the buffered outputs in write_entries
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Flushes are never ran at once, so subclasses don't need to lock in write_entries
+        self._flush_lock = threading.Lock()
+        self._entries = []
+
+    def write(self, script_name, output_path, content):
+        """
+        Buffers the output of a script
+
+        Args:
+            script_name (str): The name of the script
+            output_path (str): The output path of the script
+            content (str): The json output of the script
+        """
+        with self._lock:
+            self._entries.append((script_name, output_path, content))
+
+    def take(self):
+        """
+        Removes every buffered output from the sink
+
+        Returns:
+            List[Tuple[str, str, str]]: The script name, output path and content of each output
+        """
+        with self._lock:
+            entries, self._entries = self._entries, []
+        return entries
+
+    def write_entries(self, entries):
+        """
+        Writes the given outputs
+
+        Args:
+            entries (List[Tuple[str, str, str]]): The script name, output path and content of each output
+        """
+        raise NotImplementedError("write_entries isn't implemented for this sink")
+
+    def flush(self):
+        """
+        Writes every buffered output
+        """
+        with self._flush_lock:
+            entries = self.take()
+            if len(entries) != 0:
+                self.write_entries(entries)
+
+    def close(self):
+        """
+        Writes every buffered output, the sink shouldn't be used afterwards
+        """
+        self.flush()
+
+    @staticmethod
+    def ndjson_line(script_name, output_path, content):
+        """
+        Returns:
+            str: The output as a line of json, without encoding the content again
+        """
+        return f'{{"script":{dumps(script_name)},"path":{dumps(output_path)},"result":{content}}}\n'
+
+
+class FileSink(OutputSink):
+    """
+    Writes each output to its own file at the output path of the script, every file is replaced atomically
+    """
+    def __init__(self):
+        super().__init__()
+        # The directories that are known to exist, so that they aren't created on every flush
+        self._directories = set()
+
+    def write_entries(self, entries):
+        # Only the newest output for each path is written
+        outputs = {output_path: content for _, output_path, content in entries}
+        for output_path, content in outputs.items():
+            path = Path(output_path)
+            if path.parent not in self._directories:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._directories.add(path.parent)
+            write_atomic(path, content)
+
+
+class NDJSONSink(OutputSink):
+    """
+    Writes the outputs of a run to a single file, with a line of json per script.
+    The file holds the newest output of every script and is replaced atomically on each flush
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (Union[str, Path]): The path of the file
+        """
+        super().__init__()
+        self.path = Path(path)
+        self._lines = {}
+
+    def write_entries(self, entries):
+        for script_name, output_path, content in entries:
+            self._lines[script_name] = self.ndjson_line(script_name, output_path, content)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, "".join(self._lines.values()))
+
+
+class SegmentedLogSink(OutputSink):
+    """
+    Appends every output to a log of numbered segment files, with a line of json per output.
+    A new segment is started once the current segment reaches the segment size
+    """
+    SEGMENT_PATTERN = re.compile(r"^segment-(\d+)\.ndjson$")
+
+    def __init__(self, directory, segment_size=16 * 1024 * 1024):
+        """
+        Args:
+            directory (Union[str, Path]): The directory of the segments
+            segment_size (int): The number of bytes after which a new segment is started
+        """
+        super().__init__()
+        if type(segment_size) != int or segment_size < 1:
+            raise ValueError("The segment size must be a positive integer")
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self._segment = None
+
+    def segment_path(self, number):
+        """
+        Returns:
+            Path: The path of the segment with the number
+        """
+        return self.directory.joinpath(f"segment-{number:08d}.ndjson")
+
+    def current_segment(self):
+        """
+        Returns:
+            int: The number of the segment that is being appended to
+        """
+        if self._segment is None:
+            numbers = [int(match.group(1)) for match in
+                       (self.SEGMENT_PATTERN.match(path.name) for path in self.directory.iterdir()) if match]
+            self._segment = max(numbers, default=1)
+        return self._segment
+
+    def write_entries(self, entries):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = "".join(self.ndjson_line(*entry) for entry in entries).encode("utf-8")
+        path = self.segment_path(self.current_segment())
+        if path.exists() and path.stat().st_size >= self.segment_size:
+            self._segment += 1
+            path = self.segment_path(self._segment)
+        with open(path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def create_sink(kind, base_dir):
+    """
+    Creates an output sink for a feed scheme
+
+    Args:
+        kind (str): Either "file", "ndjson" or "segmented"
+        base_dir (Union[str, Path]): The directory of the feed scheme
+
+    Returns:
+        OutputSink: The sink
+    """
+    outputs = Path(base_dir).joinpath("Outputs")
+    if kind == "file":
+        return FileSink()
+    elif kind == "ndjson":
+        return NDJSONSink(outputs.joinpath("results.ndjson"))
+    elif kind == "segmented":
+        return SegmentedLogSink(outputs.joinpath("log"))
+    raise ValueError(f"The output sink must be one of {', '.join(OUTPUT_SINKS)}")
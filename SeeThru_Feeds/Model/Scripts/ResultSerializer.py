@@ -0,0 +1,131 @@
+import json
+import os
+from pathlib import Path
+
+# orjson is used to encode results when it is installed, otherwise the standard library is used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(value):
+    """
+    Converts values that can't be encoded as json directly, such as those of result properties
+
+    Args:
+        value (any): The value
+
+    Returns:
+        any: A value that can be encoded
+    """
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(data, use_orjson=None):
+    """
+    Encodes data as json, using orjson if it is installed
+
+    Args:
+        data (any): The data to encode
+        use_orjson (bool): Whether orjson should be used, defaults to whether it is installed
+
+    Returns:
+        str: The json string
+    """
+    if use_orjson is None:
+        use_orjson = orjson is not None
+    if use_orjson:
+        return orjson.dumps(data, default=encode_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, default=encode_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def result_document(result, properties=None):
+    """
+    Creates the json document of a script result
+
+    Args:
+        result (ScriptResult): The result
+        properties (dict): The values of any result properties to include, keyed by the property name
+
+    Returns:
+        dict: The document
+    """
+    document = {"color": result.Status, "Message": result.Message, "time": result.Timestamp}
+    if properties:
+        document["properties"] = properties
+    return document
+
+
+def encode_result(result, properties=None):
+    """
+    Encodes a script result as json
+
+    Args:
+        result (ScriptResult): The result
+        properties (dict): The values of any result properties to include, keyed by the property name
+
+    Returns:
+        str: The json string
+    """
+    return dumps(result_document(result, properties))
+
+
+def encode_results(results, properties=None):
+    """
+    Encodes the results of a whole run as a single json object, keyed by the script name
+
+    Args:
+        results (Dict[str, ScriptResult]): The results keyed by the script name
+        properties (Dict[str, dict]): The values of any result properties to include, keyed by the script name
+
+    Returns:
+        str: The json string
+    """
+    properties = properties or {}
+    return dumps({name: result_document(result, properties.get(name)) for name, result in results.items()})
+
+
+def write_atomic(path, content):
+    """
+    Writes a file through a temporary file that is renamed over it, readers never see a partially written file
+
+    Args:
+        path (Path): The path of the file, its directory must exist
+        content (str): The content
+    """
+    temporaryPath = path.with_name(path.name + ".tmp")
+    with open(temporaryPath, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(temporaryPath, path)
+
+
+def write_json(path, content):
+    """
+    Atomically writes json to a file, creating its directory if needed
+
+    Args:
+        path (Union[str, Path]): The path of the file
+        content (str): The json string
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, content)
+
+
+def write_results(path, results, properties=None):
+    """
+    Encodes the results of a whole run in one call and writes them to a single file
+
+    Args:
+        path (Union[str, Path]): The path of the file
+        results (Dict[str, ScriptResult]): The results keyed by the script name
+        properties (Dict[str, dict]): The values of any result properties to include, keyed by the script name
+    """
+    write_json(path, encode_results(results, properties))
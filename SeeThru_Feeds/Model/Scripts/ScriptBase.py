@@ -1,8 +1,8 @@
 from SeeThru_Feeds.Model.Attribution import Attribution
+from SeeThru_Feeds.Model.Scripts.ResultSerializer import write_json
 from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
 from SeeThru_Feeds.Model.Properties.PropertyManager import PropertyManager
 from SeeThru_Feeds.Model.Feeds.Feed import Feed
-from pathlib import Path
 
 import SeeThru_Feeds.Model.Scripts.ScriptState as ScriptState
 
@@ -18,6 +18,8 @@ class ScriptBase(PropertyManager, Attribution):
         self._script_alias = None
         self._script_result = None
         self._script_output_path = None
+        self._script_output_properties = []
+        self._script_output_sink = None
         self._guid = None
 
         self.prepare(*args, **kwargs)
@@ -40,16 +42,20 @@ class ScriptBase(PropertyManager, Attribution):
         """
         raise NotImplementedError("There is no execution method defined, please define it with 'script_run'")
 
-    def run_script(self):
+    def run_script(self, check: bool = True):
         """
         Runs the script
 
+        Args:
+            check (bool): Whether the fillables are checked first, False if the caller has already checked them
+
         Returns:
             ScriptBase: The script
         """
         try:
             # All fillables are checked on the setter, this performs one final check
-            self.check_fillables()
+            if check:
+                self.check_fillables()
             self.script_run()
         except ScriptState.StateAssertException as _:
             pass
@@ -124,9 +130,53 @@ class ScriptBase(PropertyManager, Attribution):
         self._script_output_path = path
         return self
 
+    def set_output_sink(self, sink):
+        """
+        Sets the sink that the output of the script is exported to,
+        without a sink the output is written straight to the output path
+
+        Arguments:
+            sink (OutputSink): The output sink
+
+        Returns:
+            ScriptBase: The script
+        """
+        self._script_output_sink = sink
+        return self
+
+    def set_output_properties(self, names):
+        """
+        Sets the result properties whose values are included in the output of the script
+
+        Arguments:
+            names (List[str]): The names of the result properties
+
+        Raises:
+            ValueError: There is no result property with the name
+
+        Returns:
+            ScriptBase: The script
+        """
+        resultNames = [prop.name for prop in self.ResultProperties]
+        for name in names:
+            if name not in resultNames:
+                raise ValueError(f"There is no result property named '{name}'")
+        self._script_output_properties = list(names)
+        return self
+
+    def get_output_properties(self):
+        """
+        Returns the values of the result properties included in the output of the script
+
+        Returns:
+            dict: The values keyed by the property name
+        """
+        return {name: self.get_property(name) for name in self._script_output_properties}
+
     def export_to_output(self):
         """
-        Exports the result of the script to a file path defined with set_output_path
+        Exports the result of the script to a file path defined with set_output_path,
+        or to the output sink if one has been set
 
         Raises:
             Exception: There is no output path specified
@@ -140,27 +190,31 @@ class ScriptBase(PropertyManager, Attribution):
         if self._script_result is None:
             self.evaluate_script()
 
-        filePath = Path(self._script_output_path)
-        filePath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filePath, "w") as file:
-            file.write(self._script_result.generate_json())
+        content = self._script_result.generate_json(self.get_output_properties())
+        if self._script_output_sink is not None:
+            self._script_output_sink.write(self.get_internal_alias(), self._script_output_path, content)
+        else:
+            write_json(self._script_output_path, content)
         return self
 
     # endregion
 
     # region Result
 
-    def log_output(self):
+    def log_output(self, file=None):
         """
         Logs the result of the script
 
+        Arguments:
+            file (TextIO): Where the result should be logged, defaults to stdout
+
         Returns:
             ScriptBase: The script
         """
         if self.get_internal_alias() is not None:
-            print(f"--{self.get_internal_alias()}")
-        print(f"Status: {self._script_result.Status}")
-        print(f"Message: {self._script_result.Message}")
+            print(f"--{self.get_internal_alias()}", file=file)
+        print(f"Status: {self._script_result.Status}", file=file)
+        print(f"Message: {self._script_result.Message}", file=file)
         return self
 
     def get_result(self):
@@ -192,13 +246,14 @@ class ScriptBase(PropertyManager, Attribution):
 
         return self
 
-    def push_as_feed(self, access_token, secret):
+    def push_as_feed(self, access_token, secret, session=None):
         """
         Uses the script result as a feed and pushes the result
 
         Args:
             access_token (str): The access token of the api key
             secret (str): The secret of the api key
+            session (FeedSession): The session to push with, the session shared by every feed is used if None
         """
         if self._guid is None:
             raise ValueError("No guid has been provided")
@@ -207,6 +262,7 @@ class ScriptBase(PropertyManager, Attribution):
         feed.set_script_result(self.get_result())
         feed.set_guid(self._guid)
         feed.set_api_key(access_token, secret)
+        feed.set_session(session)
         return feed.push()
 
     # endregion
@@ -1,7 +1,43 @@
-from datetime import datetime
+import calendar
+import time
+from array import array
+
+from SeeThru_Feeds.Model.Scripts.ResultSerializer import encode_result
+
+# The statuses of a result, a status is stored as its index in this tuple
+STATUSES = (None, "red", "amber", "green")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_timestamp(epoch):
+    """
+    Args:
+        epoch (int): The number of seconds since the epoch
+
+    Returns:
+        str: The UTC timestamp as Y-m-d H:M:S
+    """
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(epoch))
+
+
+def parse_timestamp(timestamp):
+    """
+    Args:
+        timestamp (str, int, float): A UTC timestamp as Y-m-d H:M:S, or the number of seconds since the epoch
+
+    Returns:
+        int: The number of seconds since the epoch
+    """
+    if type(timestamp) == str:
+        return calendar.timegm(time.strptime(timestamp, TIMESTAMP_FORMAT))
+    return int(timestamp)
 
 
 class ScriptResult:
+    # Results are held in large numbers, so they don't have a __dict__
+    __slots__ = ("_status", "_other_status", "Message", "_epoch")
+
     def __init__(self, status=None, message=None):
         """
         Creates a new script result
@@ -12,7 +48,52 @@ class ScriptResult:
         """
         self.Status = status
         self.Message = message
-        self.Timestamp = None
+        self._epoch = None
+
+    @property
+    def Status(self):
+        """
+        Returns:
+            str: The status of the result, None if it hasn't been set
+        """
+        return STATUSES[self._status] if self._status != -1 else self._other_status
+
+    @Status.setter
+    def Status(self, status):
+        # Any status can be assigned directly, only set_status is validated.
+        # Known statuses are stored as their code, any other value is kept as it is with the code -1
+        code = 0 if status is None else STATUS_CODES.get(status.lower()) if type(status) == str else None
+        self._status = code if code is not None else -1
+        self._other_status = status if code is None else None
+
+    @property
+    def StatusCode(self):
+        """
+        Returns:
+            int: The status of the result as its index in STATUSES, 0 if it hasn't been set
+                 and -1 if it isn't one of STATUSES
+        """
+        return self._status
+
+    @property
+    def Timestamp(self):
+        """
+        Returns:
+            str: The UTC timestamp of the result as Y-m-d H:M:S, None if it hasn't been generated
+        """
+        return format_timestamp(self._epoch) if self._epoch is not None else None
+
+    @Timestamp.setter
+    def Timestamp(self, timestamp):
+        self._epoch = parse_timestamp(timestamp) if timestamp is not None else None
+
+    @property
+    def Epoch(self):
+        """
+        Returns:
+            int: The timestamp of the result as the number of seconds since the epoch, None if it hasn't been generated
+        """
+        return self._epoch
 
     def set_status(self, status):
         """
@@ -63,20 +144,23 @@ class ScriptResult:
         Returns:
             ScriptResult: The script result
         """
-        self.Timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        self._epoch = int(time.time())
 
         return self
 
-    def generate_json(self):
+    def generate_json(self, properties=None):
         """
         Generates the json result result
 
+        Args:
+            properties (dict): The values of any result properties to include, keyed by the property name
+
         Returns:
             str: The json string
         """
-        if self.Status is None or self.Message is None or self.Timestamp is None:
+        if self._status == 0 or self.Message is None or self._epoch is None:
             raise Exception("Not all values are provided for the result")
-        return "{\"color\":\"%s\", \"Message\":\"%s\", \"time\":\"%s\"}" % (self.Status, self.Message, self.Timestamp)
+        return encode_result(self, properties)
 
     def get_status(self):
         """
@@ -104,3 +188,109 @@ class ScriptResult:
             str: The timestamp
         """
         return self.Timestamp
+
+    def to_payload(self):
+        """
+        Returns the result as a compact tuple, this is used to pass results between processes
+
+        Returns:
+            tuple: The status, message and epoch timestamp of the result
+        """
+        return self.Status, self.Message, self._epoch
+
+    @staticmethod
+    def from_payload(payload):
+        """
+        Creates a script result from a payload made with to_payload
+
+        Args:
+            payload (tuple): The status, message and timestamp of the result,
+                             the timestamp can either be an epoch or formatted as Y-m-d H:M:S
+
+        Returns:
+            ScriptResult: The script result
+        """
+        status, message, timestamp = payload
+        result = ScriptResult(status, message)
+        result.Timestamp = timestamp
+        return result
+
+
+class ScriptResultBatch:
+    """
+    Stores many script results in parallel arrays, rather than as an object per result.
+    Statuses are stored as a byte, timestamps as an integer and equal messages are only stored once
+    """
+    def __init__(self, results=None):
+        """
+        Args:
+            results (Iterable[ScriptResult]): The results to add to the batch
+        """
+        self._statuses = array("b")
+        # Timestamps that haven't been generated are stored as -1
+        self._epochs = array("q")
+        self._messages = []
+        # The statuses that aren't one of STATUSES, keyed by their index in the batch
+        self._other_statuses = {}
+        # Maps each message to the copy of it stored in the batch
+        self._message_table = {}
+        if results is not None:
+            self.extend(results)
+
+    def append(self, result):
+        """
+        Adds a result to the batch
+
+        Args:
+            result (ScriptResult): The result
+        """
+        if result.StatusCode == -1:
+            self._other_statuses[len(self._statuses)] = result.Status
+        self._statuses.append(result.StatusCode)
+        self._epochs.append(result.Epoch if result.Epoch is not None else -1)
+        message = result.Message
+        if message is not None:
+            message = self._message_table.setdefault(message, message)
+        self._messages.append(message)
+
+    def extend(self, results):
+        """
+        Adds many results to the batch
+
+        Args:
+            results (Iterable[ScriptResult]): The results
+        """
+        for result in results:
+            self.append(result)
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def __getitem__(self, index):
+        """
+        Args:
+            index (int): The index of the result in the batch
+
+        Returns:
+            ScriptResult: A copy of the result
+        """
+        code = self._statuses[index]
+        status = STATUSES[code] if code != -1 else self._other_statuses[index % len(self)]
+        result = ScriptResult(status, self._messages[index])
+        epoch = self._epochs[index]
+        result._epoch = epoch if epoch != -1 else None
+        return result
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def status_counts(self):
+        """
+        Returns:
+            dict: The number of results with each status
+        """
+        counts = {status: self._statuses.count(code) for code, status in enumerate(STATUSES) if status is not None}
+        for status in self._other_statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
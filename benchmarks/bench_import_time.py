@@ -0,0 +1,69 @@
+"""
+Measures the startup time of the command line utility, each measurement is a fresh interpreter which imports
+SeeThruFeed and runs a program. Fails if any of the modules that should only be imported by the programs
+which use them are imported, or if the startup takes longer than the limit given
+
+Run from the root of the repository:
+    python benchmarks/bench_import_time.py
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The modules that must not be imported to display the help screen
+DEFERRED_MODULES = ["toml", "dotenv", "requests", "cProfile", "tracemalloc", "SeeThru_Feeds.Core.Runner",
+                    "SeeThru_Feeds.Core.Pusher", "SeeThru_Feeds.Core.Profiler"]
+
+STARTUP = """
+import json, sys, time
+start = time.perf_counter()
+from SeeThru_Feeds.Core.SeeThruFeed import SeeThruFeed
+imported = time.perf_counter()
+SeeThruFeed(["seethrufeeds"] + sys.argv[1:])
+ran = time.perf_counter()
+print(json.dumps({"import": imported - start, "total": ran - start, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure(argv):
+    """
+    Runs a program in a fresh interpreter
+
+    Returns:
+        dict: The seconds taken to import and in total, and the modules that were imported
+    """
+    output = subprocess.run([sys.executable, "-c", STARTUP] + argv, cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", "-r", type=int, default=10, help="The number of interpreters started")
+    parser.add_argument("--limit", type=float, default=None,
+                        help="The median number of milliseconds that the startup must take less than")
+    parser.add_argument("program", nargs="*", default=["help"], help="The program and its arguments")
+    args = parser.parse_args()
+
+    measurements = [measure(args.program) for _ in range(args.repeat)]
+    importTime = statistics.median(measurement["import"] for measurement in measurements) * 1000
+    totalTime = statistics.median(measurement["total"] for measurement in measurements) * 1000
+    print(f"{'Import (ms)':>12}{'Total (ms)':>12}")
+    print(f"{importTime:>12.1f}{totalTime:>12.1f}")
+
+    imported = [module for module in DEFERRED_MODULES if module in measurements[0]["modules"]]
+    if len(imported) != 0:
+        print(f"Modules that should be deferred were imported: {', '.join(imported)}")
+        sys.exit(1)
+    if args.limit is not None and totalTime > args.limit:
+        print(f"The startup took longer than {args.limit}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
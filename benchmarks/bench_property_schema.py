@@ -0,0 +1,69 @@
+"""
+Measures the cost of instantiating components and scripts, comparing the cached property schema
+with finding the properties by reflecting on every instance, as PropertyManager.initialise used to
+
+Run from the root of the repository:
+    python benchmarks/bench_property_schema.py
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from SeeThru_Feeds.Library.Components.HTTP import HTTPGet  # noqa: E402
+from SeeThru_Feeds.Library.Components.Socket import PortOpen  # noqa: E402
+from SeeThru_Feeds.Library.Scripts.TCPPortOpen import TCPPortOpen  # noqa: E402
+from SeeThru_Feeds.Model.Properties.Properties import PropertyBase  # noqa: E402
+from SeeThru_Feeds.Model.Properties.PropertyManager import PropertyManager  # noqa: E402
+
+
+def reflective_initialise(self):
+    """
+    The previous PropertyManager.initialise, which reflects on every attribute of the instance
+    """
+    if self.Properties is None or type(self.Properties) is not dict:
+        self.Properties = {}
+        for attr in self.__dir__():
+            prop = getattr(self, attr)
+            if isinstance(prop, PropertyBase):
+                name = prop.name if prop.name is not None else attr
+                instanceProp = prop.new_instance(prop)
+                instanceProp._value = instanceProp.default
+                self.Properties[name] = instanceProp
+                instanceProp.name = name
+                self.__setattr__(attr, instanceProp)
+                self.__setattr__(name, instanceProp)
+
+
+def measure(cls, number):
+    """
+    Returns:
+        float: The mean number of microseconds taken to instantiate the class
+    """
+    return min(timeit.repeat(cls, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", "-n", type=int, default=2000, help="The number of instances created per repeat")
+    args = parser.parse_args()
+
+    classes = [PortOpen, HTTPGet, TCPPortOpen]
+    cached = {cls: measure(cls, args.number) for cls in classes}
+
+    schemaInitialise = PropertyManager.initialise
+    PropertyManager.initialise = reflective_initialise
+    try:
+        reflective = {cls: measure(cls, args.number) for cls in classes}
+    finally:
+        PropertyManager.initialise = schemaInitialise
+
+    print(f"{'Class':<16}{'Reflective (us)':>18}{'Cached (us)':>14}{'Speedup':>10}")
+    for cls in classes:
+        print(f"{cls.__name__:<16}{reflective[cls]:>18.2f}{cached[cls]:>14.2f}{reflective[cls] / cached[cls]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Measures the throughput of the feed scheme runner and the model layer with synthetic feed schemes
+of no-op, sleep-bound and CPU-bound scripts. Each phase is timed separately:
+
+    config_load           Parsing the config file
+    config_load_snapshot  Loading the config from its parsed snapshot
+    instantiate           Creating each script and assigning its fillables
+    run_evaluate          run_script and evaluate_script of each script
+    export_file           Exporting each output to its own file
+    export_ndjson         Exporting each output to a single ndjson file
+    scheme_run            The whole scheme ran by the SchemeRunner
+    push                  Pushing each result to a local stand-in api
+
+The results are written as json, so that they can be kept and compared between releases.
+
+Run from the root of the repository:
+    python benchmarks/bench_scheme.py --sizes 10,100,1000,10000 --repeat 1 --output results.json
+    python benchmarks/bench_scheme.py --baseline results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import SeeThru_Feeds.Core.ConfigParser as ConfigParser  # noqa: E402
+from SeeThru_Feeds.Core.Pusher import FeedPipeline, FeedPusher  # noqa: E402
+from SeeThru_Feeds.Core.Runner import SchemeRunner, ScriptJob  # noqa: E402
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession  # noqa: E402
+from SeeThru_Feeds.Model.Scripts.OutputSink import FileSink, NDJSONSink  # noqa: E402
+from synthetic import SCRIPT_KINDS, StandInApi, create_scheme  # noqa: E402
+
+# The version of the result format
+RESULTS_VERSION = 1
+
+
+class Timer:
+    """
+    Times a block of code
+    """
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.seconds = time.perf_counter() - self.start
+
+
+def record(results, benchmark, kind, scripts, seconds):
+    results.append({
+        "benchmark": benchmark,
+        "kind": kind,
+        "scripts": scripts,
+        "seconds": seconds,
+        "per_script_us": seconds / scripts * 1e6
+    })
+
+
+def bench_kind(results, kind, scripts, workers, directory):
+    """
+    Runs every phase except the push for a scheme of one kind of script
+    """
+    config = create_scheme(kind, scripts, directory.joinpath("Outputs"))
+    configPath = directory.joinpath("config.json")
+    ConfigParser.ConfigParser.json(configPath).set_config(config).save(force=True)
+
+    with Timer() as timer:
+        ConfigParser.ConfigParser(configPath, "json").load()
+    record(results, "config_load", kind, scripts, timer.seconds)
+    ConfigParser.ConfigParser(configPath, "json", use_snapshot=True).load()
+    with Timer() as timer:
+        config = ConfigParser.ConfigParser(configPath, "json", use_snapshot=True).load()
+    record(results, "config_load_snapshot", kind, scripts, timer.seconds)
+
+    jobs = [ScriptJob(key, script) for key, script in config.Scripts.items()]
+    for job in jobs:
+        job.load_class()
+    with Timer() as timer:
+        instances = [job.instantiate() for job in jobs]
+    record(results, "instantiate", kind, scripts, timer.seconds)
+
+    with Timer() as timer:
+        for instance in instances:
+            instance.run_script()
+            instance.evaluate_script()
+    record(results, "run_evaluate", kind, scripts, timer.seconds)
+
+    for benchmark, sink in [("export_file", FileSink()),
+                            ("export_ndjson", NDJSONSink(directory.joinpath("Outputs", "results.ndjson")))]:
+        with Timer() as timer:
+            for instance in instances:
+                instance.set_output_sink(sink)
+                instance.export_to_output()
+            sink.flush()
+        record(results, benchmark, kind, scripts, timer.seconds)
+
+    with Timer() as timer, contextlib.redirect_stdout(io.StringIO()):
+        SchemeRunner(config, workers, sink=FileSink()).run()
+    record(results, "scheme_run", kind, scripts, timer.seconds)
+
+
+def bench_push(results, scripts, push_workers, directory):
+    """
+    Pushes the result of every script of a no-op scheme to a local stand-in api
+    """
+    config = create_scheme("noop", scripts, directory.joinpath("Outputs"), feeds=True)
+    instances = [job.instantiate() for job in
+                 (ScriptJob(key, script) for key, script in config.Scripts.items())]
+    for instance in instances:
+        instance.run_script()
+        instance.evaluate_script()
+
+    with StandInApi() as api:
+        session = FeedSession(pool_size=push_workers, api_url=api.url)
+        pusher = FeedPusher(config, session=session)
+        with Timer() as timer:
+            with FeedPipeline(pusher, push_workers) as pipeline:
+                for instance in instances:
+                    pipeline.submit(instance.get_internal_alias(), instance.get_result())
+        session.close()
+    if api.pushes != scripts:
+        raise RuntimeError(f"Only {api.pushes} of {scripts} pushes reached the stand-in api")
+    record(results, "push", "noop", scripts, timer.seconds)
+
+
+def compare(results, baseline_path):
+    """
+    Prints how much slower or faster each benchmark is than the baseline
+    """
+    with open(baseline_path, "r") as file:
+        baseline = {(entry["benchmark"], entry["kind"], entry["scripts"]): entry["seconds"]
+                    for entry in json.load(file)["results"]}
+    print(f"{'Benchmark':<22}{'Kind':<7}{'Scripts':>8}{'Baseline (s)':>14}{'Now (s)':>10}{'Change':>9}")
+    for entry in results:
+        key = (entry["benchmark"], entry["kind"], entry["scripts"])
+        if key not in baseline:
+            continue
+        change = (entry["seconds"] / baseline[key] - 1) * 100
+        print(f"{key[0]:<22}{key[1]:<7}{key[2]:>8}{baseline[key]:>14.4f}{entry['seconds']:>10.4f}{change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=[10, 100, 1000],
+                        help="The comma separated numbers of scripts in each scheme, defaults to 10,100,1000")
+    parser.add_argument("--kinds", type=lambda value: value.split(","), default=list(SCRIPT_KINDS),
+                        help="The comma separated kinds of script, defaults to noop,sleep,cpu")
+    parser.add_argument("--repeat", "-r", type=int, default=3,
+                        help="The number of times each scheme is benchmarked, the fastest time is kept")
+    parser.add_argument("--workers", "-w", type=int, default=8, help="The workers of the scheme runner")
+    parser.add_argument("--push-workers", type=int, default=4, help="The number of feeds pushed at once")
+    parser.add_argument("--no-push", action="store_true", help="Don't benchmark pushing to the stand-in api")
+    parser.add_argument("--output", "-o", type=str, help="The file the json results are written to, "
+                                                           "defaults to stdout")
+    parser.add_argument("--baseline", type=str, help="A previous json result to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for scripts in args.sizes:
+        repeats = []
+        for _ in range(args.repeat):
+            repeat = []
+            for kind in args.kinds:
+                with tempfile.TemporaryDirectory() as directory:
+                    bench_kind(repeat, kind, scripts, args.workers, Path(directory))
+            if not args.no_push:
+                with tempfile.TemporaryDirectory() as directory:
+                    bench_push(repeat, scripts, args.push_workers, Path(directory))
+            repeats.append(repeat)
+        # Keeps the fastest time of each benchmark, which is the least affected by other processes
+        results.extend(min(entries, key=lambda entry: entry["seconds"]) for entries in zip(*repeats))
+        print(f"Benchmarked schemes of {scripts} scripts", file=sys.stderr)
+
+    document = json.dumps({
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.time(),
+        "repeat": args.repeat,
+        "workers": args.workers,
+        "push_workers": args.push_workers,
+        "results": results
+    }, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(document)
+    elif args.baseline is None:
+        print(document)
+    if args.baseline is not None:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
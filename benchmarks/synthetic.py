@@ -0,0 +1,124 @@
+"""
+Synthetic scripts, feed schemes and a stand-in api that the benchmarks are ran against
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import SeeThru_Feeds.Core.ConfigParser as ConfigParser
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+
+
+class NoOpScript(ScriptBase):
+    def script_run(self):
+        pass
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message("Nothing was done")
+
+
+class SleepScript(ScriptBase):
+    DURATION = FillableProperty(name="duration", default=0.001, of_type=[int, float])
+
+    def script_run(self):
+        time.sleep(self.get_property(self.DURATION))
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message(f"Slept {self.get_property(self.DURATION)}")
+
+
+class CPUScript(ScriptBase):
+    ITERATIONS = FillableProperty(name="iterations", default=2000, of_type=int)
+    TOTAL = ResultProperty(name="total")
+
+    def script_run(self):
+        self.set_property(self.TOTAL, sum(i * i for i in range(self.get_property(self.ITERATIONS))))
+
+    def script_evaluate(self, result):
+        result.set_status("green" if self.get_property(self.TOTAL) > 0 else "red")
+        result.set_message(f"Summed {self.get_property(self.ITERATIONS)} squares")
+
+
+# The synthetic scripts by the kind of work that they do
+SCRIPT_KINDS = {
+    "noop": "synthetic@NoOpScript",
+    "sleep": "synthetic@SleepScript",
+    "cpu": "synthetic@CPUScript"
+}
+
+
+def create_scheme(kind, scripts, output_dir, feeds=False):
+    """
+    Creates the config of a synthetic feed scheme
+
+    Args:
+        kind (str): The kind of script, one of SCRIPT_KINDS
+        scripts (int): The number of scripts
+        output_dir (Union[str, Path]): The directory the outputs of the scripts are written to
+        feeds (bool): Whether a feed is created for every script
+
+    Returns:
+        Config: The config
+    """
+    config = ConfigParser.Config.new(f"Synthetic {kind}")
+    if feeds:
+        config.add_api_key("Key", "Access_Token", "Secret")
+    for i in range(scripts):
+        name = f"{kind.title()}{i}"
+        script = config.add_script(name)
+        script.Meta.Script_Object_Path = SCRIPT_KINDS[kind]
+        script.Meta.Script_Output_Path = str(Path(output_dir).joinpath(name))
+        if feeds:
+            config.add_feed(f"{name}Feed", name, "Key", f"guid{i}")
+    return config
+
+
+class StandInApi:
+    """
+    A local stand-in for the feed api, which accepts every push
+    """
+    def __init__(self):
+        self.pushes = 0
+        self.lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # The headers and body are written separately, which would otherwise be held back by Nagle's algorithm
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                with api.lock:
+                    api.pushes += 1
+                content = json.dumps({"success": True, "message": ""}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,4 +1,12 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import patch
+
+import toml
+
 import SeeThru_Feeds.Core.ConfigParser as ConfigParser
 
 
@@ -64,3 +72,94 @@ class TestCoreConfigParser(TestCase):
         self.assertTrue(output["Scripts"]["Google"]["States"]["OK"]["Name"] == "OK")
         self.assertTrue(output["Scripts"]["Google"]["States"]["OK"]["Status"] == "green")
         self.assertTrue(output["Scripts"]["Google"]["States"]["OK"]["Message"] == "Test message")
+
+    def test_config_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "config.toml")
+            config = ConfigParser.Config.new("Snapshot")
+            config.add_script("Google").add_fillable("host", "https://google.com")
+            ConfigParser.ConfigParser.toml(path).set_config(config).save()
+
+            parser = ConfigParser.ConfigParser(path, "toml", use_snapshot=True)
+            self.assertEqual(parser.load().Header.Scheme_Name, "Snapshot")
+            self.assertTrue(parser.snapshot_path.exists())
+
+            # An unchanged config is loaded from the snapshot without being parsed
+            with patch.object(toml, "loads", side_effect=AssertionError("The config was parsed")):
+                config = ConfigParser.ConfigParser(path, "toml", use_snapshot=True).load()
+            self.assertEqual(config.Scripts["Google"].Fillables["host"], "https://google.com")
+
+            # A changed config is parsed again and its snapshot is rebuilt
+            config.Header.Scheme_Name = "Changed"
+            ConfigParser.ConfigParser.toml(path).set_config(config).save()
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(ConfigParser.ConfigParser(path, "toml", use_snapshot=True).load().Header.Scheme_Name,
+                             "Changed")
+            with patch.object(toml, "loads", side_effect=AssertionError("The config was parsed")):
+                config = ConfigParser.ConfigParser(path, "toml", use_snapshot=True).load()
+            self.assertEqual(config.Header.Scheme_Name, "Changed")
+
+    def test_corrupt_snapshot_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "config.json")
+            ConfigParser.ConfigParser.json(path).set_config(ConfigParser.Config.new("Snapshot")).save()
+            parser = ConfigParser.ConfigParser(path, "json", use_snapshot=True)
+            parser.snapshot_path.write_bytes(b"corrupt")
+            self.assertEqual(parser.load().Header.Scheme_Name, "Snapshot")
+            self.assertNotEqual(parser.snapshot_path.read_bytes(), b"corrupt")
+
+    def test_unpicklable_snapshot_isnt_an_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "config.json")
+            ConfigParser.ConfigParser.json(path).set_config(ConfigParser.Config.new("Snapshot")).save()
+            parser = ConfigParser.ConfigParser(path, "json", use_snapshot=True)
+            for error in [pickle.PicklingError("Can't pickle"), TypeError("Can't pickle"),
+                          AttributeError("Can't pickle local object")]:
+                with patch.object(pickle, "dump", side_effect=error):
+                    self.assertEqual(parser.load().Header.Scheme_Name, "Snapshot")
+                self.assertFalse(parser.snapshot_path.exists())
+                # The temporary file of the failed write is removed
+                self.assertEqual(os.listdir(directory), ["config.json"])
+
+    def test_unchanged_config_isnt_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "config.json")
+            parser = ConfigParser.ConfigParser.json(path).set_config(ConfigParser.Config.new("Tracked"))
+            self.assertTrue(parser.save())
+
+            os.utime(path, ns=(0, 0))
+            with ConfigParser.ConfigParser.json(path) as config:
+                self.assertFalse(config.has_changed())
+            self.assertEqual(path.stat().st_mtime_ns, 0)
+            with ConfigParser.ConfigParser.json(path) as config:
+                config.Scripts["Foo"] = ConfigParser.Config.new("").add_script("Foo")
+                config.Scripts["Foo"].add_fillable("host", "example.com")
+                self.assertTrue(config.has_changed())
+            self.assertNotEqual(path.stat().st_mtime_ns, 0)
+            self.assertIn("Foo", ConfigParser.ConfigParser.json(path).load().Scripts)
+
+            # Fillables that are modified in place are detected
+            parser = ConfigParser.ConfigParser.json(path)
+            config = parser.load()
+            config.Scripts["Foo"].Fillables["host"] = "example.org"
+            self.assertTrue(parser.save())
+            self.assertFalse(parser.save())
+            self.assertEqual(os.listdir(directory), ["config.json"])
+
+    def test_save_keeps_permissions_and_cleans_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "config.json")
+            parser = ConfigParser.ConfigParser.json(path).set_config(ConfigParser.Config.new("Saved"))
+            parser.save()
+            os.chmod(path, 0o640)
+            parser.config.Header.Scheme_Name = "Changed"
+            self.assertTrue(parser.save())
+            self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+
+            # A failed save leaves the config file as it was, without a temporary file
+            parser.config.Header.Scheme_Name = "Failed"
+            with patch.object(os, "replace", side_effect=OSError("Disk full")):
+                with self.assertRaises(OSError):
+                    parser.save()
+            self.assertEqual(ConfigParser.ConfigParser.json(path).load().Header.Scheme_Name, "Changed")
+            self.assertEqual(os.listdir(directory), ["config.json"])
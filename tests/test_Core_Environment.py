@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from SeeThru_Feeds.Core.Environment import Resolver, compile_template, get_config_attribute, resolver
+from SeeThru_Feeds.Core.Pusher import FeedPusher
+from SeeThru_Feeds.Core.Runner import SchemeRunner
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+from tests.test_Core_Runner import create_config
+
+
+class EchoScript(ScriptBase):
+    MESSAGE = FillableProperty(name="message", required=True)
+
+    def script_run(self):
+        pass
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message(self.get_property(self.MESSAGE))
+
+
+class TestCoreEnvironment(TestCase):
+    def setUp(self):
+        resolver.refresh()
+
+    def tearDown(self):
+        resolver.refresh()
+
+    def test_compile_template(self):
+        template = compile_template("https://$(HOST):$(PORT)/$(HOST)")
+        self.assertEqual(template.variables, ("HOST", "PORT", "HOST"))
+        self.assertEqual(template.render({"HOST": "example.com", "PORT": "80"}), "https://example.com:80/example.com")
+        self.assertEqual(template.render({}), "https://:/")
+        # Attributes are only compiled once
+        self.assertIs(compile_template("https://$(HOST):$(PORT)/$(HOST)"), template)
+        self.assertEqual(compile_template("plain").render({}), "plain")
+
+        with patch.dict(os.environ, {"SEETHRU_TEST_VALUE": "value"}):
+            self.assertEqual(get_config_attribute("$(SEETHRU_TEST_VALUE)-$(SEETHRU_TEST_MISSING)"), "value-")
+        self.assertEqual(get_config_attribute(5), 5)
+
+    def test_resolver_caches_until_refreshed(self):
+        environ = {"TOKEN": "first"}
+        cache = Resolver(environ)
+        self.assertEqual(cache.resolve("$(TOKEN)"), "first")
+        environ["TOKEN"] = "second"
+        self.assertEqual(cache.resolve("$(TOKEN)"), "first")
+        cache.refresh()
+        self.assertEqual(cache.resolve("$(TOKEN)"), "second")
+        self.assertEqual(cache.generation, 1)
+        self.assertEqual(cache.resolve_mapping({"a": "$(TOKEN)", "b": 1}), {"a": "second", "b": 1})
+
+    def test_resolved_fillables_reach_scripts(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = create_config(output_dir, [("Echo", "tests.test_Core_Environment@EchoScript")])
+            config.Scripts["Echo"].Fillables["message"] = "Hello $(SEETHRU_TEST_NAME)"
+            runner = SchemeRunner(config)
+            with patch.dict(os.environ, {"SEETHRU_TEST_NAME": "World"}), contextlib.redirect_stdout(io.StringIO()):
+                results = runner.run()
+            self.assertEqual(results["Echo"].Message, "Hello World")
+
+    def test_pusher_refreshes_api_keys(self):
+        config = create_config(tempfile.gettempdir(), [])
+        config.add_api_key("Key", "$(SEETHRU_TEST_TOKEN)", "$(SEETHRU_TEST_SECRET)")
+        with patch.dict(os.environ, {"SEETHRU_TEST_TOKEN": "token", "SEETHRU_TEST_SECRET": "secret"}):
+            pusher = FeedPusher(config)
+        feed = pusher.create_feed("guid", "Key", None)
+        self.assertEqual((feed.AccessToken, feed.Secret), ("token", "secret"))
+
+        with patch.dict(os.environ, {"SEETHRU_TEST_TOKEN": "rotated", "SEETHRU_TEST_SECRET": "secret"}):
+            resolver.refresh()
+            feed = pusher.create_feed("guid", "Key", None)
+        self.assertEqual(feed.AccessToken, "rotated")
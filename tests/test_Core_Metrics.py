@@ -0,0 +1,82 @@
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from SeeThru_Feeds.Core.Metrics import (JSONMetricsWriter, PrometheusTextfileWriter, RunMetrics,
+                                        create_metrics_writer)
+from SeeThru_Feeds.Core.Pusher import FeedPusher
+from SeeThru_Feeds.Core.Runner import ProcessSchemeRunner, SchemeRunner
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession
+from tests.test_Core_Runner import create_config
+from tests.test_Model_Feeds import StandInApi, create_result
+
+
+class TestCoreMetrics(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.output_dir.name)
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_runner_times_each_phase(self):
+        config = create_config(self.output_dir.name, [("Sleep", "tests.test_Core_Runner@SleepScript")])
+        config.Scripts["Sleep"].Fillables["duration"] = 0.05
+        metrics = RunMetrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            SchemeRunner(config, metrics=metrics).run()
+
+        phases = metrics.timings()["Sleep"]
+        self.assertEqual(set(phases), {"import", "instantiate", "check_fillables", "run", "evaluate", "export"})
+        self.assertGreaterEqual(phases["run"].wall, 0.05)
+        # Sleeping doesn't use the CPU
+        self.assertLess(phases["run"].cpu, 0.05)
+        self.assertEqual(metrics.slowest(1)[0][0], "Sleep")
+
+    def test_process_runner_merges_metrics(self):
+        config = create_config(self.output_dir.name, [(f"Pid{i}", "tests.test_Core_Runner@PidScript")
+                                                      for i in range(3)])
+        metrics = RunMetrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ProcessSchemeRunner(config, workers=2, metrics=metrics).run()
+        timings = metrics.timings()
+        self.assertEqual(sorted(timings), ["Pid0", "Pid1", "Pid2"])
+        self.assertEqual(timings["Pid0"]["run"].count, 1)
+
+    def test_pusher_times_pushes(self):
+        config = create_config(self.output_dir.name, [("Script", "tests.test_Core_Runner@PidScript")])
+        config.add_api_key("Key", "Access_Token", "Secret")
+        config.add_feed("Feed", "Script", "Key", "guid")
+        metrics = RunMetrics()
+        with StandInApi() as api:
+            session = FeedSession(api_url=api.url)
+            FeedPusher(config, session=session, metrics=metrics).push("Script", create_result())
+            session.close()
+        self.assertEqual(metrics.timings()["Script"]["push"].count, 1)
+
+    def test_writers(self):
+        metrics = RunMetrics()
+        metrics.record('Script "A"', "run", 1.5, 0.25)
+        metrics.record('Script "A"', "run", 0.5, 0.25)
+
+        writer = create_metrics_writer(self.path.joinpath("metrics", "feeds.prom"))
+        self.assertIsInstance(writer, PrometheusTextfileWriter)
+        writer.write(metrics)
+        content = self.path.joinpath("metrics", "feeds.prom").read_text()
+        self.assertIn('seethru_feeds_script_phase_seconds_total{script="Script \\"A\\"",phase="run"} 2.0', content)
+        self.assertIn('seethru_feeds_script_phase_runs_total{script="Script \\"A\\"",phase="run"} 2', content)
+        self.assertIn('seethru_feeds_script_phase_last_cpu_seconds{script="Script \\"A\\"",phase="run"} 0.25', content)
+        self.assertIn("# TYPE seethru_feeds_script_phase_seconds_total counter", content)
+
+        writer = create_metrics_writer(self.path.joinpath("metrics.json"))
+        self.assertIsInstance(writer, JSONMetricsWriter)
+        writer.write(metrics)
+        document = json.loads(self.path.joinpath("metrics.json").read_text())
+        self.assertEqual(document["scripts"]['Script "A"']["run"]["wall_seconds"], 2.0)
+        self.assertEqual(document["scripts"]['Script "A"']["run"]["last_wall_seconds"], 0.5)
+
+        with self.assertRaises(ValueError):
+            create_metrics_writer("metrics", "csv")
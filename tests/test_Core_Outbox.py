@@ -0,0 +1,125 @@
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from SeeThru_Feeds.Core.Outbox import Outbox
+from SeeThru_Feeds.Core.Pusher import FeedPusher
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession
+from tests.test_Core_Runner import create_config
+from tests.test_Model_Feeds import StandInApi, create_result
+
+
+class TestCoreOutbox(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.output_dir.name, ".outbox", "pushes.jsonl")
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_keeps_newest_push_per_feed(self):
+        outbox = Outbox(self.path, base_delay=0)
+        outbox.add("guid", "Key", create_result("green", "First"))
+        outbox.add("guid", "Key", create_result("red", "Second"))
+        outbox.add("other-guid", "Key", create_result())
+        self.assertEqual(len(outbox), 2)
+
+        replayed = []
+        delivered, waiting = outbox.replay(lambda entry: replayed.append(entry) or True)
+        self.assertEqual((delivered, waiting), (2, 0))
+        messages = {entry.guid: entry.result.get_message() for entry in replayed}
+        self.assertEqual(messages, {"guid": "Second", "other-guid": "Message"})
+        self.assertFalse(self.path.exists())
+
+    def test_delivered_drops_pending_push(self):
+        outbox = Outbox(self.path, base_delay=0)
+        outbox.add("guid", "Key", create_result())
+        outbox.delivered("guid")
+        # A feed that isn't waiting doesn't add a record
+        outbox.delivered("other-guid")
+        self.assertEqual(len(self.path.read_text().splitlines()), 2)
+
+        self.assertEqual(len(Outbox(self.path)), 0)
+
+    def test_failed_replay_backs_off(self):
+        outbox = Outbox(self.path, base_delay=0)
+        outbox.add("guid", "Key", create_result())
+        self.assertEqual(outbox.replay(lambda entry: False), (0, 1))
+        record = json.loads(self.path.read_text())
+        self.assertEqual(record["attempts"], 1)
+        self.assertEqual(outbox.replay(lambda entry: None), (0, 0))
+
+        outbox = Outbox(self.path, base_delay=60)
+        outbox.add("guid", "Key", create_result())
+        # The push isn't due until the first delay has passed
+        self.assertEqual(outbox.replay(lambda entry: self.fail("The push isn't due")), (0, 1))
+
+    def test_replay_skips_feeds_pushed_since_read(self):
+        outbox = Outbox(self.path, base_delay=0)
+        outbox.add("guid", "Key", create_result())
+        outbox.add("delivered-guid", "Key", create_result("green", "Old"))
+        outbox.add("failed-guid", "Key", create_result("green", "Old"))
+        replayed = []
+
+        def push(entry):
+            # Newer pushes of the other feeds are made whilst the first is being retried
+            if entry.guid == "guid":
+                outbox.delivered("delivered-guid")
+                outbox.add("failed-guid", "Key", create_result("red", "New"))
+            replayed.append(entry.guid)
+            return True
+
+        self.assertEqual(outbox.replay(push), (1, 1))
+        self.assertEqual(replayed, ["guid"])
+        record = json.loads(self.path.read_text())
+        self.assertEqual((record["guid"], record["message"]), ("failed-guid", "New"))
+
+    def test_skips_partial_record(self):
+        outbox = Outbox(self.path, base_delay=0)
+        outbox.add("guid", "Key", create_result())
+        with self.path.open("a") as file:
+            file.write('{"guid": "partial"')
+        self.assertEqual(len(Outbox(self.path)), 1)
+
+    def test_pusher_retries_failed_push(self):
+        config = create_config(self.output_dir.name, [("Script", "tests.test_Core_Runner@PidScript")])
+        config.add_api_key("Key", "Access_Token", "Secret")
+        config.add_feed("Feed", "Script", "Key", "guid")
+
+        with StandInApi(status_code=500) as api:
+            session = FeedSession(api_url=api.url)
+            pusher = FeedPusher(config, session, Outbox(self.path, base_delay=0))
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(pusher.push_feed(config.Feeds["Feed"], create_result("red", "Down")))
+                self.assertEqual(pusher.retry_outbox(), (0, 1))
+            self.assertEqual(len(pusher.outbox), 1)
+
+            api.status_code = 200
+            self.assertEqual(pusher.retry_outbox(), (1, 0))
+            session.close()
+
+        self.assertEqual(len(api.pushes), 3)
+        path, data = api.pushes[-1]
+        self.assertEqual(path, "/feed/guid/update")
+        self.assertEqual((data["color"], data["message"]), ("red", "Down"))
+        self.assertEqual(len(pusher.outbox), 0)
+
+    def test_unreadable_response_is_retried(self):
+        config = create_config(self.output_dir.name, [("Script", "tests.test_Core_Runner@PidScript")])
+        config.add_api_key("Key", "Access_Token", "Secret")
+        config.add_feed("Feed", "Script", "Key", "guid")
+
+        with StandInApi(content=b"<html>Bad Gateway</html>") as api:
+            session = FeedSession(api_url=api.url)
+            pusher = FeedPusher(config, session, Outbox(self.path, base_delay=0))
+            with contextlib.redirect_stdout(io.StringIO()) as log:
+                self.assertFalse(pusher.push_feed(config.Feeds["Feed"], create_result()))
+            self.assertIn("couldn't be read", log.getvalue())
+            self.assertEqual(len(pusher.outbox), 1)
+
+            api.content = None
+            self.assertEqual(pusher.retry_outbox(), (1, 0))
+            session.close()
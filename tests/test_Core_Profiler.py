@@ -0,0 +1,124 @@
+import contextlib
+import io
+import pstats
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from SeeThru_Feeds.Core.Profiler import MemoryTracker, ProfileEntry, SchemeProfiler, render_table
+from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+from tests.test_Core_Runner import create_config
+
+
+class Allocate(ComponentBase):
+    SIZE = FillableProperty(name="size", required=True)
+    LENGTH = ResultProperty(name="length")
+
+    def component_execute(self):
+        self.set_property(self.LENGTH, len(bytearray(self.get_property(self.SIZE))))
+
+
+class AllocatingScript(ScriptBase):
+    LENGTH = ResultProperty(name="length", default=0)
+
+    def script_run(self):
+        component = Allocate().set_property(Allocate.SIZE, 1024 * 1024).run()
+        self.set_property(self.LENGTH, component.get_property(Allocate.LENGTH))
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message(f"Allocated {self.get_property(self.LENGTH)} bytes")
+
+
+class TestCoreProfiler(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.output_dir.name)
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_deterministic_profile(self):
+        config = create_config(self.output_dir.name, [("Allocating", "tests.test_Core_Profiler@AllocatingScript"),
+                                                      ("Pid", "tests.test_Core_Runner@PidScript")])
+        run = ComponentBase.run
+        with contextlib.redirect_stdout(io.StringIO()):
+            entries = SchemeProfiler(config).run(self.path.joinpath("profile"))
+        entries = {entry.name: entry for entry in entries}
+
+        self.assertEqual(entries["Allocating"].kind, "script")
+        self.assertGreaterEqual(entries["Allocating"].peak, 1024 * 1024)
+        component = entries["tests.test_Core_Profiler.Allocate"]
+        self.assertEqual((component.kind, component.calls), ("component", 1))
+        self.assertGreaterEqual(component.peak, 1024 * 1024)
+        self.assertLessEqual(component.wall, entries["Allocating"].wall)
+        # The components are no longer tracked once profiling has finished
+        self.assertIs(ComponentBase.run, run)
+
+        for name in ["Allocating.prof", "Pid.prof", "scheme.prof"]:
+            pstats.Stats(str(self.path.joinpath("profile", name)))
+        # Outputs are discarded
+        self.assertFalse(self.path.joinpath("Allocating").exists())
+
+    def test_sampling_profile(self):
+        config = create_config(self.output_dir.name, [("Sleep", "tests.test_Core_Runner@SleepScript"),
+                                                      ("Pid", "tests.test_Core_Runner@PidScript")])
+        config.Scripts["Sleep"].Fillables["duration"] = 0.1
+        with contextlib.redirect_stdout(io.StringIO()):
+            entries = SchemeProfiler(config, "sampling", 0.002, memory=False).run(self.path, ["Sleep"])
+        self.assertEqual([entry.name for entry in entries], ["Sleep"])
+        self.assertEqual(entries[0].peak, 0)
+
+        lines = self.path.joinpath("scheme.collapsed").read_text().splitlines()
+        self.assertNotEqual(len(lines), 0)
+        self.assertTrue(any(line.startswith("Sleep;") and "script_run" in line for line in lines))
+        self.assertFalse(self.path.joinpath("scheme.prof").exists())
+
+        with self.assertRaises(ValueError):
+            SchemeProfiler(config, "statistical")
+
+    def test_component_tracking_is_restored(self):
+        run = ComponentBase.run
+        profiler = SchemeProfiler(create_config(self.output_dir.name, []), memory=False)
+        with self.assertRaises(RuntimeError):
+            with profiler.component_tracking():
+                self.assertIsNot(ComponentBase.run, run)
+                # Components ran by other threads aren't measured
+                thread = threading.Thread(target=lambda: Allocate().set_property(Allocate.SIZE, 1).run())
+                thread.start()
+                thread.join()
+                Allocate().set_property(Allocate.SIZE, 1).run()
+                raise RuntimeError("Script failure")
+        self.assertIs(ComponentBase.run, run)
+        self.assertEqual([entry.calls for entry in profiler.components.values()], [1])
+
+    def test_memory_tracker_nests(self):
+        with MemoryTracker() as tracker:
+            tracker.enter()
+            tracker.enter()
+            inner = bytearray(512 * 1024)
+            del inner
+            innerPeak = tracker.exit()
+            outer = bytearray(256 * 1024)
+            outerPeak = tracker.exit()
+            del outer
+        self.assertGreaterEqual(innerPeak, 512 * 1024)
+        # The outer block keeps the peak of the inner block, even though it was reset
+        self.assertGreaterEqual(outerPeak, innerPeak)
+
+    def test_render_table(self):
+        fast = ProfileEntry("Fast", "script")
+        fast.add(2.0, 0.1, 4096)
+        slow = ProfileEntry("Slow", "script")
+        slow.add(1.0, 0.9, 1024)
+        lines = render_table([fast, slow], "cpu").splitlines()
+        self.assertTrue(lines[0].startswith("Name"))
+        self.assertEqual([line.split()[0] for line in lines[1:]], ["Slow", "Fast"])
+        lines = render_table([fast, slow], "memory").splitlines()
+        self.assertEqual([line.split()[0] for line in lines[1:]], ["Fast", "Slow"])
+        self.assertIn("4.0", lines[1])
+        with self.assertRaises(ValueError):
+            render_table([fast], "calls")
@@ -0,0 +1,146 @@
+import contextlib
+import io
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from SeeThru_Feeds.Core.PushState import PushState
+from SeeThru_Feeds.Core.Pusher import FeedPipeline, FeedPusher
+from SeeThru_Feeds.Core.Runner import SchemeRunner
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession
+from tests.test_Core_Runner import create_config
+from tests.test_Model_Feeds import StandInApi, create_result
+
+
+class TestCorePusher(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.config = create_config(self.output_dir.name, [
+            ("Fast", "tests.test_Core_Runner@PidScript"),
+            ("Slow", "tests.test_Core_Runner@SleepScript")
+        ])
+        self.config.Scripts["Slow"].add_fillable("duration", 0.5)
+        self.config.add_api_key("Key", "Access_Token", "Secret")
+        self.config.add_feed("FastFeed", "Fast", "Key", "fast-guid")
+        self.config.add_feed("FastFeed2", "Fast", "Key", "fast-guid-2")
+        self.config.add_feed("SlowFeed", "Slow", "Key", "slow-guid")
+        self.config.add_feed("NoKeyFeed", "Fast", "Missing", "no-key-guid")
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_feeds_for(self):
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            pusher = FeedPusher(self.config)
+        self.assertIn("NoKeyFeed", log.getvalue())
+        self.assertEqual([feed.Guid for feed in pusher.feeds_for("Fast")], ["fast-guid", "fast-guid-2"])
+        self.assertEqual(pusher.feeds_for("Unknown"), [])
+
+    def test_pushes_start_before_scripts_finish(self):
+        with StandInApi() as api:
+            session = FeedSession(api_url=api.url)
+            with contextlib.redirect_stdout(io.StringIO()):
+                pusher = FeedPusher(self.config, session)
+                pushTimes = {}
+                start = time.perf_counter()
+                with FeedPipeline(pusher, uploaders=2) as pipeline:
+                    def on_result(job, result):
+                        pipeline.submit(job.script_name, result)
+                        pushTimes[job.script_name] = time.perf_counter() - start
+
+                    SchemeRunner(self.config, workers=2, on_result=on_result).run()
+            session.close()
+
+        self.assertEqual(sorted(path for path, _ in api.pushes),
+                         ["/feed/fast-guid-2/update", "/feed/fast-guid/update", "/feed/slow-guid/update"])
+        self.assertLess(pushTimes["Fast"], 0.25)
+        self.assertGreaterEqual(pushTimes["Slow"], 0.5)
+
+    def test_pipeline_applies_backpressure(self):
+        with StandInApi() as api:
+            session = FeedSession(api_url=api.url)
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline = FeedPipeline(FeedPusher(self.config, session), uploaders=1, queue_size=1)
+            # Nothing drains the queue until the pipeline is started, so the second feed can't be queued
+            pipeline.submit("Slow", create_result())
+            with self.assertRaises(queue.Full):
+                pipeline._queue.put(None, timeout=0.1)
+            pipeline.start()
+            pipeline.submit("Fast", create_result())
+            pipeline.close()
+            session.close()
+
+        self.assertEqual(len(api.pushes), 3)
+
+    def test_pipeline_survives_failing_pushes(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            pusher = FeedPusher(self.config)
+        pushed = []
+
+        def push_feed(config_feed, result):
+            if config_feed.Guid == "fast-guid":
+                raise ValueError("Malformed response")
+            pushed.append(config_feed.Guid)
+            return True
+
+        pusher.push_feed = push_feed
+
+        def submit_all():
+            with FeedPipeline(pusher, uploaders=1, queue_size=2) as pipeline:
+                for _ in range(3):
+                    pipeline.submit("Fast", create_result())
+                pipeline.submit("Slow", create_result())
+
+        # A dead uploader would leave submit or close blocked on the full queue
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            producer = threading.Thread(target=submit_all, daemon=True)
+            producer.start()
+            producer.join(5)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(pushed, ["fast-guid-2"] * 3 + ["slow-guid"])
+        self.assertIn("fast-guid failed: Malformed response", log.getvalue())
+
+    def test_invalid_uploaders(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            pusher = FeedPusher(self.config)
+        with self.assertRaises(ValueError):
+            FeedPipeline(pusher, uploaders=0)
+
+    def test_changed_policy_skips_unchanged_results(self):
+        statePath = Path(self.output_dir.name, ".pushstate.json")
+        with StandInApi() as api:
+            session = FeedSession(api_url=api.url)
+            with contextlib.redirect_stdout(io.StringIO()):
+                pusher = FeedPusher(self.config, session, push_state=PushState(statePath))
+            feed = self.config.Feeds["FastFeed"]
+            self.assertTrue(pusher.push_feed(feed, create_result("green", "Up")))
+            self.assertTrue(pusher.push_feed(feed, create_result("green", "Up")))
+            self.assertEqual(len(api.pushes), 1)
+            self.assertTrue(pusher.push_feed(feed, create_result("red", "Down")))
+            self.assertEqual(len(api.pushes), 2)
+            pusher.save_state()
+
+            # The state is persisted, and the heartbeat still pushes unchanged results
+            with contextlib.redirect_stdout(io.StringIO()):
+                pusher = FeedPusher(self.config, session, push_state=PushState(statePath))
+            pusher.push_feed(feed, create_result("red", "Down"))
+            self.assertEqual(len(api.pushes), 2)
+            pusher.push_state.heartbeat = 0.05
+            time.sleep(0.05)
+            pusher.push_feed(feed, create_result("red", "Down"))
+            self.assertEqual(len(api.pushes), 3)
+            session.close()
+
+    def test_changed_policy_records_only_delivered_results(self):
+        statePath = Path(self.output_dir.name, ".pushstate.json")
+        with StandInApi(status_code=500) as api:
+            session = FeedSession(api_url=api.url)
+            with contextlib.redirect_stdout(io.StringIO()):
+                pusher = FeedPusher(self.config, session, push_state=PushState(statePath))
+                self.assertFalse(pusher.push_feed(self.config.Feeds["FastFeed"], create_result()))
+                self.assertFalse(pusher.push_feed(self.config.Feeds["FastFeed"], create_result()))
+            session.close()
+        self.assertEqual(len(api.pushes), 2)
@@ -0,0 +1,375 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import SeeThru_Feeds.Core.ConfigParser as ConfigParser
+from SeeThru_Feeds.Core.Runner import AsyncSchemeRunner, ProcessSchemeRunner, SchemeRunner
+from SeeThru_Feeds.Core.WorkerPool import WorkerPool
+from SeeThru_Feeds.Model.Components.AsyncComponentBase import AsyncComponentBase
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+from SeeThru_Feeds.Model.Scripts.AsyncScriptBase import AsyncScriptBase
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+
+
+class SleepScript(ScriptBase):
+    DURATION = FillableProperty(name="duration", default=0.2)
+
+    def script_run(self):
+        time.sleep(self.get_property(self.DURATION))
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message(f"Slept {self.get_property(self.DURATION)}")
+
+
+class AsyncSleep(AsyncComponentBase):
+    DURATION = FillableProperty(name="duration", required=True)
+    SLEPT = ResultProperty(name="slept")
+
+    async def component_execute(self):
+        await asyncio.sleep(self.get_property(self.DURATION))
+        self.set_property(self.SLEPT, True)
+
+
+class AsyncSleepScript(AsyncScriptBase):
+    DURATION = FillableProperty(name="duration", default=0.2)
+    SLEPT = ResultProperty(name="slept", default=False)
+
+    async def script_run(self):
+        component = await AsyncSleep().set_property(AsyncSleep.DURATION, self.get_property(self.DURATION)).run()
+        self.set_property(self.SLEPT, component.get_property(AsyncSleep.SLEPT))
+
+    def script_evaluate(self, result):
+        result.set_status("green" if self.get_property(self.SLEPT) else "red")
+        result.set_message(f"Slept {self.get_property(self.DURATION)}")
+
+
+class FailingScript(ScriptBase):
+    def script_run(self):
+        raise RuntimeError("Script failure")
+
+
+class PidScript(ScriptBase):
+    def script_run(self):
+        pass
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+        result.set_message(str(os.getpid()))
+
+
+class CrashingScript(ScriptBase):
+    def script_run(self):
+        os._exit(1)
+
+
+# Held by a thread of the parent whilst worker processes are started
+held_lock = threading.Lock()
+
+
+def acquire_held_lock():
+    acquired = held_lock.acquire(timeout=1)
+    return acquired, os.environ.get("SEETHRU_WORKER_TEST")
+
+
+def create_config(output_dir, scripts):
+    """
+    Creates a config with a script entry for every (name, object path) pair
+    """
+    config = ConfigParser.Config.new("Runner")
+    for name, object_path in scripts:
+        script = config.add_script(name)
+        script.Meta.Script_Object_Path = object_path
+        script.Meta.Script_Output_Path = str(Path(output_dir).joinpath(name))
+    return config
+
+
+class TestCoreRunner(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_run_in_parallel(self):
+        config = create_config(self.output_dir.name, [
+            (f"Sleep{i}", "tests.test_Core_Runner@SleepScript") for i in range(8)
+        ])
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = SchemeRunner(config, workers=8).run()
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        self.assertEqual(len(results), 8)
+        for i in range(8):
+            self.assertEqual(results[f"Sleep{i}"].get_status(), "green")
+            self.assertTrue(Path(self.output_dir.name).joinpath(f"Sleep{i}").exists())
+
+    def test_log_output_is_grouped(self):
+        config = create_config(self.output_dir.name, [
+            (f"Sleep{i}", "tests.test_Core_Runner@SleepScript") for i in range(4)
+        ])
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            SchemeRunner(config, workers=4).run()
+
+        lines = log.getvalue().splitlines()
+        self.assertEqual(len(lines), 12)
+        for i in range(0, 12, 3):
+            self.assertTrue(lines[i].startswith("--Sleep"))
+            self.assertEqual(lines[i + 1], "Status: green")
+            self.assertTrue(lines[i + 2].startswith("Message: Slept"))
+
+    def test_failing_scripts_are_skipped(self):
+        config = create_config(self.output_dir.name, [
+            ("Sleep", "tests.test_Core_Runner@SleepScript"),
+            ("Failing", "tests.test_Core_Runner@FailingScript"),
+            ("Missing", "tests.test_Core_Runner@MissingScript"),
+            ("Invalid", "tests.test_Core_Runner")
+        ])
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            results = SchemeRunner(config, workers=2).run()
+
+        self.assertEqual(list(results.keys()), ["Sleep"])
+        self.assertIn("Script failure", log.getvalue())
+        self.assertIn("Script could not be imported", log.getvalue())
+
+    def test_run_async(self):
+        config = create_config(self.output_dir.name, [
+            (f"AsyncSleep{i}", "tests.test_Core_Runner@AsyncSleepScript") for i in range(200)
+        ] + [
+            (f"Sleep{i}", "tests.test_Core_Runner@SleepScript") for i in range(4)
+        ])
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = AsyncSchemeRunner(config, workers=4).run()
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        self.assertEqual(len(results), 204)
+        self.assertEqual(results["AsyncSleep0"].get_status(), "green")
+        self.assertEqual(results["AsyncSleep0"].get_message(), "Slept 0.2")
+        self.assertEqual(results["Sleep0"].get_message(), "Slept 0.2")
+
+    def test_run_async_result_handling_doesnt_block(self):
+        config = create_config(self.output_dir.name, [
+            ("Quick", "tests.test_Core_Runner@AsyncSleepScript"),
+            ("Slow", "tests.test_Core_Runner@AsyncSleepScript")
+        ])
+        config.Scripts["Quick"].Fillables["duration"] = 0
+        config.Scripts["Slow"].Fillables["duration"] = 0.2
+        config.Scripts["Slow"].Meta.Script_Timeout = 0.4
+
+        def on_result(job, result):
+            # Stands in for a full push queue
+            if job.script_name == "Quick":
+                time.sleep(1)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = AsyncSchemeRunner(config, on_result=on_result).run()
+        self.assertEqual(results["Slow"].Status, "green")
+
+    def test_run_async_concurrency(self):
+        config = create_config(self.output_dir.name, [
+            (f"AsyncSleep{i}", "tests.test_Core_Runner@AsyncSleepScript") for i in range(4)
+        ])
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = AsyncSchemeRunner(config, concurrency=2).run()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.4)
+        self.assertEqual(len(results), 4)
+
+    def test_fillables_are_checked_once(self):
+        config = create_config(self.output_dir.name, [
+            ("Sleep", "tests.test_Core_Runner@SleepScript"),
+            ("AsyncSleep", "tests.test_Core_Runner@AsyncSleepScript")
+        ])
+        for name in config.Scripts:
+            config.Scripts[name].Fillables["duration"] = 0
+
+        with patch.object(ScriptBase, "check_fillables", autospec=True, return_value=True) as check_fillables:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = AsyncSchemeRunner(config).run()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(sorted(type(call.args[0]).__name__ for call in check_fillables.call_args_list),
+                         ["AsyncSleepScript", "SleepScript"])
+
+    def test_async_script_run_synchronously(self):
+        script = AsyncSleepScript().run_script().evaluate_script()
+        self.assertEqual(script.get_result().get_status(), "green")
+
+    def test_run_in_processes(self):
+        config = create_config(self.output_dir.name, [
+            (f"Pid{i}", "tests.test_Core_Runner@PidScript") for i in range(6)
+        ])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = ProcessSchemeRunner(config, workers=2).run()
+
+        self.assertEqual(len(results), 6)
+        pids = {result.get_message() for result in results.values()}
+        self.assertNotIn(str(os.getpid()), pids)
+        self.assertLessEqual(len(pids), 2)
+        self.assertIsNotNone(results["Pid0"].get_timestamp())
+
+    def test_workers_are_recycled(self):
+        config = create_config(self.output_dir.name, [
+            (f"Pid{i}", "tests.test_Core_Runner@PidScript") for i in range(6)
+        ])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = ProcessSchemeRunner(config, workers=1, max_scripts_per_worker=2).run()
+
+        pids = [results[f"Pid{i}"].get_message() for i in range(6)]
+        self.assertEqual(len(set(pids)), 3)
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+
+    def test_crashing_worker_is_replaced(self):
+        config = create_config(self.output_dir.name, [
+            ("Crashing", "tests.test_Core_Runner@CrashingScript"),
+            ("Pid0", "tests.test_Core_Runner@PidScript"),
+            ("Failing", "tests.test_Core_Runner@FailingScript"),
+            ("Pid1", "tests.test_Core_Runner@PidScript")
+        ])
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            results = ProcessSchemeRunner(config, workers=1).run()
+
+        self.assertEqual(sorted(results.keys()), ["Pid0", "Pid1"])
+        self.assertIn("exited unexpectedly with code 1", log.getvalue())
+        self.assertIn("Script failure", log.getvalue())
+
+    def test_workers_dont_inherit_held_locks(self):
+        released = threading.Event()
+        holding = threading.Event()
+
+        def hold():
+            with held_lock:
+                holding.set()
+                released.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait()
+        os.environ["SEETHRU_WORKER_TEST"] = "set"
+        try:
+            with WorkerPool(1) as pool:
+                self.assertEqual(pool.map(acquire_held_lock, [()]), [(True, "set")])
+        finally:
+            del os.environ["SEETHRU_WORKER_TEST"]
+            released.set()
+            thread.join()
+
+    def test_invalid_workers(self):
+        config = ConfigParser.Config.new("Runner")
+        with self.assertRaises(ValueError):
+            SchemeRunner(config, workers=0)
+
+    def test_header_run_workers(self):
+        config = ConfigParser.Config.new("Runner")
+        self.assertNotIn("Run_Workers", config.dump()["Header"])
+
+        config.Header.Run_Workers = 4
+        output = config.dump()
+        self.assertEqual(output["Header"]["Run_Workers"], 4)
+        self.assertEqual(ConfigParser.Config.load(output).Header.Run_Workers, 4)
+
+        output["Header"]["Run_Workers"] = 0
+        with self.assertRaises(ConfigParser.ConfigExceptions.HeaderException):
+            ConfigParser.Config.load(output)
+
+    def test_script_timeout(self):
+        config = create_config(self.output_dir.name, [
+            ("Hung", "tests.test_Core_Runner@SleepScript"),
+            ("Quick", "tests.test_Core_Runner@SleepScript")
+        ])
+        config.Scripts["Hung"].Fillables["duration"] = 5
+        config.Scripts["Hung"].Meta.Script_Timeout = 0.2
+        config.Scripts["Quick"].Meta.Script_Timeout = 2
+
+        log = io.StringIO()
+        start = time.monotonic()
+        with contextlib.redirect_stdout(log):
+            results = SchemeRunner(config, workers=2).run()
+        self.assertLess(time.monotonic() - start, 2)
+
+        self.assertEqual((results["Hung"].Status, results["Hung"].Message), ("amber", "Check timed out"))
+        self.assertEqual(results["Quick"].Status, "green")
+        self.assertIn("Script timed out after 0.2 seconds", log.getvalue())
+        self.assertIn('"Check timed out"', Path(self.output_dir.name, "Hung").read_text())
+
+    def test_run_deadline(self):
+        config = create_config(self.output_dir.name, [(f"Sleep{i}", "tests.test_Core_Runner@SleepScript")
+                                                      for i in range(3)])
+        for script in config.Scripts.values():
+            script.Fillables["duration"] = 0.5
+        config.Header.Timeout_Status = "red"
+        config.Header.Timeout_Message = "Timed out"
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            results = SchemeRunner(config, workers=1, deadline=0.7).run()
+        self.assertEqual(results["Sleep0"].Status, "green")
+        self.assertEqual((results["Sleep1"].Status, results["Sleep1"].Message), ("red", "Timed out"))
+        self.assertEqual(results["Sleep2"].Status, "red")
+        self.assertIn("deadline passed", results["Sleep2"].Message)
+        self.assertIn("Script skipped, the run deadline passed before it started", log.getvalue())
+
+    def test_async_script_timeout(self):
+        config = create_config(self.output_dir.name, [("Async", "tests.test_Core_Runner@AsyncSleepScript")])
+        config.Scripts["Async"].Fillables["duration"] = 5
+        config.Scripts["Async"].Meta.Script_Timeout = 0.2
+
+        start = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = AsyncSchemeRunner(config).run()
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(results["Async"].Message, "Check timed out")
+
+    def test_process_timeout_kills_worker(self):
+        config = create_config(self.output_dir.name, [
+            ("Hung", "tests.test_Core_Runner@SleepScript"),
+            ("Pid", "tests.test_Core_Runner@PidScript")
+        ])
+        config.Scripts["Hung"].Fillables["duration"] = 5
+        config.Scripts["Hung"].Meta.Script_Timeout = 0.2
+
+        start = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = ProcessSchemeRunner(config, workers=1).run()
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(results["Hung"].Message, "Check timed out")
+        self.assertEqual(results["Pid"].Status, "green")
+
+    def test_timeout_settings(self):
+        config = ConfigParser.Config.new("Runner")
+        script = config.add_script("Script")
+        script.Meta.Script_Timeout = 10
+        config.Header.Run_Deadline = 50
+        config.Header.Timeout_Status = "red"
+        output = config.dump()
+        loaded = ConfigParser.Config.load(output)
+        self.assertEqual(loaded.Scripts["Script"].Meta.Script_Timeout, 10)
+        self.assertEqual((loaded.Header.Run_Deadline, loaded.Header.Timeout_Status), (50, "red"))
+
+        output["Header"]["Timeout_Status"] = "green"
+        with self.assertRaises(ConfigParser.ConfigExceptions.HeaderException):
+            ConfigParser.Config.load(output)
+        output["Header"]["Timeout_Status"] = "red"
+        output["Scripts"]["Script"]["Meta"]["Script_Timeout"] = -1
+        with self.assertRaises(ConfigParser.ConfigExceptions.ScriptMetaException):
+            ConfigParser.Config.load(output)
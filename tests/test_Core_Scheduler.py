@@ -0,0 +1,102 @@
+import contextlib
+import io
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+import SeeThru_Feeds.Core.ConfigParser as ConfigParser
+from SeeThru_Feeds.Core.Scheduler import SchemeScheduler
+from SeeThru_Feeds.Model.Scripts.ScriptBase import ScriptBase
+from tests.test_Core_Runner import create_config
+
+# Holds every run of the HungScript until it is set
+release = threading.Event()
+
+
+class HungScript(ScriptBase):
+    def script_run(self):
+        release.wait()
+
+    def script_evaluate(self, result):
+        result.set_status("green")
+
+
+class TestCoreScheduler(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_scripts_run_on_their_interval(self):
+        config = create_config(self.output_dir.name, [
+            ("Fast", "tests.test_Core_Runner@PidScript"),
+            ("Slow", "tests.test_Core_Runner@PidScript"),
+            ("Missing", "tests.test_Core_Runner@MissingScript")
+        ])
+        config.Scripts["Fast"].Meta.Script_Interval = 0.05
+
+        runs = {"Fast": 0, "Slow": 0}
+        lock = threading.Lock()
+
+        def on_result(job, result):
+            with lock:
+                runs[job.script_name] += 1
+
+        scheduler = SchemeScheduler(config, workers=2, default_interval=10, on_result=on_result)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.load()
+            self.assertEqual([job.script_name for job in scheduler.jobs], ["Fast", "Slow"])
+
+            timer = threading.Timer(0.5, scheduler.stop)
+            timer.start()
+            start = time.perf_counter()
+            scheduler.run()
+            timer.join()
+        self.assertLess(time.perf_counter() - start, 2)
+
+        self.assertEqual(runs["Slow"], 1)
+        self.assertGreaterEqual(runs["Fast"], 5)
+
+    def test_timed_out_script_is_not_restarted(self):
+        config = create_config(self.output_dir.name, [("Stuck", "tests.test_Core_Scheduler@HungScript")])
+        config.Scripts["Stuck"].Meta.Script_Interval = 0.05
+        config.Scripts["Stuck"].Meta.Script_Timeout = 0.05
+
+        results = []
+        threadCounts = []
+
+        def on_result(job, result):
+            results.append(result)
+            threadCounts.append(sum(thread.name == "Script-Stuck" for thread in threading.enumerate()))
+
+        scheduler = SchemeScheduler(config, on_result=on_result)
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                timer = threading.Timer(0.6, scheduler.stop)
+                timer.start()
+                scheduler.run()
+                timer.join()
+        finally:
+            release.set()
+
+        self.assertGreaterEqual(len(results), 4)
+        self.assertEqual(max(threadCounts), 1)
+        self.assertEqual({(result.Status, result.Message) for result in results}, {("amber", "Check timed out")})
+        self.assertIn("its previous run timed out and is still running", log.getvalue())
+
+    def test_meta_interval(self):
+        config = ConfigParser.Config.new("Scheduler")
+        script = config.add_script("Foo")
+        self.assertNotIn("Script_Interval", config.dump()["Scripts"]["Foo"]["Meta"])
+
+        script.Meta.Script_Interval = 30
+        output = config.dump()
+        self.assertEqual(output["Scripts"]["Foo"]["Meta"]["Script_Interval"], 30)
+        self.assertEqual(ConfigParser.Config.load(output).Scripts["Foo"].Meta.Script_Interval, 30)
+
+        output["Scripts"]["Foo"]["Meta"]["Script_Interval"] = -1
+        with self.assertRaises(ConfigParser.ConfigExceptions.ScriptMetaException):
+            ConfigParser.Config.load(output)
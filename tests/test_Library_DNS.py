@@ -0,0 +1,94 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from SeeThru_Feeds.Library.Components.DNS import DNSCache
+
+
+class StandInResolver:
+    """
+    Stands in for socket.getaddrinfo, answering every host but those given as failing
+    """
+    def __init__(self, failures=None, delay=0):
+        self.calls = 0
+        self.failures = failures if failures is not None else {}
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if host in self.failures:
+            raise socket.gaierror(self.failures[host], "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port or 0))]
+
+
+class TestLibraryDNS(TestCase):
+    def test_hits_and_ports(self):
+        resolver = StandInResolver()
+        cache = DNSCache()
+        with patch("socket.getaddrinfo", resolver):
+            self.assertEqual(cache.getaddrinfo("Example.com", 443)[0][4], ("10.0.0.1", 443))
+            self.assertEqual(cache.getaddrinfo("example.com", 80)[0][4], ("10.0.0.1", 80))
+        self.assertEqual(resolver.calls, 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_ttl_and_eviction(self):
+        resolver = StandInResolver()
+        cache = DNSCache(ttl=0.05, max_entries=2)
+        with patch("socket.getaddrinfo", resolver):
+            cache.getaddrinfo("a.example.com")
+            time.sleep(0.06)
+            cache.getaddrinfo("a.example.com")
+            self.assertEqual(cache.stats()["expired"], 1)
+
+            cache.getaddrinfo("b.example.com")
+            cache.getaddrinfo("c.example.com")
+        self.assertEqual(resolver.calls, 4)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_negative_caching(self):
+        resolver = StandInResolver({"missing.example.com": socket.EAI_NONAME, "flaky.example.com": socket.EAI_AGAIN})
+        cache = DNSCache(negative_ttl=60)
+        with patch("socket.getaddrinfo", resolver):
+            for _ in range(3):
+                with self.assertRaises(socket.gaierror):
+                    cache.getaddrinfo("missing.example.com")
+            self.assertEqual(resolver.calls, 1)
+            self.assertEqual(cache.stats()["negative_hits"], 2)
+
+            # Temporary failures are never cached
+            for _ in range(2):
+                with self.assertRaises(socket.gaierror):
+                    cache.getaddrinfo("flaky.example.com")
+            self.assertEqual(resolver.calls, 3)
+
+    def test_concurrent_lookups_are_shared(self):
+        resolver = StandInResolver(delay=0.05)
+        cache = DNSCache()
+        with patch("socket.getaddrinfo", resolver):
+            threads = [threading.Thread(target=cache.getaddrinfo, args=("example.com", 443)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(resolver.calls, 1)
+        self.assertEqual(cache.stats()["hits"], 7)
+
+    def test_async_lookups(self):
+        resolver = StandInResolver()
+        cache = DNSCache()
+
+        async def lookups():
+            return [await cache.getaddrinfo_async("example.com", 22) for _ in range(3)]
+
+        with patch("socket.getaddrinfo", resolver):
+            results = asyncio.run(lookups())
+        self.assertEqual(resolver.calls, 1)
+        self.assertEqual(results[2][0][4], ("10.0.0.1", 22))
@@ -0,0 +1,239 @@
+import hashlib
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+import requests
+
+from SeeThru_Feeds.Library.Components.DNS import dns_cache
+from SeeThru_Feeds.Library.Components.HTTP import HTTPGet, HTTPPost, HTTPSessionRegistry, http_sessions, \
+    record_request_timings
+from SeeThru_Feeds.Model.Properties.Exceptions import PropertyValidatorError
+
+LARGE_BODY = b"a" * (64 * 1024 - 3) + b"needle" + b"b" * (1024 * 1024)
+
+
+class StandInSite:
+    """
+    A local site which sets a cookie on every response, a request to /slow waits before responding
+    and /large responds with a megabyte body with a needle across the first two chunks of a streamed read
+    """
+    def __init__(self, certificate=None):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self, content):
+                if self.path == "/slow":
+                    time.sleep(0.5)
+                self.send_response(200)
+                self.send_header("Set-Cookie", "visited=1")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                if self.path == "/large":
+                    self.respond(LARGE_BODY)
+                    return
+                self.respond(self.headers.get("Cookie", "").encode())
+
+            def do_POST(self):
+                self.respond(self.rfile.read(int(self.headers["Content-Length"])))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        # Timed out and truncated requests close their connection before the response is written
+        self.server.handle_error = lambda request, client_address: None
+        self.url = f"http://localhost:{self.server.server_address[1]}"
+        if certificate is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certificate)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.url = self.url.replace("http://", "https://")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestLibraryHTTP(TestCase):
+    def tearDown(self):
+        http_sessions.close()
+
+    def test_connections_are_reused(self):
+        with StandInSite() as site:
+            for _ in range(4):
+                component = HTTPGet().set_property(HTTPGet.URL, site.url + "/").run()
+                # Cookies set by earlier checks aren't sent
+                self.assertEqual(component.get_property(HTTPGet.RESPONSE_CONTENT), "")
+            self.assertEqual(component.get_property(HTTPGet.COOKIES)["visited"], "1")
+            component = HTTPPost().set_property(HTTPPost.URL, site.url + "/").set_property(HTTPPost.DATA, "a=1").run()
+            self.assertEqual(component.get_property(HTTPPost.RESPONSE_CONTENT), "a=1")
+
+            stats = http_sessions.stats()
+            host = HTTPSessionRegistry.host_key(site.url)
+            self.assertEqual((stats[host]["requests"], stats[host]["connections"]), (5, 1))
+            self.assertEqual(stats[host]["reuse_ratio"], 0.8)
+            self.assertEqual(stats["total"]["open_connections"], 1)
+
+    def test_threads_have_their_own_sessions(self):
+        with StandInSite() as site:
+            url = site.url + "/"
+            http_sessions.request("GET", url).close()
+            session = http_sessions.session_for(url)
+            self.assertIs(http_sessions.session_for(url), session)
+
+            # Each thread has its own session, but the connection made by this thread is reused by the others
+            sessions, errors = [], []
+
+            def check():
+                try:
+                    sessions.append(http_sessions.session_for(url))
+                    for _ in range(5):
+                        self.assertEqual(http_sessions.request("GET", url).status_code, 200)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=check) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(len({id(threadSession) for threadSession in sessions + [session]}), 5)
+            stats = http_sessions.stats()[HTTPSessionRegistry.host_key(site.url)]
+            self.assertEqual(stats["requests"], 21)
+            self.assertLessEqual(stats["connections"], 4)
+
+            # Closing the registry replaces the sessions of every thread
+            http_sessions.close()
+            self.assertIsNot(http_sessions.session_for(url), session)
+
+    def test_connects_to_each_resolved_address(self):
+        with StandInSite() as site:
+            port = site.server.server_address[1]
+            # Nothing listens on the first address, so the connection falls back to the second
+            addresses = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", port)),
+                         (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+            with patch.object(dns_cache, "getaddrinfo", return_value=addresses) as getaddrinfo:
+                component = HTTPGet().set_property(HTTPGet.URL, site.url + "/").run()
+            getaddrinfo.assert_called_once_with("localhost", port, 0, socket.SOCK_STREAM)
+            self.assertEqual(component.get_property(HTTPGet.STATUS_CODE), 200)
+
+            with patch.object(dns_cache, "getaddrinfo", return_value=addresses[:1]):
+                with self.assertRaises(requests.exceptions.ConnectionError):
+                    HTTPGet().set_property(HTTPGet.URL, site.url.replace("localhost", "127.0.0.1") + "/").run()
+
+    def test_timeouts(self):
+        registry = HTTPSessionRegistry(timeout=5)
+        with StandInSite() as site:
+            registry.configure_host(site.url, timeout=(1, 0.1))
+            self.assertEqual(registry.timeout_for(site.url + "/slow"), (1, 0.1))
+            self.assertEqual(registry.timeout_for("https://example.com"), 5)
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                registry.request("GET", site.url + "/slow")
+
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                HTTPGet().set_property(HTTPGet.URL, site.url + "/slow").set_property(HTTPGet.TIMEOUT, [1, 0.1]).run()
+        registry.close()
+
+        with self.assertRaises(ValueError):
+            HTTPSessionRegistry(pool_size=0)
+        with self.assertRaises(ValueError):
+            registry.configure(timeout=-1)
+
+    def test_streaming(self):
+        with StandInSite() as site:
+            component = HTTPGet()\
+                .set_property(HTTPGet.URL, site.url + "/large")\
+                .set_property(HTTPGet.STREAM, True)\
+                .set_property(HTTPGet.MAX_BYTES, 256 * 1024)\
+                .set_property(HTTPGet.HASH_ALGORITHM, "sha256")\
+                .set_property(HTTPGet.PATTERN, "ne+dle")\
+                .run()
+            self.assertEqual(component.get_property(HTTPGet.STATUS_CODE), 200)
+            self.assertEqual(component.get_property(HTTPGet.RESPONSE_HEADERS)["Content-Length"], str(len(LARGE_BODY)))
+            self.assertIsNone(component.get_property(HTTPGet.RESPONSE))
+            self.assertIsNone(component.get_property(HTTPGet.RESPONSE_CONTENT))
+            self.assertEqual(component.get_property(HTTPGet.BYTES_READ), 256 * 1024)
+            self.assertTrue(component.get_property(HTTPGet.TRUNCATED))
+            self.assertEqual(component.get_property(HTTPGet.BODY_HASH),
+                             hashlib.sha256(LARGE_BODY[:256 * 1024]).hexdigest())
+            self.assertTrue(component.get_property(HTTPGet.PATTERN_MATCHED))
+            # A new connection was made, plain http has no tls phase
+            self.assertIsNotNone(component.get_property(HTTPGet.DNS_TIME))
+            self.assertIsNotNone(component.get_property(HTTPGet.CONNECT_TIME))
+            self.assertIsNone(component.get_property(HTTPGet.TLS_TIME))
+            self.assertLessEqual(component.get_property(HTTPGet.TTFB_TIME), component.get_property(HTTPGet.TOTAL_TIME))
+
+            # Without an overlap the needle split across chunks isn't found
+            component = HTTPGet()\
+                .set_property(HTTPGet.URL, site.url + "/large")\
+                .set_property(HTTPGet.STREAM, True)\
+                .set_property(HTTPGet.PATTERN, "needle")\
+                .set_property(HTTPGet.PATTERN_OVERLAP, 0)\
+                .run()
+            self.assertFalse(component.get_property(HTTPGet.PATTERN_MATCHED))
+            self.assertIsNone(component.get_property(HTTPGet.BODY_HASH))
+
+            # Without a limit the whole body is streamed, and the default overlap finds the needle
+            component = HTTPGet()\
+                .set_property(HTTPGet.URL, site.url + "/large")\
+                .set_property(HTTPGet.STREAM, True)\
+                .set_property(HTTPGet.MAX_BYTES, None)\
+                .set_property(HTTPGet.PATTERN, "needle")\
+                .set_property(HTTPGet.PATTERN_OVERLAP, None)\
+                .run()
+            self.assertEqual(component.get_property(HTTPGet.BYTES_READ), len(LARGE_BODY))
+            self.assertFalse(component.get_property(HTTPGet.TRUNCATED))
+            self.assertTrue(component.get_property(HTTPGet.PATTERN_MATCHED))
+
+            for prop, value in [(HTTPGet.MAX_BYTES, 0), (HTTPGet.PATTERN_OVERLAP, -1)]:
+                with self.assertRaises(PropertyValidatorError):
+                    HTTPGet().set_property(HTTPGet.URL, site.url + "/").set_property(prop, value).run()
+
+            # A read body is kept and the pooled connection is reused
+            HTTPGet().set_property(HTTPGet.URL, site.url + "/").run()
+            component = HTTPGet().set_property(HTTPGet.URL, site.url + "/large").run()
+            self.assertEqual(component.get_property(HTTPGet.BYTES_READ), len(LARGE_BODY))
+            self.assertFalse(component.get_property(HTTPGet.TRUNCATED))
+            self.assertEqual(len(component.get_property(HTTPGet.RESPONSE_CONTENT)), len(LARGE_BODY))
+            self.assertEqual(component.get_property(HTTPGet.RESPONSE).status_code, 200)
+            self.assertIsNone(component.get_property(HTTPGet.CONNECT_TIME))
+
+    @skipIf(shutil.which("openssl") is None, "openssl is needed to create a certificate")
+    def test_tls_timing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            certificate = Path(directory, "localhost.pem")
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj",
+                            "/CN=localhost", "-keyout", str(certificate), "-out", str(certificate)],
+                           check=True, capture_output=True)
+            with StandInSite(str(certificate)) as site, warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                with record_request_timings() as timings:
+                    http_sessions.request("GET", site.url + "/", verify=False).close()
+                self.assertIsNotNone(timings.connect)
+                self.assertGreater(timings.tls, 0)
+
+                # A reused connection has no handshake
+                with record_request_timings() as timings:
+                    http_sessions.request("GET", site.url + "/", verify=False).close()
+                self.assertIsNone(timings.connect)
+                self.assertIsNone(timings.tls)
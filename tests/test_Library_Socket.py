@@ -0,0 +1,89 @@
+import asyncio
+import socket
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from SeeThru_Feeds.Library.Components.DNS import dns_cache
+from SeeThru_Feeds.Library.Components.Socket import AsyncBatchPortProbe, AsyncPortOpen, BatchPortProbe, PortOpen, \
+    parse_target
+from SeeThru_Feeds.Model.Properties.Exceptions import PropertyValidatorError
+
+
+class TestLibrarySocket(TestCase):
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        # The connections are never accepted, so the backlog must hold every probe
+        self.server.listen(256)
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_parse_target(self):
+        self.assertEqual(parse_target("example.com:443"), ("example.com", 443))
+        self.assertEqual(parse_target("[::1]:22"), ("::1", 22))
+        self.assertEqual(parse_target(["10.0.0.1", "80"]), ("10.0.0.1", 80))
+        for target in ["example.com", ":80", "example.com:0", ["example.com"], ("example.com", "http")]:
+            with self.assertRaises(ValueError):
+                parse_target(target)
+        with self.assertRaises(PropertyValidatorError):
+            BatchPortProbe().set_property(BatchPortProbe.TARGETS, ["example.com"]).run()
+
+    def test_tcp_probe(self):
+        # Port 1 is assumed to have nothing listening on it
+        targets = [f"127.0.0.1:{self.port}", ["127.0.0.1", 1], "host.invalid:80"]
+        component = BatchPortProbe().set_property(BatchPortProbe.TARGETS, targets).run()
+        results = component.get_property(BatchPortProbe.RESULTS)
+
+        self.assertEqual([result["state"] for result in results], ["open", "closed", "unresolved"])
+        self.assertGreater(results[0]["latency"], 0)
+        self.assertIsNone(results[2]["latency"])
+        self.assertEqual(component.get_property(BatchPortProbe.OPEN), [f"127.0.0.1:{self.port}"])
+
+    def test_many_targets_probed_concurrently(self):
+        targets = [f"127.0.0.1:{self.port}"] * 200
+        component = AsyncBatchPortProbe()\
+            .set_property(AsyncBatchPortProbe.TARGETS, targets)\
+            .set_property(AsyncBatchPortProbe.CONCURRENCY, 50)
+        asyncio.run(component.run())
+        self.assertEqual(len(component.get_property(AsyncBatchPortProbe.OPEN)), 200)
+
+    def test_udp_probe(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+
+        def echo():
+            data, address = server.recvfrom(1024)
+            server.sendto(data, address)
+        thread = threading.Thread(target=echo, daemon=True)
+        thread.start()
+
+        targets = [f"127.0.0.1:{server.getsockname()[1]}", "127.0.0.1:1"]
+        component = BatchPortProbe()\
+            .set_property(BatchPortProbe.TARGETS, targets)\
+            .set_property(BatchPortProbe.PROTOCOL, "udp")\
+            .set_property(BatchPortProbe.TIMEOUT, 1)\
+            .run()
+        thread.join()
+        server.close()
+        self.assertEqual([result["state"] for result in component.get_property(BatchPortProbe.RESULTS)],
+                         ["open", "closed"])
+
+    def test_port_open_tries_every_address(self):
+        # Nothing listens on the first address, the host is only reachable on its second
+        addresses = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", self.port)),
+                     (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", self.port))]
+        with patch.object(dns_cache, "getaddrinfo", return_value=addresses):
+            component = PortOpen().set_property(PortOpen.TARGET_HOST, "example.com")\
+                .set_property(PortOpen.PORT, self.port).run()
+            self.assertTrue(component.get_property(PortOpen.SUCCEEDED))
+            component = asyncio.run(AsyncPortOpen().set_property(AsyncPortOpen.TARGET_HOST, "example.com")
+                                    .set_property(AsyncPortOpen.PORT, self.port).run())
+            self.assertTrue(component.get_property(AsyncPortOpen.SUCCEEDED))
+
+        with patch.object(dns_cache, "getaddrinfo", return_value=addresses[:1]):
+            component = PortOpen().set_property(PortOpen.TARGET_HOST, "example.com")\
+                .set_property(PortOpen.PORT, self.port).run()
+            self.assertFalse(component.get_property(PortOpen.SUCCEEDED))
@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from urllib.parse import parse_qs
+
+from SeeThru_Feeds.Model.Feeds.Feed import Feed
+from SeeThru_Feeds.Model.Feeds.Session import FeedSession
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult
+
+
+class StandInApi:
+    """
+    A local stand-in for the feed api, it records every push and the client port that it came from
+    """
+    def __init__(self, status_code=200, content=None):
+        self.status_code = status_code
+        self.content = content
+        self.pushes = []
+        self.client_ports = set()
+        self.lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with api.lock:
+                    api.pushes.append((self.path, {key: value[0] for key, value in parse_qs(body.decode()).items()}))
+                    api.client_ports.add(self.client_address[1])
+                content = api.content if api.content is not None else \
+                    json.dumps({"success": True, "message": ""}).encode()
+                self.send_response(api.status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def create_result(status="green", message="Message"):
+    return ScriptResult().set_status(status).set_message(message).generate_timestamp()
+
+
+class TestModelFeeds(TestCase):
+    def test_push_reuses_connections(self):
+        with StandInApi() as api:
+            session = FeedSession(pool_size=2, api_url=api.url)
+            for i in range(5):
+                feed = Feed()
+                feed.set_guid(f"guid{i}")
+                feed.set_api_key("Access_Token", "Secret")
+                feed.set_script_result(create_result())
+                feed.set_session(session)
+                self.assertEqual(feed.push(), "")
+            session.close()
+
+        self.assertEqual(len(api.pushes), 5)
+        self.assertEqual(len(api.client_ports), 1)
+        path, data = api.pushes[0]
+        self.assertEqual(path, "/feed/guid0/update")
+        self.assertEqual(data["color"], "green")
+        self.assertEqual(data["message"], "Message")
+
+    def test_push_failure(self):
+        with StandInApi(status_code=500) as api:
+            session = FeedSession(api_url=api.url)
+            feed = Feed()
+            feed.set_guid("guid")
+            feed.set_api_key("Access_Token", "Secret")
+            feed.set_script_result(create_result())
+            feed.set_session(session)
+            self.assertFalse(feed.push())
+            session.close()
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            FeedSession(pool_size=0)
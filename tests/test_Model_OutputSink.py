@@ -0,0 +1,71 @@
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from SeeThru_Feeds.Core.Runner import ProcessSchemeRunner, SchemeRunner
+from SeeThru_Feeds.Model.Scripts.OutputSink import FileSink, NDJSONSink, SegmentedLogSink, create_sink
+from tests.test_Core_Runner import create_config
+
+
+class TestModelOutputSink(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.output_dir.name)
+        self.config = create_config(self.output_dir.name, [
+            (f"Pid{i}", "tests.test_Core_Runner@PidScript") for i in range(4)
+        ])
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def test_file_sink_writes_on_flush(self):
+        sink = FileSink()
+        sink.write("Script", str(self.path.joinpath("Outputs", "Script")), '{"color":"green"}')
+        sink.write("Script", str(self.path.joinpath("Outputs", "Script")), '{"color":"red"}')
+        self.assertFalse(self.path.joinpath("Outputs").exists())
+        sink.flush()
+        self.assertEqual(self.path.joinpath("Outputs", "Script").read_text(), '{"color":"red"}')
+        self.assertEqual(list(self.path.joinpath("Outputs").iterdir()), [self.path.joinpath("Outputs", "Script")])
+
+    def test_runner_flushes_ndjson_once(self):
+        sink = NDJSONSink(self.path.joinpath("results.ndjson"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            SchemeRunner(self.config, workers=2, sink=sink).run()
+
+        lines = [json.loads(line) for line in self.path.joinpath("results.ndjson").read_text().splitlines()]
+        self.assertEqual(sorted(line["script"] for line in lines), ["Pid0", "Pid1", "Pid2", "Pid3"])
+        self.assertEqual(lines[0]["result"]["color"], "green")
+        self.assertFalse(self.path.joinpath("Pid0").exists())
+
+    def test_process_outputs_are_written_by_parent(self):
+        sink = NDJSONSink(self.path.joinpath("results.ndjson"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            ProcessSchemeRunner(self.config, workers=2, sink=sink).run()
+        self.assertEqual(len(self.path.joinpath("results.ndjson").read_text().splitlines()), 4)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ProcessSchemeRunner(self.config, workers=2).run()
+        self.assertTrue(self.path.joinpath("Pid0").exists())
+
+    def test_segmented_log_rotates(self):
+        sink = SegmentedLogSink(self.path.joinpath("log"), segment_size=100)
+        for i in range(3):
+            sink.write(f"Script{i}", f"Outputs/Script{i}", '{"color":"green","Message":"' + "x" * 80 + '"}')
+            sink.flush()
+        segments = sorted(path.name for path in self.path.joinpath("log").iterdir())
+        self.assertEqual(segments, ["segment-00000001.ndjson", "segment-00000002.ndjson", "segment-00000003.ndjson"])
+
+        # Appending continues from the newest segment
+        sink = SegmentedLogSink(self.path.joinpath("log"), segment_size=1000)
+        sink.write("Script", "Outputs/Script", "{}")
+        sink.flush()
+        self.assertEqual(len(self.path.joinpath("log", "segment-00000003.ndjson").read_text().splitlines()), 2)
+
+    def test_create_sink(self):
+        self.assertIsInstance(create_sink("file", self.path), FileSink)
+        self.assertEqual(create_sink("ndjson", self.path).path, self.path.joinpath("Outputs", "results.ndjson"))
+        with self.assertRaises(ValueError):
+            create_sink("database", self.path)
@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from SeeThru_Feeds.Model.Components.ComponentBase import ComponentBase
+from SeeThru_Feeds.Model.Properties.Exceptions import InvalidPropertyType, InvalidPropertyValue, PropertyRequired, \
+    PropertyValidatorError
+from SeeThru_Feeds.Model.Properties.Properties import FillableProperty, ResultProperty
+
+
+class BaseComponent(ComponentBase):
+    HOST = FillableProperty(name="host", of_type=str)
+    RESULT = ResultProperty(name="result")
+
+
+class ChildComponent(BaseComponent):
+    PORT = FillableProperty(name="port", default=443, of_type=int)
+
+
+class ValidatedComponent(ComponentBase):
+    HOST = FillableProperty(name="host", required=True, of_type=str)
+    PORT = FillableProperty(name="port", of_type=int)
+    TIMEOUT = FillableProperty(name="timeout", default=2, of_type=[int, float])
+    METHOD = FillableProperty(name="method", default="GET", value_set=["GET", "POST"])
+    RETRIES = FillableProperty(name="retries", default=0, custom=lambda value: value >= 0)
+
+
+class TestModelProperties(TestCase):
+    def test_schema_is_cached_per_class(self):
+        self.assertIs(BaseComponent.property_schema(), BaseComponent.property_schema())
+        self.assertEqual([name for _, name, _ in BaseComponent.property_schema()], ["host", "result"])
+        self.assertEqual([name for _, name, _ in ChildComponent.property_schema()], ["host", "port", "result"])
+
+    def test_instances_have_their_own_properties(self):
+        first = ChildComponent()
+        second = ChildComponent()
+        first.set_property("host", "example.com")
+        self.assertEqual(first.get_property(ChildComponent.HOST), "example.com")
+        self.assertIsNone(second.get_property("host"))
+        self.assertEqual(second.get_property("port"), 443)
+        self.assertIsNot(first.Properties["port"], ChildComponent.PORT)
+
+    def test_invalidate_schema_reaches_subclasses(self):
+        class Base(ComponentBase):
+            HOST = FillableProperty(name="host")
+
+        class Child(Base):
+            pass
+
+        Child()
+        Base.TIMEOUT = FillableProperty(name="timeout", default=2)
+        Base.invalidate_property_schema()
+        self.assertEqual(Child().get_property("timeout"), 2)
+
+    def test_validators(self):
+        component = ValidatedComponent()
+        component.set_property("port", 80)
+        with self.assertRaises(InvalidPropertyType):
+            component.set_property("port", "80")
+        # A single type allows None, a list of types doesn't
+        component.set_property("port", None)
+        with self.assertRaises(InvalidPropertyType):
+            component.set_property("timeout", None)
+        component.set_property("timeout", 2.5)
+        with self.assertRaises(InvalidPropertyValue):
+            component.set_property("method", "PUT")
+        with self.assertRaises(PropertyValidatorError):
+            component.set_property("retries", -1)
+
+    def test_set_properties_validates_before_assigning(self):
+        component = ValidatedComponent()
+        with self.assertRaises(InvalidPropertyValue):
+            component.set_properties({"port": 80, "method": "PUT"})
+        self.assertIsNone(component.get_property("port"))
+
+        component.set_properties({ValidatedComponent.PORT: 80, "method": "POST"})
+        self.assertEqual(component.get_property("port"), 80)
+        self.assertEqual(component.get_property("method"), "POST")
+
+    def test_check_fillables(self):
+        component = ValidatedComponent()
+        with self.assertRaises(PropertyRequired):
+            component.check_fillables()
+        component.set_property("host", "example.com")
+        self.assertTrue(component.check_fillables())
@@ -0,0 +1,94 @@
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest import TestCase
+
+import SeeThru_Feeds.Model.Scripts.ResultSerializer as ResultSerializer
+from SeeThru_Feeds.Model.Scripts.ScriptResult import ScriptResult, ScriptResultBatch
+
+
+class TestModelScriptResult(TestCase):
+    def test_getters(self):
+        result = ScriptResult().set_status("Green").set_message("Message")
+        self.assertEqual(result.get_status(), "green")
+        self.assertEqual(result.StatusCode, 3)
+        self.assertIsNone(result.get_timestamp())
+        result.Timestamp = "2020-08-27 12:30:00"
+        self.assertEqual(result.Epoch, 1598531400)
+        self.assertEqual(result.get_timestamp(), "2020-08-27 12:30:00")
+        with self.assertRaises(ValueError):
+            result.set_status("blue")
+        with self.assertRaises(AttributeError):
+            result.Other = "value"
+
+    def test_any_status_can_be_assigned(self):
+        # Only set_status validates the status, any other status assigned directly is kept as it is
+        result = ScriptResult("unknown", "Message")
+        self.assertEqual((result.Status, result.StatusCode), ("unknown", -1))
+        result.Status = "Amber"
+        self.assertEqual((result.Status, result.StatusCode), ("amber", 2))
+        result.Status = 3
+        self.assertEqual((result.Status, result.StatusCode), (3, -1))
+        self.assertEqual(ScriptResult.from_payload(("unknown", "Message", None)).Status, "unknown")
+
+        batch = ScriptResultBatch([ScriptResult("unknown"), ScriptResult("green"), ScriptResult("unknown")])
+        self.assertEqual([result.Status for result in batch], ["unknown", "green", "unknown"])
+        self.assertEqual(batch[-1].Status, "unknown")
+        self.assertEqual(batch.status_counts(), {"red": 0, "amber": 0, "green": 1, "unknown": 2})
+
+    def test_payload(self):
+        result = ScriptResult().set_status("red").set_message("Down").generate_timestamp()
+        copy = ScriptResult.from_payload(result.to_payload())
+        self.assertEqual((copy.Status, copy.Message, copy.Timestamp), (result.Status, result.Message, result.Timestamp))
+        # Payloads with a formatted timestamp are still accepted
+        copy = ScriptResult.from_payload(("red", "Down", result.Timestamp))
+        self.assertEqual(copy.Epoch, result.Epoch)
+
+    def test_batch(self):
+        results = [ScriptResult().set_status(status).set_message("Up" if status == "green" else "Down")
+                   for status in ["green", "amber", "green", "red"]]
+        results[0].generate_timestamp()
+        batch = ScriptResultBatch(results)
+
+        self.assertEqual(len(batch), 4)
+        self.assertEqual([result.Status for result in batch], ["green", "amber", "green", "red"])
+        self.assertEqual(batch[0].Timestamp, results[0].Timestamp)
+        self.assertIsNone(batch[1].Timestamp)
+        self.assertEqual(batch.status_counts(), {"red": 1, "amber": 1, "green": 2})
+        self.assertIs(batch[1].Message, batch[3].Message)
+
+    def test_batch_is_compact(self):
+        batch = ScriptResultBatch(
+            ScriptResult().set_status("green").set_message("Up").generate_timestamp() for _ in range(10000)
+        )
+        size = sys.getsizeof(batch._statuses) + sys.getsizeof(batch._epochs) + sys.getsizeof(batch._messages)
+        self.assertLess(size / len(batch), 32)
+
+    def test_json_escapes_messages(self):
+        result = ScriptResult().set_status("amber").set_message('Slow "response" from C:\\server\n').generate_timestamp()
+        for useOrjson in [False, True] if ResultSerializer.orjson is not None else [False]:
+            document = json.loads(ResultSerializer.dumps(ResultSerializer.result_document(result), useOrjson))
+            self.assertEqual(document, {"color": "amber", "Message": 'Slow "response" from C:\\server\n',
+                                        "time": result.Timestamp})
+
+    def test_json_includes_properties(self):
+        result = ScriptResult().set_status("green").set_message("Up").generate_timestamp()
+        document = json.loads(result.generate_json({"latency": 0.25, "ports": {443}, "checked": datetime(2020, 1, 1)}))
+        self.assertEqual(document["properties"], {"latency": 0.25, "ports": [443], "checked": "2020-01-01T00:00:00"})
+        with self.assertRaises(Exception):
+            ScriptResult().set_status("green").generate_json()
+
+    def test_write_results(self):
+        results = {
+            "First": ScriptResult().set_status("green").set_message("Up").generate_timestamp(),
+            "Second": ScriptResult().set_status("red").set_message("Down").generate_timestamp()
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "results.json")
+            ResultSerializer.write_results(path, results, {"Second": {"code": 500}})
+            documents = json.loads(path.read_text())
+        self.assertEqual(documents["First"]["color"], "green")
+        self.assertNotIn("properties", documents["First"])
+        self.assertEqual(documents["Second"]["properties"], {"code": 500})
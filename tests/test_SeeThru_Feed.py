@@ -1,4 +1,14 @@
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
 from unittest import TestCase
+from unittest.mock import patch
+
+import SeeThru_Feeds.Core.ConfigParser as ConfigParser
+from SeeThru_Feeds.Core.SeeThruFeed import SeeThruFeed
 
 
 # TODO: as per TDD, all tests should fail initially, hence self.fail() below. But this is not a new repo, we will
@@ -24,3 +34,69 @@ class TestSeeThru_Feed(TestCase):
         # self.fail()
         self.assertTrue(True)
 
+
+    def test_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            configPath = Path(directory, "config.json")
+            ConfigParser.ConfigParser.json(configPath).set_config(ConfigParser.Config.new("Batch")).save()
+            commandPath = Path(directory, "commands.txt")
+            commandPath.write_text("\n".join([
+                "# Adds the scripts",
+                "addscript Google --script Scripts.Google@Google",
+                "addscriptstate Google --name Down --status red --message 'Google is down'",
+                "createfeed GoogleFeed --script Google --api-key Key --guid guid",
+                ""
+            ]))
+
+            feed = SeeThruFeed(base_dir=directory)
+            with patch.object(ConfigParser.ConfigParser, "save", autospec=True,
+                              side_effect=ConfigParser.ConfigParser.save) as save:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    feed.run(["manage.py", "batch", str(commandPath), "--config_path", str(configPath)])
+            self.assertEqual(save.call_count, 1)
+
+            config = ConfigParser.ConfigParser.json(configPath).load()
+            self.assertEqual(config.Scripts["Google"].Meta.Script_Object_Path, "Scripts.Google@Google")
+            self.assertEqual(config.Scripts["Google"].States["Down"].Message, "Google is down")
+            self.assertEqual(config.Feeds["GoogleFeed"].Guid, "guid")
+
+    def test_batch_isnt_saved_on_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            configPath = Path(directory, "config.json")
+            ConfigParser.ConfigParser.json(configPath).set_config(ConfigParser.Config.new("Batch")).save()
+            content = configPath.read_text()
+            commandPath = Path(directory, "commands.txt")
+            commandPath.write_text("addscript Google\nrunfeedscheme\n")
+
+            with contextlib.redirect_stdout(io.StringIO()) as log:
+                SeeThruFeed(base_dir=directory).run(["manage.py", "batch", str(commandPath),
+                                                     "--config_path", str(configPath)])
+            self.assertIn("Line 2", log.getvalue())
+            self.assertEqual(configPath.read_text(), content)
+
+    def test_invalid_run_arguments_dont_start_pushing(self):
+        from SeeThru_Feeds.Core.Pusher import FeedPipeline
+        with tempfile.TemporaryDirectory() as directory:
+            configPath = Path(directory, "config.json")
+            config = ConfigParser.Config.new("Run")
+            config.add_script("Script").Meta.Script_Object_Path = "tests.test_Core_Runner@PidScript"
+            ConfigParser.ConfigParser.json(configPath).set_config(config).save()
+
+            for arguments in [["--isolation", "process", "--async"], ["--async", "--concurrency", "0"],
+                              ["--isolation", "process", "--max-scripts-per-worker", "0"]]:
+                with patch.object(FeedPipeline, "start") as start:
+                    with contextlib.redirect_stdout(io.StringIO()) as log:
+                        SeeThruFeed(base_dir=directory).run(["manage.py", "runfeedscheme", *arguments,
+                                                             "--config_path", str(configPath)])
+                start.assert_not_called()
+                self.assertIn("can't be used" if "0" not in arguments else "Please provide", log.getvalue())
+
+    def test_help_defers_heavy_imports(self):
+        script = ("import sys\n"
+                  "from SeeThru_Feeds.Core.SeeThruFeed import SeeThruFeed\n"
+                  "SeeThruFeed(['manage.py', 'help'])\n"
+                  "deferred = ['toml', 'dotenv', 'requests', 'cProfile', 'tracemalloc', 'SeeThru_Feeds.Core.Profiler']\n"
+                  "print(','.join(module for module in deferred if module in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parent.parent,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.splitlines()[-1], "")